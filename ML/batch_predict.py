@@ -0,0 +1,262 @@
+"""
+오프라인 일괄 예측 (스트리밍)
+
+사용법:
+    python batch_predict.py --input ./data/users.ndjson --output ./data/users_scored.csv
+    python batch_predict.py --input ./data/users.csv --output ./data/users_scored.ndjson --workers 4
+
+- 입력을 고정 크기 청크로 읽어 학습과 같은 특성 파이프라인(feature_pipeline)으로 변환 후 모델 번들로 예측
+- 결과는 청크 단위로 출력 파일에 추가 기록 (메모리 사용량은 청크 크기 x 동시 처리 청크 수로 제한)
+- --workers > 1 이면 청크를 프로세스 풀에 분배 (워커별 모델 1회 로드, 출력 순서는 입력 순서 유지)
+- 청크마다 진행 상황을 <output>.progress 에 기록 → 중단 후 같은 명령으로 재실행하면 이어서 처리
+
+입력: CSV / NDJSON(.ndjson, .jsonl) / dataset_store 컬럼형 데이터셋
+출력: CSV 또는 NDJSON (확장자로 결정), 입력 컬럼 + 소비패턴_점수, 위험_등급, 위험_확률_<등급>
+"""
+import os
+import json
+import time
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+import numpy as np
+import pandas as pd
+from compile_model import load_bundle
+from model_artifact import resolve_model_path
+from tree_ensemble import bundle_predictor
+from dataset_store import iter_dataset_chunks
+from feature_pipeline import BASE_FEATURES, engineer_features_frame, frame_to_matrix
+
+DEFAULT_MODEL_PATH = "./model/Fin_model_v1"  # 아티팩트 디렉터리 우선, 없으면 .pkl
+DEFAULT_CHUNK_SIZE = 50_000
+NDJSON_EXTS = (".ndjson", ".jsonl")
+PROGRESS_INTERVAL = 5.0  # 진행률 출력 간격 (초)
+
+_worker_model = None
+
+def _is_ndjson(path):
+    return path.endswith(NDJSON_EXTS)
+
+def iter_input_chunks(path, chunk_size, skip_rows=0):
+    """
+    입력 파일을 청크 단위로 스트리밍 (skip_rows 행은 파싱하지 않고 건너뜀)
+
+    Args:
+        path (str): CSV / NDJSON / 컬럼형 데이터셋 경로
+        chunk_size (int): 청크당 행 수
+        skip_rows (int): 이미 처리한 앞부분 행 수 (재개용)
+
+    Yields:
+        DataFrame: 입력 청크
+    """
+    if _is_ndjson(path):
+        with open(path, encoding="utf-8") as f:
+            lines = (line for line in f if line.strip())
+            for _ in itertools.islice(lines, skip_rows):
+                pass
+            while True:
+                block = list(itertools.islice(lines, chunk_size))
+                if not block:
+                    return
+                yield pd.read_json(StringIO("".join(block)), lines=True)
+    elif path.endswith(".csv"):
+        yield from pd.read_csv(path, skiprows=range(1, skip_rows + 1), chunksize=chunk_size)
+    else:
+        # 컬럼형 포맷은 행 단위 건너뛰기가 없으므로 청크를 읽고 버림 (청크 크기는 체크포인트와 동일)
+        for chunk in iter_dataset_chunks(path, chunk_size=chunk_size):
+            if skip_rows >= len(chunk):
+                skip_rows -= len(chunk)
+                continue
+            yield chunk.iloc[skip_rows:]
+            skip_rows = 0
+
+def predict_chunk(model_data, chunk):
+    """
+    청크 1개 예측 (학습 시와 같은 특성 공학 → 서빙과 같은 BundlePredictor)
+
+    Args:
+        model_data (dict): 모델 번들 (regressor, classifier, scaler, feature_names)
+        chunk (DataFrame): BASE_FEATURES 컬럼을 포함한 입력
+
+    Returns:
+        DataFrame: 입력 컬럼 + 소비패턴_점수, 위험_등급, 위험_확률_<등급>
+    """
+    missing = [col for col in BASE_FEATURES if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"입력에 필요한 특성 컬럼이 없습니다: {missing}")
+
+    X = frame_to_matrix(engineer_features_frame(chunk), model_data['feature_names'])
+    predictor = bundle_predictor(model_data)
+    prediction = predictor.predict(X)
+    proba = prediction['risk_probabilities']
+
+    result = chunk.copy()
+    result['소비패턴_점수'] = np.clip(prediction['consumption_score'], 0, 80)
+    result['위험_등급'] = prediction['risk_classification'].astype(np.int64)
+    for i, label in enumerate(predictor.classes):
+        result[f'위험_확률_{label}'] = proba[:, i]
+    return result
+
+def serialize_chunk(result, ndjson, header):
+    """예측 결과 청크 → 출력 파일에 그대로 추가할 UTF-8 바이트"""
+    if ndjson:
+        text = result.to_json(orient="records", lines=True, force_ascii=False)
+        if text and not text.endswith("\n"):
+            text += "\n"
+    else:
+        text = result.to_csv(index=False, header=header)
+    return text.encode("utf-8")
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = load_bundle(model_path)
+    bundle_predictor(_worker_model)
+
+def _score_chunk(chunk, ndjson, header):
+    """워커 프로세스: 예측 + 직렬화까지 수행하여 부모는 기록만 하도록 함"""
+    return len(chunk), serialize_chunk(predict_chunk(_worker_model, chunk), ndjson, header)
+
+def _job_signature(input_path, model_path, chunk_size):
+    """체크포인트가 같은 작업의 것인지 판별하는 값"""
+    return {
+        'input': os.path.abspath(input_path),
+        'input_size': os.path.getsize(input_path) if os.path.isfile(input_path) else None,
+        'input_mtime': os.path.getmtime(input_path),
+        'model': os.path.abspath(model_path),
+        'model_mtime': os.path.getmtime(model_path),
+        'chunk_size': chunk_size
+    }
+
+def _progress_path(output_path):
+    return output_path + ".progress"
+
+def _load_progress(output_path, signature):
+    """재개 가능한 체크포인트 반환 (없거나 완료된 작업이면 None, 다른 작업이면 오류)"""
+    path = _progress_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        progress = json.load(f)
+    if progress.get('completed'):
+        return None
+    if progress['job'] != signature:
+        raise ValueError(f"{path} 는 다른 입력/모델/청크 크기로 시작된 작업입니다. "
+                         "처음부터 다시 하려면 --no-resume 을 사용하세요")
+    return progress
+
+def _save_progress(output_path, signature, rows_done, output_bytes, completed=False):
+    """체크포인트 원자적 갱신 (출력 파일 fsync 이후에 호출)"""
+    path = _progress_path(output_path)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({'job': signature, 'rows_done': rows_done, 'output_bytes': output_bytes,
+                   'completed': completed}, f)
+    os.replace(path + ".tmp", path)
+
+def predict_file(input_path, output_path, model_path=DEFAULT_MODEL_PATH, chunk_size=DEFAULT_CHUNK_SIZE,
+                 workers=1, resume=True, progress_interval=PROGRESS_INTERVAL):
+    """
+    입력 파일 전체를 스트리밍 예측하여 출력 파일에 기록
+
+    Args:
+        input_path (str): CSV / NDJSON / 컬럼형 데이터셋 경로
+        output_path (str): 결과 경로 (.csv 또는 .ndjson/.jsonl)
+        model_path (str): 모델 번들 경로 (pickle 또는 아티팩트 디렉터리, 확장자 없는 이름은 디렉터리 우선)
+        chunk_size (int): 청크당 행 수
+        workers (int): 예측 프로세스 수 (1이면 현재 프로세스에서 처리)
+        resume (bool): 중단된 작업의 체크포인트가 있으면 이어서 처리
+        progress_interval (float): 진행률 출력 간격 (초)
+
+    Returns:
+        dict: rows (이번 실행에서 처리한 행 수), total_rows, elapsed_s, rows_per_sec, resumed_from
+    """
+    model_path = resolve_model_path(model_path)
+    signature = _job_signature(input_path, model_path, chunk_size)
+    progress = _load_progress(output_path, signature) if resume else None
+    rows_done = progress['rows_done'] if progress else 0
+    output_bytes = progress['output_bytes'] if progress else 0
+    resumed_from = rows_done
+    ndjson = _is_ndjson(output_path)
+
+    if progress:
+        print(f"체크포인트에서 재개: {rows_done:,}행 이후부터")
+
+    chunks = iter_input_chunks(input_path, chunk_size, skip_rows=rows_done)
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,))
+        window = 2 * workers
+    else:
+        executor = None
+        window = 1
+        _init_worker(model_path)
+
+    start = last_report = time.perf_counter()
+    try:
+        with open(output_path, "r+b" if progress else "wb") as out:
+            # 마지막 체크포인트 이후 기록된 불완전한 청크 제거
+            out.truncate(output_bytes)
+            out.seek(output_bytes)
+
+            def write_next():
+                nonlocal rows_done, output_bytes, last_report
+                item = in_flight.popleft()
+                n_rows, data = item if executor is None else item.result()
+                out.write(data)
+                out.flush()
+                os.fsync(out.fileno())
+                rows_done += n_rows
+                output_bytes += len(data)
+                _save_progress(output_path, signature, rows_done, output_bytes)
+
+                now = time.perf_counter()
+                if now - last_report >= progress_interval:
+                    rate = (rows_done - resumed_from) / (now - start)
+                    print(f"{rows_done:,}행 처리 ({rate:,.0f}행/초)")
+                    last_report = now
+
+            # 동시 처리 청크 수를 window로 제한하여 입력 전체가 큐에 쌓이지 않도록 함
+            in_flight = deque()
+            header = output_bytes == 0
+            for chunk in chunks:
+                if executor is None:
+                    in_flight.append(_score_chunk(chunk, ndjson, header))
+                else:
+                    in_flight.append(executor.submit(_score_chunk, chunk, ndjson, header))
+                header = False
+                while len(in_flight) >= window:
+                    write_next()
+            while in_flight:
+                write_next()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    _save_progress(output_path, signature, rows_done, output_bytes, completed=True)
+    elapsed = time.perf_counter() - start
+    rows = rows_done - resumed_from
+    stats = {
+        'rows': rows,
+        'total_rows': rows_done,
+        'elapsed_s': round(elapsed, 3),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        'resumed_from': resumed_from
+    }
+    print(f"예측 완료: {rows_done:,}행 → {output_path} ({stats['rows_per_sec']:,.0f}행/초)")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 번들로 대용량 입력 일괄 예측 (스트리밍)")
+    parser.add_argument("--input", required=True, help="입력 CSV / NDJSON / 컬럼형 데이터셋")
+    parser.add_argument("--output", required=True, help="출력 경로 (.csv 또는 .ndjson)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="모델 번들 (pickle 또는 아티팩트 디렉터리)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="예측 프로세스 수")
+    parser.add_argument("--no-resume", action="store_true", help="체크포인트를 무시하고 처음부터 다시 실행")
+    args = parser.parse_args()
+
+    predict_file(args.input, args.output, model_path=args.model, chunk_size=args.chunk_size,
+                 workers=args.workers, resume=not args.no_resume)
+
+if __name__ == "__main__":
+    main()
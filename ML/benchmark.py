@@ -0,0 +1,338 @@
+"""
+스코어링 스택 지연/처리량 벤치마크 (결과는 JSON으로 저장하여 모델 버전/커밋 간 비교)
+
+시나리오:
+    cold_load        새 인터프리터에서 모델 로드(pickle 또는 아티팩트) + 트리 평탄화, Flask 앱 import
+    predict_latency  Flask 테스트 클라이언트로 /predict 단일 행 지연 (p50/p95/p99)
+    batch            predict_records 직접 호출 / /predict_batch 엔드포인트 처리량
+    scoring          scoring.add_financial_scores 대용량 프레임 처리 시간
+    kosis            합성 KOSIS CSV 코퍼스에 대한 load_kosis_data (캐시 없음/캐시 적중)
+
+사용법:
+    python benchmark.py --model ../priv/models/Fin_model_v1_1.pkl --output bench_v1_1.json
+    python benchmark.py --scenarios predict_latency batch --compare bench_v1_1.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from utils import RANDOM_SEED, SHARED_PYTHON_DIR
+from model_artifact import resolve_model_path
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+WEB_DIR = os.path.join(ML_DIR, "piggy_web_test")
+DEFAULT_MODEL = os.path.join(WEB_DIR, "Fin_model_v1")  # 아티팩트 디렉터리 우선, 없으면 .pkl
+SCENARIOS = ['cold_load', 'predict_latency', 'batch', 'scoring', 'kosis']
+
+SPENDING_FIELDS = ['education', 'transport', 'other', 'medical', 'food', 'entertainment', 'housing']
+
+def percentiles(timings_ms):
+    """지연 시간 목록 → 요약 통계 (ms)"""
+    timings = np.asarray(timings_ms)
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'n': len(timings),
+        'mean_ms': float(timings.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(timings.max())
+    }
+
+def timed(fn, *args, **kwargs):
+    """(결과, 경과 시간 ms)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+def sample_payloads(n, seed=RANDOM_SEED):
+    """/predict 요청 형식의 랜덤 사용자 입력"""
+    rng = np.random.default_rng(seed)
+    ratios = rng.dirichlet(np.ones(len(SPENDING_FIELDS)), size=n)
+    income = rng.uniform(150, 900, size=n)
+    spending = income * rng.uniform(0.4, 1.2, size=n)
+    n_trx = rng.integers(20, 500, size=n)
+    payloads = []
+    for i in range(n):
+        payload = {field: round(float(ratios[i, j]), 4) for j, field in enumerate(SPENDING_FIELDS)}
+        payload.update({
+            'income': round(float(income[i]), 1),
+            'total_spending': round(float(spending[i]), 1),
+            'n_transactions': int(n_trx[i]),
+            'mean_spending': round(float(spending[i] / n_trx[i]), 3)
+        })
+        payloads.append(payload)
+    return payloads
+
+def sample_scoring_frame(n, seed=RANDOM_SEED):
+    """add_financial_scores 입력 형식의 랜덤 프레임"""
+    from scoring import SPENDING_RATIO_COLS
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.dirichlet(np.ones(len(SPENDING_RATIO_COLS)), size=n), columns=SPENDING_RATIO_COLS)
+    df['total_spending'] = rng.uniform(0, 6000, size=n)
+    df['n_transactions'] = rng.integers(0, 800, size=n)
+    return df
+
+def write_kosis_corpus(root, n_files, rows_per_file, seed=RANDOM_SEED):
+    """KOSIS 형식 합성 CSV 코퍼스 생성 (EUC-KR/UTF-8 혼합, 하위 디렉토리 포함)"""
+    rng = np.random.default_rng(seed)
+    dims = ['연령', '소득', '자산', '종사']
+    columns = ['부채보유 여부별', '세부기준', '자산(전년도) (만원)', '부채(전년도) (만원)',
+               '처분가능소득(전년도) (만원)', '원리금상환액(전년도) (만원)', '부채/자산 (%)']
+    for i in range(n_files):
+        sub = os.path.join(root, 'data', f"part{i % 4}")
+        os.makedirs(sub, exist_ok=True)
+        df = pd.DataFrame({
+            columns[0]: rng.choice(['부채보유 가구 ', ' 전체'], size=rows_per_file),
+            columns[1]: [f" {k % 5 + 1}분위" for k in range(rows_per_file)],
+            columns[2]: [f"{v:,}" for v in rng.integers(1000, 90000, size=rows_per_file)],
+            columns[3]: [f"{v:,}" for v in rng.integers(0, 30000, size=rows_per_file)],
+            columns[4]: rng.integers(100, 9000, size=rows_per_file).astype(str),
+            columns[5]: rng.integers(0, 3000, size=rows_per_file).astype(str),
+            columns[6]: np.round(rng.uniform(0, 80, size=rows_per_file), 1).astype(str),
+        })
+        encoding = 'euc-kr' if i % 2 == 0 else 'utf-8'
+        df.to_csv(os.path.join(sub, f"{dims[i % 4]}별_{i:03d}.csv"), index=False, encoding=encoding)
+
+@contextlib.contextmanager
+def quiet():
+    """벤치마크 대상 코드의 print 출력 억제 (포맷팅 비용은 그대로 측정됨)"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+def import_app(model_path):
+    """Flask 앱 모듈 import (모델 경로는 PIGGY_MODEL_PATH로 지정)"""
+    os.environ['PIGGY_MODEL_PATH'] = os.path.abspath(model_path)
+    if WEB_DIR not in sys.path:
+        sys.path.insert(0, WEB_DIR)
+    sys.modules.pop('app', None)
+    with quiet():
+        import app
+    return app
+
+def model_size_bytes(model_path):
+    """모델 크기 (아티팩트 디렉터리는 파일 합계)"""
+    if not os.path.isdir(model_path):
+        return os.path.getsize(model_path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(model_path) for name in names)
+
+def bench_cold_load(model_path, repeat):
+    """새 인터프리터에서 측정하는 콜드 로드 (번들 로드(pickle/아티팩트) + 트리 평탄화 / 앱 import)"""
+    load_code = (
+        "import sys, time, pickle\n"
+        f"sys.path[:0] = [{ML_DIR!r}, {SHARED_PYTHON_DIR!r}]\n"
+        "t0 = time.perf_counter()\n"
+        "from compile_model import load_bundle\n"
+        "from tree_ensemble import compile_model\n"
+        "t1 = time.perf_counter()\n"
+        f"model_data = load_bundle({os.path.abspath(model_path)!r})\n"
+        "t2 = time.perf_counter()\n"
+        "compile_model(model_data)\n"
+        "t3 = time.perf_counter()\n"
+        "print((t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000)\n"
+    )
+    app_code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {WEB_DIR!r})\n"
+        "t0 = time.perf_counter()\n"
+        "import app\n"
+        "print('APP_IMPORT_MS', (time.perf_counter() - t0) * 1000)\n"
+    )
+    env = dict(os.environ, PIGGY_MODEL_PATH=os.path.abspath(model_path))
+    imports, loads, compiles, app_imports = [], [], [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", load_code], capture_output=True, text=True,
+                             check=True, cwd=ML_DIR).stdout.split()
+        imports.append(float(out[0]))
+        loads.append(float(out[1]))
+        compiles.append(float(out[2]))
+        out = subprocess.run([sys.executable, "-c", app_code], capture_output=True, text=True,
+                             check=True, cwd=WEB_DIR, env=env).stdout
+        app_imports.append(float(out.rsplit('APP_IMPORT_MS', 1)[1]))
+    return {
+        'model_size_bytes': model_size_bytes(model_path),
+        'module_import': percentiles(imports),
+        'pickle_load': percentiles(loads),
+        'tree_compile': percentiles(compiles),
+        'flask_app_import': percentiles(app_imports)
+    }
+
+def bench_predict_latency(app_module, n_requests, warmup):
+    """Flask 테스트 클라이언트로 /predict 단일 행 지연 측정"""
+    client = app_module.app.test_client()
+    payloads = sample_payloads(n_requests + warmup)
+    timings = []
+    with quiet():
+        for i, payload in enumerate(payloads):
+            _, elapsed = timed(client.post, '/predict', json=payload)
+            if i >= warmup:
+                timings.append(elapsed)
+    result = percentiles(timings)
+    result['model_in_use'] = app_module.consumption_model is not None
+    return result
+
+def bench_batch(app_module, sizes, max_endpoint_rows):
+    """배치 추론 처리량: predict_records 직접 호출 / /predict_batch (JSON 직렬화 포함)"""
+    client = app_module.app.test_client()
+    results = {}
+    for n in sizes:
+        records = sample_payloads(n, seed=RANDOM_SEED + n)
+        with quiet():
+            _, direct_ms = timed(app_module.predict_records, records)
+        entry = {'direct_ms': direct_ms, 'direct_rows_per_sec': n / direct_ms * 1000}
+        if n <= max_endpoint_rows:
+            with quiet():
+                response, endpoint_ms = timed(client.post, '/predict_batch', json=records)
+            if response.status_code != 200:
+                raise RuntimeError(f"/predict_batch 실패: {response.status_code}")
+            entry.update({'endpoint_ms': endpoint_ms, 'endpoint_rows_per_sec': n / endpoint_ms * 1000})
+        results[str(n)] = entry
+    return results
+
+def bench_scoring(sizes, repeat):
+    """scoring.add_financial_scores 처리 시간"""
+    from scoring import add_financial_scores
+    results = {}
+    for n in sizes:
+        df = sample_scoring_frame(n)
+        timings = [timed(add_financial_scores, df)[1] for _ in range(repeat)]
+        entry = percentiles(timings)
+        entry['rows_per_sec'] = n / entry['p50_ms'] * 1000
+        results[str(n)] = entry
+    return results
+
+def bench_kosis(n_files, rows_per_file):
+    """합성 코퍼스에 대한 load_kosis_data: 직렬/병렬 (캐시 없음), 캐시 적중"""
+    from data_load import load_kosis_data
+    cwd = os.getcwd()
+    results = {'n_files': n_files, 'rows_per_file': rows_per_file}
+    with tempfile.TemporaryDirectory() as root:
+        write_kosis_corpus(root, n_files, rows_per_file)
+        os.chdir(root)
+        try:
+            with quiet():
+                _, results['serial_uncached_ms'] = timed(load_kosis_data, ["./data"], cache_dir=None, max_workers=1)
+                _, results['parallel_uncached_ms'] = timed(load_kosis_data, ["./data"], cache_dir=None)
+                _, results['cache_build_ms'] = timed(load_kosis_data, ["./data"])
+                _, results['cache_hit_ms'] = timed(load_kosis_data, ["./data"])
+        finally:
+            os.chdir(cwd)
+    return results
+
+def git_commit():
+    """현재 커밋 해시 (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=ML_DIR).stdout.strip()
+    except Exception:
+        return None
+
+def environment_info(model_path):
+    """비교 시 참고할 실행 환경 정보"""
+    import sklearn
+    info = {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'model_path': os.path.abspath(model_path),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+    try:
+        import lightgbm
+        info['lightgbm'] = lightgbm.__version__
+    except ImportError:
+        info['lightgbm'] = None
+    return info
+
+def flatten_metrics(tree, prefix=""):
+    """중첩 결과 dict → {'a.b.c': 숫자} (비교용)"""
+    flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def print_comparison(current, baseline_path):
+    """기준 결과 JSON 대비 변화율 출력 (시간 지표는 낮을수록, 처리량은 높을수록 좋음)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = flatten_metrics(baseline['scenarios'])
+    new = flatten_metrics(current['scenarios'])
+    print(f"\n=== 비교: {baseline['environment'].get('git_commit')} → {current['environment'].get('git_commit')} ===")
+    for name in sorted(set(old) & set(new)):
+        if not (name.endswith('_ms') or name.endswith('_per_sec')) or old[name] == 0:
+            continue
+        change = (new[name] - old[name]) / old[name] * 100
+        print(f"{name:60s} {old[name]:12.3f} → {new[name]:12.3f} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="스코어링 스택 지연/처리량 벤치마크")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Flask 앱/콜드 로드에 사용할 모델 (pickle 또는 아티팩트 디렉터리)")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--cold-repeat', type=int, default=3, help="콜드 로드 반복 횟수")
+    parser.add_argument('--requests', type=int, default=500, help="/predict 측정 요청 수")
+    parser.add_argument('--warmup', type=int, default=20, help="/predict 워밍업 요청 수")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--max-endpoint-rows', type=int, default=100000,
+                        help="이 행 수 이하 배치만 /predict_batch 엔드포인트로도 측정")
+    parser.add_argument('--scoring-sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--scoring-repeat', type=int, default=3)
+    parser.add_argument('--kosis-files', type=int, default=40)
+    parser.add_argument('--kosis-rows', type=int, default=2000)
+    args = parser.parse_args()
+    args.model = resolve_model_path(args.model)
+
+    report = {'environment': environment_info(args.model), 'scenarios': {}}
+    scenarios = report['scenarios']
+    app_module = None
+
+    for name in args.scenarios:
+        print(f"[{name}] 실행 중...", flush=True)
+        start = time.perf_counter()
+        if name == 'cold_load':
+            scenarios[name] = bench_cold_load(args.model, args.cold_repeat)
+        elif name in ('predict_latency', 'batch'):
+            if app_module is None:
+                app_module = import_app(args.model)
+            if name == 'predict_latency':
+                scenarios[name] = bench_predict_latency(app_module, args.requests, args.warmup)
+            else:
+                scenarios[name] = bench_batch(app_module, args.batch_sizes, args.max_endpoint_rows)
+        elif name == 'scoring':
+            scenarios[name] = bench_scoring(args.scoring_sizes, args.scoring_repeat)
+        elif name == 'kosis':
+            scenarios[name] = bench_kosis(args.kosis_files, args.kosis_rows)
+        print(f"[{name}] 완료 ({time.perf_counter() - start:.1f}s)")
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"결과 저장: {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        print_comparison(report, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+모델 번들 트리 평탄화 / 동등성 검증 / 추론 지연 벤치마크 스크립트
+
+사용법:
+    python compile_model.py ../priv/models/Fin_model_v1_1.pkl --rows 10000
+    python compile_model.py ../priv/models/Fin_model_v1.pkl --save-artifact ../priv/models/Fin_model_v1  # pickle → 아티팩트 변환
+"""
+import argparse
+import time
+import numpy as np
+from utils import RANDOM_SEED
+from tree_ensemble import compile_model
+import model_artifact
+
+def load_bundle(model_path):
+    """모델 번들 로드 (아티팩트 디렉터리 또는 pickle, pickle은 구버전 sklearn 트리 속성 보정 포함)"""
+    return model_artifact.load_bundle(model_path)
+
+def sample_inputs(model_data, n_rows):
+    """scaler 통계 기반 랜덤 입력 생성"""
+    rng = np.random.default_rng(RANDOM_SEED)
+    scaler = model_data['scaler']
+    return rng.normal(size=(n_rows, len(model_data['feature_names']))) * scaler.scale_ + scaler.mean_
+
+def original_predict(model_data, X):
+    """원본 추정기 추론 (서빙 코드와 동일한 호출 순서)"""
+    X_scaled = model_data['scaler'].transform(X)
+    return {
+        'consumption_score': model_data['regressor'].predict(X_scaled),
+        'risk_classification': model_data['classifier'].predict(X_scaled),
+        'risk_probabilities': model_data['classifier'].predict_proba(X_scaled)
+    }
+
+def check_equivalence(model_data, compiled, X):
+    """원본 추정기와 평탄화 평가기의 예측 차이"""
+    expected = original_predict(model_data, X)
+    actual = compiled.predict(X)
+    return {
+        'score_max_abs_diff': float(np.abs(expected['consumption_score'] - actual['consumption_score']).max()),
+        'proba_max_abs_diff': float(np.abs(expected['risk_probabilities'] - actual['risk_probabilities']).max()),
+        'class_agreement': float((expected['risk_classification'] == actual['risk_classification']).mean())
+    }
+
+def measure_latency(predict_fn, X, repeat):
+    """반복 호출 지연 시간 (ms) 분위수"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict_fn(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, [50, 95, 99])
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 트리 평탄화 및 벤치마크")
+    parser.add_argument('model_path')
+    parser.add_argument('--rows', type=int, default=10000, help="배치 벤치마크/검증 행 수")
+    parser.add_argument('--repeat', type=int, default=200, help="단일 행 반복 횟수")
+    parser.add_argument('--save-artifact', default=None, help="지정 시 모델 아티팩트 디렉터리로 변환 저장")
+    args = parser.parse_args()
+    
+    model_data = load_bundle(args.model_path)
+    if args.save_artifact:
+        path = model_artifact.save_artifact(model_data, args.save_artifact)
+        print(f"모델 아티팩트 저장: {path}")
+    
+    start = time.perf_counter()
+    compiled = compile_model(model_data)
+    print(f"트리 평탄화 완료: {(time.perf_counter() - start) * 1000:.1f}ms "
+          f"(회귀 트리 {compiled.regressor.n_trees}개, 최대 깊이 {compiled.regressor.max_depth})")
+    
+    X = sample_inputs(model_data, args.rows)
+    print("\n=== 동등성 검증 ===")
+    for key, value in check_equivalence(model_data, compiled, X).items():
+        print(f"{key}: {value:.3g}")
+    
+    print("\n=== 단일 행 지연 (p50 / p95 / p99 ms) ===")
+    x1 = X[:1]
+    for name, fn in [('original', lambda x: original_predict(model_data, x)), ('compiled', compiled.predict)]:
+        p50, p95, p99 = measure_latency(fn, x1, args.repeat)
+        print(f"{name:9s}: {p50:.3f} / {p95:.3f} / {p99:.3f}")
+    
+    print(f"\n=== 배치 처리량 ({args.rows}행) ===")
+    for name, fn in [('original', lambda x: original_predict(model_data, x)), ('compiled', compiled.predict)]:
+        p50, _, _ = measure_latency(fn, X, 3)
+        print(f"{name:9s}: {p50:.1f}ms ({args.rows / p50 * 1000:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
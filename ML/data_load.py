@@ -3,9 +3,19 @@ Data loading and preprocessing module for financial health prediction
 """
 import os
 import glob
+import logging
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-from utils import read_csv_safely, clean_text, std_whitespace, pct_to_ratio
+from utils import read_csv_safely, clean_text_series, std_whitespace, pct_to_ratio, file_digest
+from dataset_store import load_dataset
+
+# 정제 테이블 캐시 (원본 내용 해시 기반) - normalize_kosis_table 로직 변경 시 버전 증가
+KOSIS_CACHE_DIR = "./data/.kosis_cache"
+KOSIS_CACHE_VERSION = 1
+KOSIS_OUTPUT_PATH = "./data/kosis_cleaned.csv"
+
+logger = logging.getLogger("piggy.data_load")
 
 def normalize_kosis_table(df0, src_path=None):
     """
@@ -21,10 +31,9 @@ def normalize_kosis_table(df0, src_path=None):
     # 원본 보호
     df = df0.copy()
     
-    # 텍스트 정리
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].map(clean_text)
+    # 텍스트 정리 (열 단위 벡터화)
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        df[col] = clean_text_series(df[col])
     
     # 차원 추출 (파일명 기반)
     dim = "기타"
@@ -103,42 +112,125 @@ def normalize_kosis_table(df0, src_path=None):
     
     return df.reset_index(drop=True)
 
-def load_kosis_data(search_dirs):
+def find_kosis_files(search_dirs):
     """
-    Load and integrate KOSIS CSV files from specified directories
+    Find KOSIS CSV files under the given directories (recursive, deduplicated)
     
     Args:
         search_dirs (list): List of directories to search for CSV files
         
     Returns:
-        DataFrame: Integrated KOSIS data
+        list: Sorted CSV file paths
     """
-    found_files = []
+    # 이전 실행의 병합 결과는 원본이 아니므로 제외
+    found = {os.path.realpath(KOSIS_OUTPUT_PATH): None}
     for d in search_dirs:
         if os.path.isdir(d):
-            found_files += glob.glob(os.path.join(d, "*.csv"))
-            found_files += glob.glob(os.path.join(d, "**/*.csv"), recursive=True)
+            # recursive=True의 "**"는 최상위 디렉토리도 포함
+            for p in glob.glob(os.path.join(d, "**", "*.csv"), recursive=True):
+                found.setdefault(os.path.realpath(p), p)
+    return sorted(p for p in found.values() if p is not None)
+
+def _cache_key(path):
+    """원본 내용 해시 + 파일명 + 캐시 버전 (파일명은 차원/파일명 컬럼에 반영되므로 포함)"""
+    return f"{file_digest(path)}_{KOSIS_CACHE_VERSION}_{os.path.basename(path)}"
+
+def _read_cache(cache_dir, key):
+    """캐시된 정제 테이블 로드 (없으면 None)"""
+    base = os.path.join(cache_dir, key)
+    if os.path.exists(base + ".parquet"):
+        return pd.read_parquet(base + ".parquet")
+    if os.path.exists(base + ".pkl"):
+        return pd.read_pickle(base + ".pkl")
+    return None
+
+def _write_cache(cache_dir, key, df):
+    """정제 테이블 캐시 저장 (pyarrow가 없으면 pickle)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.join(cache_dir, key)
+    try:
+        df.to_parquet(base + ".parquet", index=False)
+    except ImportError:
+        df.to_pickle(base + ".pkl")
+
+def _ingest_kosis_file(path, key, cache_dir):
+    """
+    단일 CSV 읽기 + 정제 + 캐시 저장 (프로세스 풀 작업 단위)
     
-    found_files = sorted(set(found_files))
+    Returns:
+        tuple: (DataFrame | None, encoding, error message | None)
+    """
+    try:
+        raw, enc = read_csv_safely(path)
+        out = normalize_kosis_table(raw, src_path=path)
+        if cache_dir is not None:
+            try:
+                _write_cache(cache_dir, key, out)
+            except Exception as e:
+                # 캐시는 다음 실행을 빠르게 할 뿐이므로 저장 실패해도 정제 결과는 사용
+                logger.warning("KOSIS 캐시 저장 실패", extra={'fields': {'path': path, 'error': str(e)}})
+        return out, enc, None
+    except Exception as e:
+        return None, None, str(e)
+
+def load_kosis_data(search_dirs, cache_dir=KOSIS_CACHE_DIR, max_workers=None):
+    """
+    Load and integrate KOSIS CSV files from specified directories
+    
+    Normalized tables are cached by source content hash, so unchanged files
+    are not re-read on later runs. Remaining files are parsed in a process pool.
+    
+    Args:
+        search_dirs (list): List of directories to search for CSV files
+        cache_dir (str): Directory for normalized table cache (None disables caching)
+        max_workers (int): Process pool size (None: CPU count, 1: serial)
+        
+    Returns:
+        DataFrame: Integrated KOSIS data
+    """
+    found_files = find_kosis_files(search_dirs)
     print("발견 CSV 수:", len(found_files))
     
+    # 1. 캐시 조회 (내용 해시가 같으면 재정제 생략)
+    results = {}
+    pending = []
+    for p in found_files:
+        key = _cache_key(p)
+        cached = _read_cache(cache_dir, key) if cache_dir is not None else None
+        if cached is not None:
+            results[p] = (cached, "cache", None)
+        else:
+            pending.append((p, key))
+    
+    # 2. 변경/신규 파일만 병렬 정제
+    if len(pending) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {p: pool.submit(_ingest_kosis_file, p, key, cache_dir) for p, key in pending}
+            for p, future in futures.items():
+                results[p] = future.result()
+    else:
+        for p, key in pending:
+            results[p] = _ingest_kosis_file(p, key, cache_dir)
+    
+    # 3. 파일 순서대로 병합
     parts = []
     for p in found_files:
-        try:
-            raw, enc = read_csv_safely(p)
-            out = normalize_kosis_table(raw, src_path=p)
-            if out.shape[0] > 0:
-                parts.append(out)
-                print(f"[OK] {os.path.basename(p)} → rows={out.shape[0]} enc={enc}")
-            else:
-                print(f"[SKIP:empty] {os.path.basename(p)} enc={enc}")
-        except Exception as e:
-            print(f"[FAIL] {os.path.basename(p)} :: {e}")
+        out, enc, error = results[p]
+        if error is not None:
+            print(f"[FAIL] {os.path.basename(p)} :: {error}")
+        elif out.shape[0] > 0:
+            parts.append(out)
+            print(f"[OK] {os.path.basename(p)} → rows={out.shape[0]} enc={enc}")
+        else:
+            print(f"[SKIP:empty] {os.path.basename(p)} enc={enc}")
+    
+    if not parts:
+        return pd.DataFrame()
+    
     # Save cleaned data
-    output_path = "./data/kosis_cleaned.csv"
     df = pd.concat(parts, ignore_index=True)
-    df.to_csv(output_path, index=False)
-    print(f"KOSIS 데이터 정제 완료: {output_path}")
+    df.to_csv(KOSIS_OUTPUT_PATH, index=False)
+    print(f"KOSIS 데이터 정제 완료: {KOSIS_OUTPUT_PATH}")
     
     return df
 
@@ -186,13 +278,13 @@ def load_synthetic_data(file_path):
     Load synthetic financial data
     
     Args:
-        file_path (str): Path to synthetic data CSV file
+        file_path (str): Path to synthetic data (CSV, or a dataset saved by dataset_store)
         
     Returns:
         DataFrame: Processed synthetic data (만원 단위)
     """
     try:
-        df = pd.read_csv(file_path)
+        df = load_dataset(file_path)
         print(f"합성 데이터 로드 완료: {df.shape}")
         
         # Convert spending to 만원 units (월 기준)
@@ -0,0 +1,342 @@
+"""
+Columnar dataset storage for the synthetic training data
+- Parquet (pyarrow) when available, otherwise a directory of memory-mapped .npy columns
+- Explicit dtypes, persona text columns stored as categoricals
+- Column projection on read (training loads only feature/label columns)
+- Chunked read/write for datasets larger than memory
+"""
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+PARQUET_EXT = ".parquet"
+NPY_DIR_EXT = ".npcols"
+CSV_EXT = ".csv"
+
+# 명시적 dtype (스키마에 없는 컬럼은 그대로 유지)
+FLOAT_COLS = ['total_spending', 'mean_spending', 'est_income_만원',
+              '교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거',
+              'DSR_ref', 'DebtAsset_ref', 'realistic_score']
+INT_COLS = ['n_transactions', '재무건전_점수', '재무건전_라벨', '페르소나_레벨']
+CATEGORICAL_COLS = ['페르소나_이름', '페르소나_이모지', '페르소나_설명']
+
+def has_parquet():
+    """Parquet 엔진(pyarrow) 사용 가능 여부"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def apply_schema(df):
+    """
+    Cast known columns to their storage dtypes
+
+    Args:
+        df (DataFrame): Input data
+
+    Returns:
+        DataFrame: Copy with explicit dtypes (integer columns containing NaN stay float)
+    """
+    df = df.copy()
+    for col in FLOAT_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+    for col in INT_COLS:
+        if col in df.columns:
+            ser = pd.to_numeric(df[col], errors="coerce")
+            df[col] = ser.astype(np.int64) if ser.notna().all() else ser.astype(np.float64)
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+def _strip_ext(path):
+    """확장자 제거 (저장 포맷은 save/load에서 결정)"""
+    for ext in (PARQUET_EXT, NPY_DIR_EXT, CSV_EXT):
+        if path.endswith(ext):
+            return path[:-len(ext)]
+    return path
+
+def resolve_dataset(path):
+    """
+    Find the stored file for a dataset path (with or without extension)
+
+    Columnar formats are preferred over CSV.
+
+    Args:
+        path (str): Dataset path, e.g. "./data/synth_finance_scored_final"
+
+    Returns:
+        str: Existing file/directory path, or None
+    """
+    if os.path.isfile(path) or (path.endswith(NPY_DIR_EXT) and os.path.isdir(path)):
+        return path
+    stem = _strip_ext(path)
+    for ext in (PARQUET_EXT, NPY_DIR_EXT, CSV_EXT):
+        if os.path.exists(stem + ext):
+            return stem + ext
+    return None
+
+def _save_npy_columns(df, dir_path):
+    """열별 .npy 저장 (문자열 열은 카테고리 코드 + 범주 목록)"""
+    os.makedirs(dir_path, exist_ok=True)
+    schema = {'n_rows': len(df), 'columns': []}
+    for i, col in enumerate(df.columns):
+        ser = df[col]
+        entry = {'name': col, 'file': f"{i}.npy"}
+        if isinstance(ser.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(ser):
+            cat = ser.astype("category")
+            values = cat.cat.codes.to_numpy()
+            entry['categories'] = [str(c) for c in cat.cat.categories]
+            entry['categorical'] = isinstance(ser.dtype, pd.CategoricalDtype)
+        else:
+            values = ser.to_numpy()
+        entry['dtype'] = values.dtype.str
+        np.save(os.path.join(dir_path, entry['file']), values, allow_pickle=False)
+        schema['columns'].append(entry)
+    with open(os.path.join(dir_path, "schema.json"), "w", encoding="utf-8") as f:
+        json.dump(schema, f, ensure_ascii=False)
+
+def _open_npy_columns(dir_path, columns=None, mmap=True):
+    """열별 .npy 열기 (columns에 포함된 열만 매핑) → (행 수, [(열 이름, 배열, 스키마 항목)])"""
+    with open(os.path.join(dir_path, "schema.json"), encoding="utf-8") as f:
+        schema = json.load(f)
+    entries = {e['name']: e for e in schema['columns']}
+    names = list(columns) if columns is not None else [e['name'] for e in schema['columns']]
+    missing = [c for c in names if c not in entries]
+    if missing:
+        raise KeyError(f"데이터셋에 없는 컬럼: {missing}")
+
+    arrays = [(name, np.load(os.path.join(dir_path, entries[name]['file']), mmap_mode="r" if mmap else None),
+               entries[name]) for name in names]
+    return schema['n_rows'], arrays
+
+def _npy_frame(arrays, start=0, stop=None):
+    """열린 .npy 열의 [start:stop] 행만 DataFrame으로 구성 (mmap이면 해당 구간만 읽음)"""
+    data = {}
+    for name, values, entry in arrays:
+        values = values[start:stop]
+        if 'categories' in entry:
+            cat = pd.Categorical.from_codes(values, categories=entry['categories'])
+            data[name] = cat if entry['categorical'] else np.asarray(cat, dtype=object)
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+def _load_npy_columns(dir_path, columns=None, mmap=True):
+    """열별 .npy 로드 (columns에 포함된 열만 매핑)"""
+    return _npy_frame(_open_npy_columns(dir_path, columns=columns, mmap=mmap)[1])
+
+def save_dataset(df, path, csv_path=None):
+    """
+    Save a DataFrame in columnar format with explicit dtypes
+
+    Args:
+        df (DataFrame): Data to save
+        path (str): Dataset path (extension is chosen from the available engine)
+        csv_path (str): Optional CSV export path (None: no CSV)
+
+    Returns:
+        str: Written dataset path
+    """
+    stem = _strip_ext(path)
+    df = apply_schema(df).reset_index(drop=True)
+
+    if has_parquet():
+        out_path = stem + PARQUET_EXT
+        df.to_parquet(out_path, index=False)
+    else:
+        out_path = stem + NPY_DIR_EXT
+        _save_npy_columns(df, out_path)
+    print(f"데이터셋 저장 완료: {out_path} {df.shape}")
+
+    if csv_path is not None:
+        df.to_csv(csv_path, index=False)
+        print(f"CSV 사본 저장: {csv_path}")
+
+    return out_path
+
+def load_dataset(path, columns=None, mmap=True):
+    """
+    Load a dataset saved by save_dataset (falls back to CSV)
+
+    Args:
+        path (str): Dataset path with or without extension
+        columns (list): Columns to read (None: all)
+        mmap (bool): Memory-map .npy columns instead of reading them
+
+    Returns:
+        DataFrame: Loaded data with explicit dtypes
+    """
+    resolved = resolve_dataset(path)
+    if resolved is None:
+        raise FileNotFoundError(f"데이터셋을 찾을 수 없습니다: {path}")
+
+    if resolved.endswith(PARQUET_EXT):
+        # DatasetWriter는 범주형을 문자열로 기록하므로 스키마 재적용
+        return apply_schema(pd.read_parquet(resolved, columns=columns))
+    if resolved.endswith(NPY_DIR_EXT):
+        return _load_npy_columns(resolved, columns=columns, mmap=mmap)
+    return apply_schema(pd.read_csv(resolved, usecols=columns))
+
+def iter_dataset_chunks(path, columns=None, chunk_size=100_000):
+    """
+    Stream a dataset in row chunks (same row order as load_dataset)
+
+    Args:
+        path (str): Dataset path with or without extension
+        columns (list): Columns to read (None: all)
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        DataFrame: Chunk with a RangeIndex continuing from the previous chunk
+    """
+    resolved = resolve_dataset(path)
+    if resolved is None:
+        raise FileNotFoundError(f"데이터셋을 찾을 수 없습니다: {path}")
+
+    offset = 0
+    if resolved.endswith(PARQUET_EXT):
+        import pyarrow.parquet as pq
+        batches = (b.to_pandas() for b in
+                   pq.ParquetFile(resolved).iter_batches(batch_size=chunk_size, columns=columns))
+    elif resolved.endswith(NPY_DIR_EXT):
+        # 청크마다 memmap 구간만 잘라 구성 (전체 프레임을 만들지 않음)
+        n_rows, arrays = _open_npy_columns(resolved, columns=columns, mmap=True)
+        batches = (_npy_frame(arrays, i, i + chunk_size) for i in range(0, n_rows, chunk_size))
+    else:
+        batches = pd.read_csv(resolved, usecols=columns, chunksize=chunk_size)
+
+    for chunk in batches:
+        chunk = apply_schema(chunk)
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+class DatasetWriter:
+    """
+    Append DataFrame chunks to a columnar dataset without holding it in memory
+
+    The column set and dtypes are fixed by the first non-empty chunk (empty chunks
+    before it are held back, since empty object columns have no inferable type). Usage:
+        with DatasetWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path):
+        self.stem = _strip_ext(path)
+        self.use_parquet = has_parquet()
+        self.path = self.stem + (PARQUET_EXT if self.use_parquet else NPY_DIR_EXT)
+        self.n_rows = 0
+        self._columns = None
+        self._parquet = None
+        self._schema = None
+        self._parts = {}
+        self._dtypes = {}
+        self._categories = {}
+        self._pending_empty = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _prepare(self, chunk):
+        """스키마 적용 + 첫 청크 기준 컬럼 순서 고정 (범주형은 문자열로 기록)"""
+        chunk = apply_schema(chunk)
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+        chunk = chunk[self._columns]
+        for col in CATEGORICAL_COLS:
+            if col in chunk.columns:
+                chunk[col] = chunk[col].astype(object)
+        return chunk.reset_index(drop=True)
+
+    def write(self, chunk):
+        """청크 추가 기록 (첫 행이 기록되기 전의 빈 청크는 보류 - 빈 object 열은 null 타입으로 추론됨)"""
+        chunk = self._prepare(chunk)
+        if chunk.empty and self.n_rows == 0:
+            self._pending_empty = chunk
+            return
+        self._write(chunk)
+
+    def _write(self, chunk):
+        if self.use_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self._schema = table.schema
+                self._parquet = pq.ParquetWriter(self.path, self._schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+            self._parquet.write_table(table)
+        else:
+            self._write_npy_chunk(chunk)
+        self.n_rows += len(chunk)
+
+    def _write_npy_chunk(self, chunk):
+        """열별 임시 파일에 원시 바이트 추가 (문자열 열은 누적 범주 사전으로 코드화)"""
+        os.makedirs(self.path, exist_ok=True)
+        for i, col in enumerate(self._columns):
+            ser = chunk[col]
+            if col not in self._parts:
+                self._parts[col] = open(os.path.join(self.path, f"{i}.npy.part"), "wb")
+                if not pd.api.types.is_numeric_dtype(ser):
+                    self._categories[col] = {}
+            if col in self._categories:
+                known = self._categories[col]
+                present = ser.notna().to_numpy()
+                text = ser[present].astype(str)
+                for value in pd.unique(text):
+                    known.setdefault(value, len(known))
+                values = np.full(len(ser), -1, dtype=np.int32)
+                values[present] = pd.Categorical(text, categories=list(known)).codes
+            else:
+                values = ser.to_numpy(self._dtypes.setdefault(col, ser.to_numpy().dtype))
+            self._parts[col].write(np.ascontiguousarray(values).tobytes())
+
+    def close(self):
+        """기록 완료 (npy 모드는 헤더 작성 후 schema.json 생성)"""
+        if self._pending_empty is not None:
+            # 모든 청크가 비어 있으면 빈 데이터셋으로 기록
+            if self.n_rows == 0:
+                self._write(self._pending_empty)
+            self._pending_empty = None
+        if self.use_parquet:
+            if self._parquet is not None:
+                self._parquet.close()
+                self._parquet = None
+            return
+        if not self._parts:
+            return
+
+        schema = {'n_rows': self.n_rows, 'columns': []}
+        for i, col in enumerate(self._columns):
+            self._parts[col].close()
+            part_path = os.path.join(self.path, f"{i}.npy.part")
+            entry = {'name': col, 'file': f"{i}.npy"}
+            if col in self._categories:
+                dtype = np.dtype(np.int32)
+                entry['categories'] = list(self._categories[col])
+                entry['categorical'] = col in CATEGORICAL_COLS
+            else:
+                dtype = self._dtypes[col]
+            entry['dtype'] = dtype.str
+            with open(os.path.join(self.path, entry['file']), "wb") as out, open(part_path, "rb") as part:
+                np.lib.format.write_array_header_1_0(out, {
+                    'descr': np.lib.format.dtype_to_descr(dtype),
+                    'fortran_order': False,
+                    'shape': (self.n_rows,)
+                })
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
+            schema['columns'].append(entry)
+        self._parts = {}
+        with open(os.path.join(self.path, "schema.json"), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False)
@@ -0,0 +1,204 @@
+"""
+LightGBM 하이퍼파라미터 탐색 (Successive Halving + 조기 종료)
+- 후보 파라미터를 무작위로 뽑아 적은 부스팅 라운드부터 평가하고, 상위 1/eta만 다음 단계(라운드 eta배)로 승급
+- 각 후보는 검증 폴드 기준 조기 종료 → 가망 없는 후보는 예산을 다 쓰지 않음
+- 학습/검증 데이터는 한 번만 binning 후 LightGBM 바이너리로 저장, 워커 프로세스는 이를 읽기만 함
+  (후보마다 원본 행렬을 다시 binning하지 않음)
+- 탐색 대상은 트리/정규화 파라미터만 (max_bin 등 binning 파라미터는 공유 Dataset과 충돌하므로 고정)
+"""
+import os
+import math
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils import RANDOM_SEED, SHARED_PYTHON_DIR  # noqa: F401 (booster_models import 경로 등록)
+from booster_models import balanced_weights
+
+# (이름, 하한, 상한, 로그 스케일 여부, 정수 여부)
+SEARCH_SPACE = [
+    ('num_leaves', 15, 127, True, True),
+    ('learning_rate', 0.02, 0.2, True, False),
+    ('feature_fraction', 0.6, 1.0, False, False),
+    ('bagging_fraction', 0.6, 1.0, False, False),
+    ('min_data_in_leaf', 10, 200, True, True),
+    ('lambda_l1', 1e-3, 10.0, True, False),
+    ('lambda_l2', 1e-3, 10.0, True, False),
+]
+SEARCH_KEYS = [name for name, *_ in SEARCH_SPACE]
+
+# 모든 후보에 공통 (train_consumption_pattern._get_base_models 고정값과 동일)
+FIXED_PARAMS = {
+    'bagging_freq': 5,
+    'seed': RANDOM_SEED,
+    'verbosity': -1,
+    'force_col_wise': True,
+}
+
+# Dataset 생성 파라미터: min_data_in_leaf를 후보마다 바꾸므로 사전 특성 필터링 비활성화
+DATASET_PARAMS = {'feature_pre_filter': False, 'verbosity': -1}
+
+_datasets = {}
+
+def sample_candidates(n_candidates, seed=RANDOM_SEED):
+    """SEARCH_SPACE에서 후보 파라미터 dict 목록 생성"""
+    rng = np.random.default_rng(seed)
+    candidates = []
+    for _ in range(n_candidates):
+        params = {}
+        for name, low, high, log, integer in SEARCH_SPACE:
+            value = math.exp(rng.uniform(math.log(low), math.log(high))) if log else rng.uniform(low, high)
+            params[name] = int(round(value)) if integer else round(float(value), 4)
+        candidates.append(params)
+    return candidates
+
+def task_params(task, n_classes=None):
+    """과제별 objective/metric (LGBMRegressor / LGBMClassifier 기본값과 동일)"""
+    if task == 'regression':
+        return {'objective': 'regression', 'metric': 'l2'}
+    if n_classes == 2:
+        return {'objective': 'binary', 'metric': 'binary_logloss'}
+    return {'objective': 'multiclass', 'metric': 'multi_logloss', 'num_class': n_classes}
+
+def build_binary_datasets(X_train, y_train, X_valid, y_valid, directory, weight_train=None, weight_valid=None):
+    """
+    학습/검증 Dataset을 1회 binning 후 LightGBM 바이너리 파일로 저장
+
+    Returns:
+        tuple: (학습 바이너리 경로, 검증 바이너리 경로)
+    """
+    import lightgbm as lgb
+    train = lgb.Dataset(np.asarray(X_train, dtype=np.float64), label=np.asarray(y_train),
+                        weight=weight_train, params=DATASET_PARAMS, free_raw_data=True)
+    valid = lgb.Dataset(np.asarray(X_valid, dtype=np.float64), label=np.asarray(y_valid),
+                        weight=weight_valid, reference=train, params=DATASET_PARAMS, free_raw_data=True)
+    paths = (os.path.join(directory, "train.bin"), os.path.join(directory, "valid.bin"))
+    train.construct().save_binary(paths[0])
+    valid.construct().save_binary(paths[1])
+    return paths
+
+def _init_worker(train_path, valid_path, num_threads):
+    """워커 프로세스: 바이너리 Dataset 로드 (binning 없음), 이후 모든 후보가 공유"""
+    import lightgbm as lgb
+    train = lgb.Dataset(train_path, params=DATASET_PARAMS).construct()
+    valid = lgb.Dataset(valid_path, reference=train, params=DATASET_PARAMS).construct()
+    _datasets.update(train=train, valid=valid, num_threads=num_threads)
+
+def run_trial(trial_id, rung, params, num_boost_round, early_stopping_rounds):
+    """후보 1개를 주어진 라운드 예산으로 학습하고 검증 점수/소요 시간 반환"""
+    import lightgbm as lgb
+    start = time.perf_counter()
+    booster = lgb.train(
+        dict(params, num_threads=_datasets['num_threads']),
+        _datasets['train'],
+        num_boost_round=num_boost_round,
+        valid_sets=[_datasets['valid']],
+        valid_names=['valid'],
+        callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)]
+    )
+    metric = params['metric']
+    return {
+        'trial': trial_id,
+        'rung': rung,
+        'budget': num_boost_round,
+        'best_iteration': booster.best_iteration or num_boost_round,
+        'score': float(booster.best_score['valid'][metric]),
+        'metric': metric,
+        'elapsed_s': round(time.perf_counter() - start, 3),
+        'params': {k: params[k] for k in SEARCH_KEYS}
+    }
+
+def successive_halving(X_train, y_train, X_valid, y_valid, task='regression', n_candidates=27, eta=3,
+                       min_rounds=50, max_rounds=1350, early_stopping_rounds=50, workers=1,
+                       balanced=False, seed=RANDOM_SEED):
+    """
+    Successive Halving 탐색
+
+    Args:
+        X_train, y_train: 탐색용 학습 폴드
+        X_valid, y_valid: 조기 종료/순위 결정용 검증 폴드
+        task (str): 'regression' 또는 'classification'
+        n_candidates (int): 첫 단계 후보 수
+        eta (int): 단계마다 남기는 비율의 역수 (라운드 예산은 eta배 증가)
+        min_rounds (int): 첫 단계 부스팅 라운드 수
+        max_rounds (int): 마지막 단계 라운드 상한
+        early_stopping_rounds (int): 검증 점수가 개선되지 않으면 중단할 라운드 수
+        workers (int): 후보를 동시에 학습하는 프로세스 수
+        balanced (bool): 분류 시 class_weight='balanced'와 같은 표본 가중치 사용
+        seed (int): 후보 샘플링 시드
+
+    Returns:
+        dict: best_params, best_iteration, best_score, metric, trials (후보별 단계/점수/소요 시간), elapsed_s
+    """
+    start = time.perf_counter()
+    y_train, y_valid = np.asarray(y_train), np.asarray(y_valid)
+
+    n_classes = None
+    if task == 'classification':
+        # 네이티브 API는 0..k-1 라벨을 요구
+        classes = np.unique(y_train)
+        n_classes = len(classes)
+        y_train, y_valid = np.searchsorted(classes, y_train), np.searchsorted(classes, y_valid)
+    base = dict(FIXED_PARAMS, **task_params(task, n_classes))
+
+    weights = (balanced_weights(y_train), balanced_weights(y_valid)) if balanced else (None, None)
+    num_threads = max(1, (os.cpu_count() or 1) // workers)
+
+    trials = []
+    with tempfile.TemporaryDirectory(prefix="piggy_hpo_") as directory:
+        paths = build_binary_datasets(X_train, y_train, X_valid, y_valid, directory, *weights)
+        if workers > 1:
+            # LightGBM(OpenMP)을 사용한 부모 프로세스를 fork하면 교착될 수 있으므로 spawn
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=_init_worker, initargs=(*paths, num_threads))
+        else:
+            executor = None
+            _init_worker(*paths, num_threads)
+
+        try:
+            survivors = list(enumerate(sample_candidates(n_candidates, seed)))
+            rung, budget = 0, min_rounds
+            while True:
+                budget = min(budget, max_rounds)
+                jobs = [(trial_id, rung, dict(base, **params), budget, early_stopping_rounds)
+                        for trial_id, params in survivors]
+                if executor is None:
+                    results = [run_trial(*job) for job in jobs]
+                else:
+                    results = list(executor.map(run_trial, *zip(*jobs)))
+                trials.extend(results)
+
+                results.sort(key=lambda r: r['score'])
+                print(f"[탐색 {task}] 단계 {rung}: 후보 {len(results)}개 x 최대 {budget}라운드 → "
+                      f"최고 {results[0]['metric']}={results[0]['score']:.5f}")
+                if budget >= max_rounds:
+                    best = results[0]
+                    break
+                # 마지막 1개가 남으면 바로 최대 예산으로 학습하여 최종 라운드 수 결정
+                keep = max(1, len(results) // eta)
+                survivors = [(r['trial'], r['params']) for r in results[:keep]]
+                rung, budget = rung + 1, max_rounds if keep == 1 else budget * eta
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            _datasets.clear()
+
+    return {
+        'method': 'successive_halving',
+        'task': task,
+        'best_params': best['params'],
+        'best_iteration': best['best_iteration'],
+        'best_score': best['score'],
+        'metric': best['metric'],
+        'n_trials': len(trials),
+        'elapsed_s': round(time.perf_counter() - start, 3),
+        'trials': trials
+    }
+
+def trials_frame(search):
+    """탐색 결과 → 후보/단계별 리포트 DataFrame (파라미터는 컬럼으로 펼침)"""
+    rows = [dict({k: v for k, v in trial.items() if k != 'params'}, **trial['params'])
+            for trial in search['trials']]
+    return pd.DataFrame(rows).sort_values(['rung', 'score'], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,209 @@
+"""
+사용자 ID 기준 증분 재계산
+
+사용법:
+    python incremental_scoring.py --data ./data/users_today --output ./data/scored_today --model Fin_model_v1_1
+
+- 점수 저장소(dataset_store)에 사용자별 입력 해시와 점수/모델 출력을 보관
+- 신규/변경 행(내용 해시 또는 갱신 시각)만 점수 계산과 모델 예측을 다시 수행
+- 변경 없는 사용자는 저장값을 재사용 → 일일 작업 비용이 전체 인원이 아닌 변경 인원에 비례
+"""
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from utils import SHARED_PYTHON_DIR  # noqa: F401 (feature_pipeline import 경로 등록)
+from dataset_store import save_dataset, load_dataset, resolve_dataset
+from scoring import add_financial_scores, SPENDING_RATIO_COLS
+from feature_pipeline import BASE_FEATURES, engineer_features_frame, frame_to_matrix
+from tree_ensemble import bundle_predictor
+
+USER_ID_COL = "user_id"
+HASH_COL = "_row_hash"
+SCORE_STORE_PATH = "./data/score_store"
+
+# score_row/score_frame 로직이 바뀌면 올려서 저장소 전체 재계산
+SCORING_VERSION = 1
+
+SCORE_INPUT_COLS = ["total_spending", "n_transactions"] + SPENDING_RATIO_COLS
+SCORE_OUTPUT_COLS = ["재무건전_점수", "페르소나_레벨", "페르소나_이름", "페르소나_이모지", "페르소나_설명", "재무건전_라벨"]
+TEXT_OUTPUT_COLS = ["페르소나_이름", "페르소나_이모지", "페르소나_설명"]
+
+def row_hashes(df, columns):
+    """
+    행별 내용 해시 (벡터화)
+
+    Args:
+        df (DataFrame): 입력 데이터
+        columns (list): 점수 계산에 쓰이는 컬럼
+
+    Returns:
+        ndarray: 행별 uint64 해시
+    """
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+def model_predictor(model_data):
+    """
+    변경 행에 소비패턴 모델 출력을 추가하는 predict_fn 생성
+
+    서빙과 같은 BundlePredictor로 예측하므로 변경 행 수와 관계없이 저장 등급이 서빙 결과와 같음
+
+    Args:
+        model_data (dict): 모델 번들 (regressor, classifier, scaler, feature_names)
+
+    Returns:
+        callable: DataFrame → 소비패턴_점수, 위험_등급 컬럼 DataFrame
+    """
+    predictor = bundle_predictor(model_data)
+
+    def predict(df):
+        X = frame_to_matrix(engineer_features_frame(df), model_data['feature_names'])
+        prediction = predictor.predict(X)
+        return pd.DataFrame({
+            '소비패턴_점수': np.clip(prediction['consumption_score'], 0, 80),
+            '위험_등급': prediction['risk_classification'].astype(np.int64)
+        }, index=df.index)
+
+    predict.version = model_data.get('model_version', 'v1.0')
+    return predict
+
+def _store_meta_path(store_path):
+    return store_path + ".meta.json"
+
+def _store_signature(hash_columns, updated_col, predict_fn):
+    return {
+        'scoring_version': SCORING_VERSION,
+        'hash_columns': hash_columns,
+        'updated_col': updated_col,
+        'model_version': getattr(predict_fn, 'version', None) if predict_fn is not None else None
+    }
+
+def load_score_store(store_path, signature):
+    """
+    같은 서명으로 기록된 점수 저장소 로드
+
+    Args:
+        store_path (str): 저장소 경로 (확장자 제외)
+        signature (dict): 점수 로직 버전 / 해시 컬럼 / 모델 버전
+
+    Returns:
+        DataFrame or None: 저장된 행 (없거나 서명이 다르면 None)
+    """
+    meta_path = _store_meta_path(store_path)
+    if resolve_dataset(store_path) is None or not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        if json.load(f) != signature:
+            return None
+    return load_dataset(store_path)
+
+def save_score_store(store, store_path, signature):
+    save_dataset(store, store_path)
+    with open(_store_meta_path(store_path), "w", encoding="utf-8") as f:
+        json.dump(signature, f, ensure_ascii=False)
+
+def incremental_score(df, store_path=SCORE_STORE_PATH, id_col=USER_ID_COL, updated_col=None, predict_fn=None):
+    """
+    신규/변경 사용자만 점수 계산 후 저장 결과와 병합
+
+    Args:
+        df (DataFrame): 현재 사용자 데이터 (사용자당 1행)
+        store_path (str): 저장소 경로 (확장자 제외)
+        id_col (str): 사용자 ID 컬럼
+        updated_col (str): 갱신 시각 컬럼 (선택). 지정하면 저장값보다 최신인 행만 재계산,
+            없으면 내용 해시로 판단
+        predict_fn (callable): 추가 모델 출력을 만드는 DataFrame → DataFrame 함수 (선택, model_predictor 참고)
+
+    Returns:
+        tuple: (add_financial_scores(df)와 같은 결과 + predict_fn 컬럼, 통계 dict)
+    """
+    start = time.perf_counter()
+    if df[id_col].duplicated().any():
+        raise ValueError(f"{id_col} 컬럼에 중복된 사용자가 있습니다")
+
+    hash_columns = list(SCORE_INPUT_COLS)
+    if predict_fn is not None:
+        hash_columns += [col for col in BASE_FEATURES if col not in hash_columns]
+    signature = _store_signature(hash_columns, updated_col, predict_fn)
+
+    hashes = row_hashes(df, hash_columns)
+    store = load_score_store(store_path, signature)
+
+    if store is None:
+        changed = np.ones(len(df), dtype=bool)
+        stored = None
+    else:
+        stored = store.set_index(id_col).reindex(df[id_col].to_numpy())
+        known = stored[HASH_COL].notna().to_numpy()
+        if updated_col is not None:
+            is_newer = (df[updated_col].to_numpy() > stored[updated_col].to_numpy())
+            changed = ~known | is_newer
+        else:
+            changed = ~known | (stored[HASH_COL].to_numpy() != hashes)
+
+    fresh = add_financial_scores(df.loc[changed])
+    output_cols = list(SCORE_OUTPUT_COLS)
+    # 저장소가 없으면 빈 입력이어도 predict_fn으로 출력 컬럼을 정함 (재사용할 저장 컬럼이 없음)
+    if predict_fn is not None and (changed.any() or stored is None):
+        extra = predict_fn(df.loc[changed])
+        fresh = fresh.join(extra)
+        output_cols += list(extra.columns)
+    elif predict_fn is not None:
+        output_cols += [col for col in stored.columns if col not in SCORE_OUTPUT_COLS + [HASH_COL, updated_col]]
+
+    result = df.copy()
+    for col in output_cols:
+        if stored is None:
+            values = fresh[col].to_numpy()
+        else:
+            values = stored[col].to_numpy(dtype=object if col in TEXT_OUTPUT_COLS else None, copy=True)
+            # 변경 행이 없으면 fresh에 predict_fn 출력 컬럼이 없음 (저장값 그대로 사용)
+            if changed.any():
+                values[changed] = fresh[col].to_numpy()
+        if col in TEXT_OUTPUT_COLS:
+            result[col] = pd.Series(np.asarray(values, dtype=object), index=df.index)
+        else:
+            result[col] = values.astype(fresh[col].dtype if col in fresh.columns else stored[col].dtype)
+
+    store_cols = [id_col] + ([updated_col] if updated_col is not None else []) + output_cols
+    new_store = result[store_cols].copy()
+    new_store[HASH_COL] = hashes
+    save_score_store(new_store, store_path, signature)
+
+    stats = {
+        'total': len(df),
+        'changed': int(changed.sum()),
+        'new': int(len(df) if stored is None else (~known).sum()),
+        'removed': 0 if store is None else int((~store[id_col].isin(df[id_col])).sum()),
+        'elapsed_s': round(time.perf_counter() - start, 3)
+    }
+    return result, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 ID 기준 증분 재무점수 계산")
+    parser.add_argument("--data", required=True, help="현재 사용자 데이터 (확장자 없이 지정 가능)")
+    parser.add_argument("--store", default=SCORE_STORE_PATH, help="점수 저장소 경로")
+    parser.add_argument("--output", help="전체 점수 결과 저장 경로")
+    parser.add_argument("--id-col", default=USER_ID_COL)
+    parser.add_argument("--updated-col", help="변경 감지에 사용할 갱신 시각 컬럼 (없으면 내용 해시)")
+    parser.add_argument("--model", help="priv/models 아래 모델 버전명 (지정 시 변경 행만 모델 예측)")
+    args = parser.parse_args()
+
+    predict_fn = None
+    if args.model:
+        import model_registry
+        predict_fn = model_predictor(model_registry.load_model(args.model))
+
+    df = load_dataset(args.data)
+    result, stats = incremental_score(df, args.store, id_col=args.id_col,
+                                      updated_col=args.updated_col, predict_fn=predict_fn)
+    print(f"증분 점수 계산 완료: 전체 {stats['total']:,}명 중 {stats['changed']:,}명 재계산 "
+          f"(신규 {stats['new']:,}, 삭제 {stats['removed']:,}) - {stats['elapsed_s']}초")
+
+    if args.output:
+        print(f"결과 저장: {save_dataset(result, args.output)}")
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,16 @@ Main pipeline for financial health prediction model
 import os
 import pandas as pd
 from data_load import load_kosis_data, add_derived_indicators, load_synthetic_data, preprocess_synthetic_data
+from dataset_store import resolve_dataset, save_dataset
 from scoring import calculate_kosis_scores, add_financial_scores, get_persona_from_score, add_realistic_scores
+from incremental_scoring import incremental_score, USER_ID_COL, SCORE_STORE_PATH
 from train import FinancialHealthModel
 from evaluation import comprehensive_evaluation, plot_importance, plot_score_distribution
 from utils import RANDOM_SEED
 
+# 중간/결과 데이터는 컬럼형 포맷(dataset_store)으로 저장, CSV는 검토용 선택 사본
+EXPORT_CSV = False
+
 def main():
     """
     Main pipeline execution
@@ -34,14 +39,20 @@ def main():
     
     # 2. 합성 데이터 로드 및 전처리
     print("\n2. 합성 데이터 로드 중...")
-    synth_data_path = "./data/synth_finance_scored_realistic.csv"
+    # 확장자 없이 지정: 컬럼형 사본이 있으면 CSV보다 우선
+    synth_data_path = "./data/synth_finance_scored_realistic"
     
-    if os.path.exists(synth_data_path):
+    if resolve_dataset(synth_data_path) is not None:
         synth_df = load_synthetic_data(synth_data_path)
         if not synth_df.empty:
             print(f"합성 데이터 로드 완료: {synth_df.shape}")
             synth_df = preprocess_synthetic_data(synth_df)
-            synth_df = add_financial_scores(synth_df)
+            if USER_ID_COL in synth_df.columns:
+                # 사용자 ID가 있으면 점수 저장소 기준으로 변경된 사용자만 재계산
+                synth_df, stats = incremental_score(synth_df, SCORE_STORE_PATH)
+                print(f"증분 점수 계산: {stats['total']:,}명 중 {stats['changed']:,}명 재계산 ({stats['elapsed_s']}초)")
+            else:
+                synth_df = add_financial_scores(synth_df)
             
             # 페르소나 분포 출력
             persona_counts = synth_df['페르소나_레벨'].value_counts().sort_index()
@@ -80,17 +91,17 @@ def main():
         pickle.dump(model, f)
     print(f"모델 저장 완료: {model_path}")
     
-    # 5. 결과 저장
+    # 5. 결과 저장 (학습 스크립트 입력)
     print("\n5. 결과 저장 중...")
-    output_path = "./data/synth_finance_scored_final.csv"
-    synth_df.to_csv(output_path, index=False)
-    print(f"결과 저장 완료: {output_path}")
+    output_path = "./data/synth_finance_scored_final"
+    save_dataset(synth_df, output_path, csv_path=output_path + ".csv" if EXPORT_CSV else None)
     
-    # 6. 현실형 점수 저장
-    print("\n6. 현실형 점수 저장 중...")
-    realistic_output_path = "./data/synth_finance_realistic_scored.csv"
-    synth_df.to_csv(realistic_output_path, index=False)
-    print(f"현실형 점수 저장 완료: {realistic_output_path}")
+    # 6. 현실형 점수 저장 (7단계 이전에는 5단계와 동일한 데이터이므로 CSV 사본만 선택 저장)
+    if EXPORT_CSV:
+        print("\n6. 현실형 점수 저장 중...")
+        realistic_output_path = "./data/synth_finance_realistic_scored.csv"
+        synth_df.to_csv(realistic_output_path, index=False)
+        print(f"현실형 점수 저장 완료: {realistic_output_path}")
     
     # 7. 현실형 점수 계산 (KOSIS 참조가 있는 경우)
     if not kosis_df.empty:
@@ -108,26 +119,33 @@ def main():
             
             synth_df = add_realistic_scores(synth_df, ref_tbl)
             
-            realistic_output_path = "./synth_finance_realistic_scored.csv"
-            synth_df.to_csv(realistic_output_path, index=False)
-            print(f"현실형 점수 결과 저장: {realistic_output_path}")
+            realistic_output_path = "./data/synth_finance_realistic_scored"
+            save_dataset(synth_df, realistic_output_path,
+                         csv_path="./synth_finance_realistic_scored.csv" if EXPORT_CSV else None)
     
     print("\n=== 파이프라인 완료 ===")
     print(f"최종 데이터 크기: {synth_df.shape}")
     print(f"회귀 성능 - RMSE: {eval_results['regression_metrics']['rmse']:.3f}, R²: {eval_results['regression_metrics']['r2']:.3f}")
     print(f"분류 성능 - 정확도: {eval_results['classification_metrics']['accuracy']:.3f}")
 
-def predict_new_data(model_path, new_data_path, output_path):
+def predict_new_data(model_path, new_data_path, output_path, chunk_size=50_000, workers=1, resume=True):
     """
-    새로운 데이터에 대한 예측 수행
+    새로운 데이터에 대한 예측 수행 (청크 단위 스트리밍, batch_predict.py 참고)
     
     Args:
-        model_path (str): 저장된 모델 경로
-        new_data_path (str): 새로운 데이터 경로
-        output_path (str): 예측 결과 저장 경로
+        model_path (str): 저장된 모델 번들 경로 (예: ./model/Fin_model_v1.pkl)
+        new_data_path (str): 새로운 데이터 경로 (CSV / NDJSON / 컬럼형 데이터셋)
+        output_path (str): 예측 결과 저장 경로 (.csv 또는 .ndjson)
+        chunk_size (int): 청크당 행 수
+        workers (int): 예측 프로세스 수
+        resume (bool): 중단된 작업이 있으면 이어서 처리
+    
+    Returns:
+        dict: 처리 행 수 / 소요 시간 / 초당 처리 행 수
     """
-    # 이 함수는 모델 저장/로드 기능이 구현된 후 사용 가능
-    pass
+    from batch_predict import predict_file
+    return predict_file(new_data_path, output_path, model_path=model_path, chunk_size=chunk_size,
+                        workers=workers, resume=resume)
 
 if __name__ == "__main__":
     # numpy import 추가
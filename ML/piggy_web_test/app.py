@@ -1,81 +1,120 @@
 """
 Piggy 재무건전성 예측 웹 애플리케이션
 """
-import pickle
+import json
+import logging
+import os
+import sys
 import pandas as pd
 from flask import Flask, render_template, request, jsonify
 import numpy as np
 import joblib
 
+# 학습/Pythonx 브릿지와 공유하는 특성 공학 모듈 (priv/python)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'priv', 'python'))
+from feature_pipeline import build_feature_matrix
+from tree_ensemble import BundlePredictor
+from model_artifact import load_bundle, resolve_model_path
+from structured_logging import setup_logging, get_logger, sample_trace
+from stage_timing import StageTimer, REGISTRY
+from result_cache import ResultCache
+
+# 구조화 로깅 (JSON, 백그라운드 스레드 출력) - PIGGY_LOG_LEVEL / PIGGY_LOG_SAMPLE_RATE로 조정
+setup_logging()
+logger = get_logger('app')
+
 app = Flask(__name__)
 
+# 반복 제출(Step2 ↔ Step3 이동) 대비 모델 예측 결과 캐시 - PIGGY_CACHE_SIZE / PIGGY_CACHE_TTL로 조정
+RESULT_CACHE = ResultCache.from_env()
+
 # 설정: 모델 사용 여부
 USE_CONSUMPTION_MODEL = True  # True: 소비패턴 ML 모델 + Rule-based 재무점수
+COMPILED_MAX_ROWS = 128  # 이 행 수 이하는 평탄화 트리 평가기, 초과하면 네이티브 평가기 (결과는 같음)
+# 확장자 없는 이름은 아티팩트 디렉터리 우선, 없으면 .pkl (resolve_model_path) - 다른 모델 버전 서빙/벤치마크용
+MODEL_PATH = os.environ.get('PIGGY_MODEL_PATH', 'Fin_model_v1')
+TIMING_HEADER = os.environ.get('PIGGY_TIMING_HEADER', '0') == '1'  # 모든 응답에 X-Timing 헤더 포함 (디버깅용)
 
-# 소비패턴 모델 로드
-consumption_model = None
-if USE_CONSUMPTION_MODEL:
-    try:
-        # 소비패턴 모델 로드
-        with open('Fin_model_v1.pkl', 'rb') as f:
-            model_data = pickle.load(f)
+class ConsumptionPatternModel:
+    def __init__(self, model_data, model_path):
+        self.regressor = model_data['regressor']
+        self.classifier = model_data['classifier']
+        self.scaler = model_data['scaler']
+        self.feature_names = model_data['feature_names']
+        self.training_metadata = model_data.get('training_metadata', {})
+        self.model_version = model_data.get('model_version', 'v1.0')
+        self.model_path = model_path
+        self.model_mtime = os.path.getmtime(model_path)
+        # 캐시 무효화 단위: 같은 경로에 새 모델이 배포되면 수정 시각으로 구분
+        self.cache_version = f"{model_path}:{self.model_version}:{self.model_mtime:.0f}"
         
-        if isinstance(model_data, dict) and 'regressor' in model_data:
-            print("소비패턴 모델 로드 성공: Fin_model_v1.pkl")
-            
-            # 소비패턴 모델 클래스 생성
-            class ConsumptionPatternModel:
-                def __init__(self, model_data):
-                    self.regressor = model_data['regressor']
-                    self.classifier = model_data['classifier']
-                    self.scaler = model_data['scaler']
-                    self.feature_names = model_data['feature_names']
-                    self.training_metadata = model_data.get('training_metadata', {})
-                    self.model_version = model_data.get('model_version', 'v1.0')
-                
-                def predict_consumption_pattern(self, X):
-                    """소비패턴 점수 예측 (0-80점)"""
-                    if isinstance(X, pd.DataFrame):
-                        X_array = X[self.feature_names].values
-                    else:
-                        X_array = X
-                    
-                    if self.scaler is not None:
-                        X_scaled = self.scaler.transform(X_array)
-                    else:
-                        X_scaled = X_array
-                    
-                    consumption_score = self.regressor.predict(X_scaled)
-                    risk_class = self.classifier.predict(X_scaled)
-                    risk_proba = self.classifier.predict_proba(X_scaled)
-                    
-                    return {
-                        'consumption_score': consumption_score,  # 0-80점
-                        'risk_classification': risk_class,
-                        'risk_probabilities': risk_proba
-                    }
-            
-            consumption_model = ConsumptionPatternModel(model_data)
-            print("소비패턴 모델 래퍼 생성 완료")
-            print(f"특성 개수: {len(consumption_model.feature_names)}")
-            print(f"모델 버전: {consumption_model.model_version}")
-            print(f"특성 목록: {consumption_model.feature_names}")
+        # 배치 크기와 무관하게 같은 결과를 내는 예측기 (평탄화 실패 시 네이티브 평가기만 사용)
+        self.predictor = BundlePredictor(model_data, compiled_max_rows=COMPILED_MAX_ROWS)
+        if self.predictor.compile_error is not None:
+            logger.warning("트리 평탄화 실패, 네이티브 평가기로 추론", extra={'fields': {
+                'model_version': self.model_version, 'error': str(self.predictor.compile_error)}})
+    
+    def predict_consumption_pattern(self, X):
+        """소비패턴 점수 예측 (0-80점)"""
+        if isinstance(X, pd.DataFrame):
+            X_array = X[self.feature_names].values
         else:
-            print("모델 형식이 올바르지 않습니다")
-            consumption_model = None
+            X_array = X
+        
+        # consumption_score 0-80점, risk_classification, risk_probabilities
+        return self.predictor.predict(X_array)
+
+def load_consumption_model(model_path=MODEL_PATH):
+    """소비패턴 모델 로드 - 아티팩트 디렉터리 또는 pickle (실패 시 None → Rule-based 폴백)"""
+    model_path = resolve_model_path(model_path)
+    try:
+        model_data = load_bundle(model_path)
+        
+        if not (isinstance(model_data, dict) and 'regressor' in model_data):
+            logger.error("모델 형식이 올바르지 않습니다", extra={'fields': {'model_path': model_path}})
+            return None
+        
+        logger.info("소비패턴 모델 로드 성공", extra={'fields': {'model_path': model_path}})
+        model = ConsumptionPatternModel(model_data, model_path)
+        logger.info("소비패턴 모델 래퍼 생성 완료", extra={'fields': {
+            'n_features': len(model.feature_names),
+            'model_version': model.model_version,
+            'feature_names': model.feature_names
+        }})
+        return model
         
     except FileNotFoundError:
-        print("Fin_model_v1.pkl 파일을 찾을 수 없습니다")
-        consumption_model = None
-    except Exception as e:
-        print(f"소비패턴 모델 로드 실패: {e}")
-        consumption_model = None
+        logger.error("모델 파일을 찾을 수 없습니다", extra={'fields': {'model_path': model_path}})
+    except Exception:
+        logger.exception("소비패턴 모델 로드 실패", extra={'fields': {'model_path': model_path}})
+    return None
+
+def reload_consumption_model(model_path=MODEL_PATH):
+    """
+    새 모델로 교체 (로드 실패 시 기존 모델 유지)
+    
+    gunicorn 마스터에서 호출하면 이후 fork되는 워커가 새 모델을 공유한다 (gunicorn.conf.py 참고).
+    
+    Returns:
+        bool: 교체 성공 여부
+    """
+    global consumption_model
+    model = load_consumption_model(model_path)
+    if model is None:
+        return False
+    
+    previous, consumption_model = consumption_model, model
+    if previous is not None:
+        RESULT_CACHE.invalidate(previous.cache_version)
+    return True
+
+# 소비패턴 모델 로드 (gunicorn preload 시 마스터에서 1회만 실행, 워커는 fork로 공유)
+consumption_model = load_consumption_model() if USE_CONSUMPTION_MODEL else None
 
 if consumption_model is None:
-    print("소비패턴 모델 사용 불가 - 완전 Rule-based 로직으로 폴백")
-    USE_CONSUMPTION_MODEL = False
+    logger.warning("소비패턴 모델 사용 불가 - 완전 Rule-based 로직으로 폴백")
 else:
-    print(f"소비패턴 모델 사용 준비 완료 (USE_CONSUMPTION_MODEL={USE_CONSUMPTION_MODEL})")
+    logger.info("소비패턴 모델 사용 준비 완료", extra={'fields': {'use_consumption_model': USE_CONSUMPTION_MODEL}})
 
 def calculate_financial_score_with_scaling(consumption_score, income, total_spending, savings_rate):
     """
@@ -137,10 +176,50 @@ def calculate_financial_score_with_scaling(consumption_score, income, total_spen
     # 4. 0-100 범위로 제한
     final_score = max(0, min(100, final_score))
     
-    print(f"최종점수 계산: 소비패턴점수({pattern_score:.1f}) + 저축률점수({savings_score:.1f}) + 소득수준점수({income_score:.1f}) + 지출효율점수({efficiency_score:.1f}) = 최종점수({final_score:.1f})")
+    # 점수 구성 추적은 샘플링된 요청만 기록
+    if logger.isEnabledFor(logging.DEBUG) and sample_trace():
+        logger.debug("최종점수 계산", extra={'fields': {
+            'pattern_score': pattern_score,
+            'savings_score': savings_score,
+            'income_score': income_score,
+            'efficiency_score': efficiency_score,
+            'final_score': final_score
+        }})
     
     return final_score
 
+def calculate_financial_scores_batch(consumption_scores, income, total_spending, savings_rate):
+    """
+    calculate_financial_score_with_scaling의 배열 버전 (배치 예측용)
+    
+    Args:
+        consumption_scores: 소비패턴 점수 배열 (0-80점)
+        income: 월 소득 배열 (만원)
+        total_spending: 월 지출 배열 (만원)
+        savings_rate: 저축률 배열 (비율)
+    
+    Returns:
+        ndarray: 최종 재무건전성 점수 배열 (0-100점)
+    """
+    pattern_score = np.clip(np.asarray(consumption_scores, dtype=float), 0, 80)
+    
+    savings_score = np.select(
+        [savings_rate >= 0.3, savings_rate >= 0.2, savings_rate >= 0.1, savings_rate >= 0],
+        [12, 10, 8, 5],
+        default=np.maximum(0, 5 + savings_rate * 25)
+    )
+    income_score = np.select([income >= 600, income >= 400, income >= 250], [4, 3, 2], default=1)
+    
+    spending_income_ratio = np.divide(total_spending, income, out=np.full(len(income), 2.0), where=income > 0)
+    efficiency_score = np.select(
+        [spending_income_ratio <= 0.6, spending_income_ratio <= 0.8, spending_income_ratio <= 1.0],
+        [4, 3, 2],
+        default=np.maximum(0, 2 - (spending_income_ratio - 1) * 2)
+    )
+    
+    financial_ratio_score = savings_score + income_score + efficiency_score
+    return np.clip(pattern_score + financial_ratio_score, 0, 100)
+
 def get_persona(score, savings_rate, income, total_spending):
     """점수, 저축률, 소득, 지출을 고려한 페르소나 반환 (savings_rate는 비율)"""
     # 저축률과 소득 수준을 고려한 세분화된 페르소나
@@ -182,8 +261,7 @@ def calculate_fallback_score(data):
     spending_ratio = total_spending / income if income > 0 else 1.0
     savings_rate = savings / income if income > 0 else -1.0  # 저축률 계산
     
-    print(f"월소득: {income:.1f}만원, 월지출: {total_spending:.1f}만원, 저축액: {savings:.1f}만원")
-    print(f"지출 비율: {spending_ratio:.2f}, 저축률: {savings_rate:.2f}")
+    trace = logger.isEnabledFor(logging.DEBUG) and sample_trace()
     
     # 기본 점수 계산 (50점을 중간 수준으로)
     score = 50.0
@@ -228,7 +306,6 @@ def calculate_fallback_score(data):
     
     # 필수 지출 비율 체크
     essential_ratio = float(data['food']) + float(data['housing']) + float(data['medical'])
-    print(f"필수 지출 비율: {essential_ratio:.2f}")
     if essential_ratio < 0.25:  # 필수 지출 너무 적음
         score -= 15
     elif essential_ratio > 0.8:  # 필수 지출 너무 많음
@@ -285,7 +362,7 @@ def calculate_fallback_score(data):
     elif education_ratio > 0.05:  # 적정 투자
         score += 2
     
-    print(f"계산된 점수: {score}")
+    raw_score = score
     
     # 점수 범위 조정
     score = max(0, min(100, score))
@@ -302,7 +379,18 @@ def calculate_fallback_score(data):
         
     probabilities = [0.7, 0.2, 0.08, 0.02] if risk_label == 0 else [0.1, 0.6, 0.25, 0.05] if risk_label == 1 else [0.05, 0.25, 0.6, 0.1] if risk_label == 2 else [0.02, 0.08, 0.3, 0.6]
     
-    print(f"폴백 계산 완료 - 점수: {score}, 위험도: {risk_label}")
+    if trace:
+        logger.debug("폴백 계산 완료", extra={'fields': {
+            'income': income,
+            'total_spending': total_spending,
+            'savings': savings,
+            'spending_ratio': spending_ratio,
+            'savings_rate': savings_rate,
+            'essential_ratio': essential_ratio,
+            'raw_score': raw_score,
+            'score': score,
+            'risk_label': risk_label
+        }})
     return score, risk_label, probabilities, savings, savings_rate
 
 def get_risk_level(risk_label):
@@ -315,77 +403,152 @@ def get_risk_level(risk_label):
     }
     return risk_levels.get(risk_label, risk_levels[1])
 
+# 배치 요청 최대 건수
+MAX_BATCH_SIZE = 100000
+
+# API 필드명 → 모델 컬럼명
+API_FIELD_MAP = {
+    'total_spending': 'total_spending',
+    'mean_spending': 'mean_spending',
+    'n_transactions': 'n_transactions',
+    'education': '교육육아',
+    'transport': '교통',
+    'other': '기타소비',
+    'medical': '보건의료',
+    'food': '식료품음료',
+    'entertainment': '오락문화',
+    'housing': '주거',
+    'income': 'est_income_만원'
+}
+
+def to_model_record(data):
+    """API 요청 데이터 → 모델 컬럼명 기준 레코드 (11개 기본 입력)"""
+    record = {column: float(data[field]) for field, column in API_FIELD_MAP.items()}
+    record['n_transactions'] = int(data['n_transactions'])
+    return record
+
+def parse_batch_payload(req):
+    """배치 요청 파싱: JSON 배열, {"users": [...]}, NDJSON 지원"""
+    if req.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return [json.loads(line) for line in req.get_data(as_text=True).splitlines() if line.strip()]
+    
+    payload = req.get_json()
+    if isinstance(payload, dict):
+        payload = payload.get('users')
+    if not isinstance(payload, list):
+        raise ValueError("요청 본문은 사용자 데이터 배열이어야 합니다")
+    return payload
+
+def predict_records(records, timer=None):
+    """
+    여러 사용자를 한 번에 예측 (특성 공학/모델 호출은 배치 전체에 대해 1회)
+    
+    Args:
+        records (list): /predict와 동일한 형식의 사용자 입력 목록
+        timer (StageTimer): 단계별 소요 시간 기록 대상 (None이면 'predict_batch' 타이머 생성)
+    
+    Returns:
+        list: 사용자별 /predict 응답과 동일한 형식의 결과 목록
+    """
+    timer = timer or StageTimer('predict_batch')
+    with timer.span('record'):
+        model_records = [to_model_record(r) for r in records]
+    income = np.array([r['est_income_만원'] for r in model_records])
+    total_spending = np.array([r['total_spending'] for r in model_records])
+    savings = income - total_spending
+    savings_rate = np.divide(savings, income, out=np.full(len(income), -1.0), where=income > 0)
+    
+    scores = None
+    if USE_CONSUMPTION_MODEL and consumption_model is not None:
+        try:
+            with timer.span('features'):
+                X = build_feature_matrix(model_records, consumption_model.feature_names)
+            with timer.span('model'):
+                consumption_prediction = consumption_model.predict_consumption_pattern(X)
+            consumption_scores = np.clip(consumption_prediction['consumption_score'], 0, 80)
+            with timer.span('financial_score'):
+                scores = calculate_financial_scores_batch(consumption_scores, income, total_spending, savings_rate)
+            risk_labels = consumption_prediction['risk_classification'].astype(int)
+            probabilities = consumption_prediction['risk_probabilities'].tolist()
+        except Exception as e:
+            logger.exception("배치 소비패턴 모델 예측 실패 - 완전 Rule-based 로직으로 폴백",
+                             extra={'fields': {'batch_size': len(records)}})
+            scores = None
+    
+    if scores is None:
+        with timer.span('fallback_score'):
+            fallback = [calculate_fallback_score(r) for r in records]
+        scores = [f[0] for f in fallback]
+        risk_labels = [f[1] for f in fallback]
+        probabilities = [f[2] for f in fallback]
+    
+    results = []
+    with timer.span('persona'):
+        for i in range(len(records)):
+            score = float(scores[i])
+            risk_label = int(risk_labels[i])
+            results.append({
+                'score': round(score, 1),
+                'risk_label': risk_label,
+                'risk_info': get_risk_level(risk_label),
+                'persona': get_persona(score, float(savings_rate[i]), float(income[i]), float(total_spending[i])),
+                'probabilities': probabilities[i],
+                'savings': round(float(savings[i]), 1),
+                'savings_rate': round(float(savings_rate[i]) * 100, 1),
+                'income': round(float(income[i]), 1),
+                'total_spending': round(float(total_spending[i]), 1)
+            })
+    return results
+
+def with_timing_header(response, timer):
+    """PIGGY_TIMING_HEADER=1 이거나 요청에 X-Timing 헤더가 있으면 단계별 소요 시간(ms)을 응답 헤더로 노출"""
+    if TIMING_HEADER or 'X-Timing' in request.headers:
+        response.headers['X-Timing'] = timer.header_value()
+    return response
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/predict', methods=['POST'])
 def predict():
+    timer = StageTimer('predict')
     try:
         # 입력 데이터 받기
-        data = request.json
-        print(f"받은 데이터: {data}")
+        with timer.span('parse'):
+            data = request.json
+        logger.debug("받은 데이터", extra={'fields': {'payload': data}})
         
         # 기본 입력 데이터 구성
-        base_input_data = pd.DataFrame({
-            'total_spending': [float(data['total_spending'])],
-            'mean_spending': [float(data['mean_spending'])],
-            'n_transactions': [int(data['n_transactions'])],
-            '교육육아': [float(data['education'])],
-            '교통': [float(data['transport'])],
-            '기타소비': [float(data['other'])],
-            '보건의료': [float(data['medical'])],
-            '식료품음료': [float(data['food'])],
-            '오락문화': [float(data['entertainment'])],
-            '주거': [float(data['housing'])],
-            'est_income_만원': [float(data['income'])]
-        })
-        
-        print(f"기본 입력 데이터 형태: {base_input_data.shape}")
-        print(f"USE_CONSUMPTION_MODEL: {USE_CONSUMPTION_MODEL}, 소비패턴모델 상태: {consumption_model is not None}")
+        with timer.span('record'):
+            model_record = to_model_record(data)
         
         if USE_CONSUMPTION_MODEL and consumption_model is not None:
             try:
-                print("소비패턴 모델 + Rule-based 재무점수 사용")
-                
-                # 소비패턴 분석용 특성 생성
-                consumption_data = base_input_data.copy()
-                
-                # 소비 구조 특성
-                consumption_data['essential_spending_ratio'] = consumption_data['주거'] + consumption_data['식료품음료'] + consumption_data['보건의료']
-                consumption_data['discretionary_spending_ratio'] = consumption_data['오락문화'] + consumption_data['기타소비']
-                consumption_data['investment_spending_ratio'] = consumption_data['교육육아']
-                consumption_data['transport_spending_ratio'] = consumption_data['교통']
-                
-                # 거래 패턴 특성
-                consumption_data['avg_transaction_size'] = consumption_data['total_spending'] / (consumption_data['n_transactions'] + 1)
-                consumption_data['transaction_frequency_score'] = np.where(
-                    (consumption_data['n_transactions'] >= 50) & (consumption_data['n_transactions'] <= 300), 1, 0
-                )
+                path = 'model'
                 
-                # 소비 균형도
-                spending_cols = ['교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
-                consumption_data['spending_balance_score'] = 1 / (1 + consumption_data[spending_cols].std(axis=1))
+                # 같은 입력이 다시 제출되면 특성 생성/모델 예측 생략
+                with timer.span('cache'):
+                    cache_key = RESULT_CACHE.make_key(consumption_model.cache_version, model_record)
+                    cached = RESULT_CACHE.get(cache_key)
+                cache_status = 'miss' if cached is None else 'hit'
                 
-                # 합리적 소비 패턴 점수
-                consumption_data['rational_spending_score'] = (
-                    (consumption_data['essential_spending_ratio'] >= 0.4) & (consumption_data['essential_spending_ratio'] <= 0.7) &
-                    (consumption_data['discretionary_spending_ratio'] <= 0.3) &
-                    (consumption_data['investment_spending_ratio'] >= 0.05)
-                ).astype(int)
-                
-                # 지출 크기별 더미 변수
-                consumption_data['spending_low'] = (consumption_data['total_spending'] < 200).astype(int)
-                consumption_data['spending_mid'] = ((consumption_data['total_spending'] >= 200) & (consumption_data['total_spending'] < 400)).astype(int)
-                consumption_data['spending_high'] = (consumption_data['total_spending'] >= 400).astype(int)
-                
-                print(f"소비패턴 특성 생성 완료: {consumption_data.shape}")
+                if cached is None:
+                    # 소비패턴 분석용 특성 생성 (feature_pipeline NumPy 경로)
+                    with timer.span('features'):
+                        X = build_feature_matrix(model_record, consumption_model.feature_names)
+                    
+                    # 소비패턴 모델 예측 (0-80점)
+                    with timer.span('model'):
+                        consumption_prediction = consumption_model.predict_consumption_pattern(X)
+                    cached = (float(consumption_prediction['consumption_score'][0]),
+                              int(consumption_prediction['risk_classification'][0]),
+                              tuple(consumption_prediction['risk_probabilities'][0].tolist()))
+                    RESULT_CACHE.put(cache_key, cached)
                 
-                # 소비패턴 모델 예측 (0-80점)
-                consumption_prediction = consumption_model.predict_consumption_pattern(consumption_data)
-                consumption_score = max(0, min(80, float(consumption_prediction['consumption_score'][0])))  # 0-80 클리핑
-                risk_label = int(consumption_prediction['risk_classification'][0])
-                probabilities = consumption_prediction['risk_probabilities'][0].tolist()
+                consumption_score = max(0, min(80, cached[0]))  # 0-80 클리핑
+                risk_label = cached[1]
+                probabilities = list(cached[2])
                 
                 # 재무 정보 계산 (내부는 비율로 처리)
                 income = float(data['income'])
@@ -394,23 +557,22 @@ def predict():
                 savings_rate = (savings / income) if income > 0 else -1.0  # 비율로 계산
                 
                 # 최종 재무점수 계산 (소비패턴 + 소득/지출/저축 비율)
-                final_score = calculate_financial_score_with_scaling(
-                    consumption_score, income, total_spending, savings_rate
-                )
+                with timer.span('financial_score'):
+                    final_score = calculate_financial_score_with_scaling(
+                        consumption_score, income, total_spending, savings_rate
+                    )
                 
                 score = final_score
                 
-                print(f"ML모델 결과 - 소비패턴점수: {consumption_score:.1f}, 최종재무점수: {score:.1f}, 위험도: {risk_label}, 저축률: {savings_rate:.1%}")
-                
-            except Exception as e:
-                print(f"소비패턴 모델 예측 실패: {e}")
-                import traceback
-                traceback.print_exc()
-                print("완전 Rule-based 로직으로 폴백")
-                score, risk_label, probabilities, savings, savings_rate = calculate_fallback_score(data)
+            except Exception:
+                logger.exception("소비패턴 모델 예측 실패 - 완전 Rule-based 로직으로 폴백")
+                path = 'fallback'
+                with timer.span('fallback_score'):
+                    score, risk_label, probabilities, savings, savings_rate = calculate_fallback_score(data)
         else:
-            print("완전 Rule-based 로직 사용")
-            score, risk_label, probabilities, savings, savings_rate = calculate_fallback_score(data)
+            path = 'rule_based'
+            with timer.span('fallback_score'):
+                score, risk_label, probabilities, savings, savings_rate = calculate_fallback_score(data)
         
         # 저축 정보 확인 (모델 사용 시에는 이미 계산됨)
         if 'savings' not in locals():
@@ -419,8 +581,9 @@ def predict():
             savings = income - total_spending
             savings_rate = (savings / income) if income > 0 else -1.0  # 비율로 계산
         
-        persona = get_persona(score, savings_rate, float(data['income']), float(data['total_spending']))
-        risk_info = get_risk_level(risk_label)
+        with timer.span('persona'):
+            persona = get_persona(score, savings_rate, float(data['income']), float(data['total_spending']))
+            risk_info = get_risk_level(risk_label)
         
         result = {
             'score': round(score, 1),
@@ -434,14 +597,70 @@ def predict():
             'total_spending': round(float(data['total_spending']), 1)
         }
         
-        print(f"최종 결과: {result}")
-        return jsonify(result)
+        with timer.span('serialize'):
+            response = jsonify(result)
+        timer.finish()
+        
+        fields = {'path': path, 'score': result['score'], 'risk_label': risk_label, 'persona': persona['name'],
+                  'total_ms': round(timer.stages['total'] * 1000, 3)}
+        if path == 'model':
+            fields['consumption_score'] = round(consumption_score, 1)
+            fields['cache'] = cache_status
+        logger.info("predict", extra={'fields': fields})
+        return with_timing_header(response, timer)
         
     except Exception as e:
-        print(f"예측 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("예측 오류")
         return jsonify({'error': f'예측 중 오류 발생: {str(e)}'}), 400
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    timer = StageTimer('predict_batch')
+    try:
+        with timer.span('parse'):
+            records = parse_batch_payload(request)
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'배치 크기 초과: {len(records)} > {MAX_BATCH_SIZE}'}), 413
+        
+        results = predict_records(records, timer) if records else []
+        with timer.span('serialize'):
+            response = jsonify({'count': len(results), 'results': results})
+        timer.finish()
+        
+        logger.info("predict_batch", extra={'fields': {'count': len(results),
+                                                       'total_ms': round(timer.stages['total'] * 1000, 3)}})
+        return with_timing_header(response, timer)
+        
+    except Exception as e:
+        logger.exception("배치 예측 오류")
+        return jsonify({'error': f'배치 예측 중 오류 발생: {str(e)}'}), 400
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: 워커 프로세스가 요청을 처리하고 있는지"""
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+def readiness_status():
+    """모델 로드 상태 (모델 사용 설정인데 모델이 로드되지 않았으면 ready=False)"""
+    model = consumption_model
+    ready = model is not None or not USE_CONSUMPTION_MODEL
+    body = {'ready': ready, 'pid': os.getpid()}
+    if model is not None:
+        body.update({'model_path': model.model_path, 'model_version': model.model_version,
+                     'model_mtime': model.model_mtime})
+    return body
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: 준비되지 않았으면 503 (로드 밸런서에서 제외)"""
+    body = readiness_status()
+    return jsonify(body), 200 if body['ready'] else 503
+
+@app.route('/metrics')
+def metrics():
+    """단계별 소요 시간 히스토그램 + 결과 캐시 카운터 (Prometheus 스크레이프용)"""
+    return REGISTRY.render_prometheus() + RESULT_CACHE.render_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 if __name__ == '__main__':
+    # 개발용 서버 - 운영은 gunicorn app:app (gunicorn.conf.py)
     app.run(debug=True, port=5000)
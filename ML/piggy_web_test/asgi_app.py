@@ -0,0 +1,117 @@
+"""
+Piggy 재무건전성 예측 비동기(ASGI) 서빙 모드
+
+    cd ML/piggy_web_test && uvicorn asgi_app:app --port 5000
+
+- /predict 요청/응답 형식은 app.py(Flask)와 동일, 모델 로드/예측 로직도 app.py를 그대로 사용
+- 동시에 도착한 요청은 MicroBatcher가 모아 app.predict_records로 한 번에 예측
+- 대기 요청이 상한에 도달하면 503 + Retry-After (입장 제어)
+
+환경 변수:
+    PIGGY_ASYNC_WORKERS   동시에 실행하는 추론 배치 수 (기본 1)
+    PIGGY_BATCH_MAX       배치당 최대 요청 수 (기본 32)
+    PIGGY_BATCH_WAIT_MS   배치 수집 대기 시간 밀리초 (기본 2)
+    PIGGY_MAX_PENDING     대기 + 처리 중 요청 수 상한 (기본 256)
+    PIGGY_RETRY_AFTER     503 응답의 Retry-After 초 (기본 1)
+"""
+import json
+import os
+import app as web
+from micro_batch import MicroBatcher, Saturated
+from stage_timing import StageTimer, REGISTRY
+from structured_logging import get_logger
+
+logger = get_logger('asgi')
+
+RETRY_AFTER = os.environ.get('PIGGY_RETRY_AFTER', '1')
+
+def predict_batch(records):
+    """마이크로 배치 1건 예측 (스레드 풀에서 실행)"""
+    return web.predict_records(records, StageTimer('predict_async_batch'))
+
+batcher = MicroBatcher(
+    predict_batch,
+    max_batch=int(os.environ.get('PIGGY_BATCH_MAX', 32)),
+    max_wait=float(os.environ.get('PIGGY_BATCH_WAIT_MS', 2)) / 1000,
+    max_pending=int(os.environ.get('PIGGY_MAX_PENDING', 256)),
+    workers=int(os.environ.get('PIGGY_ASYNC_WORKERS', 1))
+)
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def respond(send, status, body, content_type='application/json', headers=()):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', content_type.encode()), *headers]})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def predict(scope, receive, send):
+    timer = StageTimer('predict_async')
+    try:
+        with timer.span('parse'):
+            data = json.loads(await read_body(receive))
+            web.to_model_record(data)  # 잘못된 입력이 배치 전체를 실패시키지 않도록 먼저 검증
+
+        with timer.span('batch'):
+            result = await batcher.submit(data)
+
+    except Saturated:
+        logger.warning("추론 대기열 포화 - 요청 거절", extra={'fields': {'pending': batcher.pending}})
+        await respond(send, 503, {'error': '요청이 많아 잠시 후 다시 시도해 주세요'},
+                      headers=[(b'retry-after', RETRY_AFTER.encode())])
+        return
+    except Exception as e:
+        logger.exception("예측 오류")
+        await respond(send, 400, {'error': f'예측 중 오류 발생: {str(e)}'})
+        return
+
+    with timer.span('serialize'):
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+    timer.finish()
+
+    logger.info("predict", extra={'fields': {'path': 'async', 'score': result['score'],
+                                             'risk_label': result['risk_label'],
+                                             'persona': result['persona']['name'],
+                                             'total_ms': round(timer.stages['total'] * 1000, 3)}})
+
+    headers = []
+    if web.TIMING_HEADER or any(name == b'x-timing' for name, _ in scope['headers']):
+        headers.append((b'x-timing', timer.header_value().encode()))
+    await respond(send, 200, body, headers=headers)
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await batcher.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await batcher.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    route = (scope['method'], scope['path'])
+    if route == ('POST', '/predict'):
+        await predict(scope, receive, send)
+    elif route == ('GET', '/healthz'):
+        await respond(send, 200, {'status': 'ok', 'pid': os.getpid()})
+    elif route == ('GET', '/readyz'):
+        body = web.readiness_status()
+        await respond(send, 200 if body['ready'] else 503, body)
+    elif route == ('GET', '/metrics'):
+        text = REGISTRY.render_prometheus() + batcher.render_prometheus()
+        await respond(send, 200, text.encode('utf-8'), content_type='text/plain; version=0.0.4; charset=utf-8')
+    else:
+        await respond(send, 404, {'error': 'Not Found'})
@@ -0,0 +1,79 @@
+"""
+piggy_web_test 운영 서버 설정 (gunicorn이 현재 디렉토리의 이 파일을 자동으로 읽음)
+
+    cd ML/piggy_web_test && gunicorn app:app
+
+- preload_app: 마스터가 app.py를 import할 때 모델을 1회 로드, 워커는 fork로 모델 메모리를 copy-on-write 공유
+- fork 직전 gc.freeze(): 마스터 객체를 GC 추적에서 제외하여 워커의 GC가 공유 페이지를 복사하지 않도록 함
+- 모델(아티팩트 디렉터리 또는 pickle) 변경 감지 시 마스터에서 재로드 후 SIGHUP → 새 모델을 공유하는 워커로 무중단 교체
+- 상태 확인: /healthz (liveness), /readyz (readiness)
+
+환경 변수:
+    PIGGY_BIND             바인드 주소 (기본 0.0.0.0:5000)
+    PIGGY_WORKERS          워커 프로세스 수 (기본 CPU 코어 수 - 추론은 CPU 바운드)
+    PIGGY_THREADS          워커당 스레드 수 (기본 1, 2 이상이면 gthread 워커)
+    PIGGY_RELOAD_INTERVAL  모델 파일 변경 확인 주기 초 (기본 5, 0이면 감시 안 함)
+"""
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+
+bind = os.environ.get('PIGGY_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('PIGGY_WORKERS', os.cpu_count() or 1))
+threads = int(os.environ.get('PIGGY_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = True
+timeout = 30
+graceful_timeout = 30
+
+RELOAD_INTERVAL = float(os.environ.get('PIGGY_RELOAD_INTERVAL', 5))
+
+def _file_signature(path, resolve):
+    """(실제 경로, 수정 시각, 크기) - 파일이 없으면 None
+
+    아티팩트 디렉터리는 저장 시 통째로 교체되므로 디렉터리 수정 시각으로 변경 감지,
+    .pkl만 있던 자리에 디렉터리가 생기면 실제 경로가 바뀌어 재로드
+    """
+    path = resolve(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+def _watch_model(server, piggy_app):
+    """모델 파일 변경 감시 (마스터 프로세스의 데몬 스레드)"""
+    loaded = _file_signature(piggy_app.MODEL_PATH, piggy_app.resolve_model_path)
+    pending = None
+    while True:
+        time.sleep(RELOAD_INTERVAL)
+        current = _file_signature(piggy_app.MODEL_PATH, piggy_app.resolve_model_path)
+        if current is None or current == loaded:
+            pending = None
+            continue
+        # 복사 중인 파일을 읽지 않도록 한 주기 동안 변화가 없을 때만 재로드
+        if current != pending:
+            pending = current
+            continue
+
+        loaded, pending = current, None
+        if piggy_app.reload_consumption_model():
+            gc.unfreeze()  # 이전 모델 객체가 수거될 수 있도록 (다음 fork 전에 다시 freeze)
+            gc.collect()
+            server.log.info("모델 변경 감지 - 워커 교체: %s", piggy_app.MODEL_PATH)
+            os.kill(server.pid, signal.SIGHUP)
+        else:
+            server.log.error("모델 재로드 실패 - 기존 워커 유지: %s", piggy_app.MODEL_PATH)
+
+def when_ready(server):
+    if RELOAD_INTERVAL <= 0:
+        return
+    piggy_app = sys.modules[server.app.app_uri.split(':')[0]]
+    threading.Thread(target=_watch_model, args=(server, piggy_app), name='piggy-model-watch',
+                     daemon=True).start()
+
+def pre_fork(server, worker):
+    gc.freeze()
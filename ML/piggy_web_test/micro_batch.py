@@ -0,0 +1,114 @@
+"""
+asyncio 마이크로 배칭 (비동기 서빙 모드 asgi_app.py용)
+- 짧은 시간 창 안에 도착한 요청을 모아 예측 함수 1회 호출로 처리
+- 예측은 크기가 제한된 스레드 풀에서 실행 (이벤트 루프는 블로킹되지 않음)
+- 대기 중인 요청 수가 상한에 도달하면 Saturated → 호출 측에서 503 + Retry-After 응답
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+class Saturated(Exception):
+    """대기 요청 수 상한 초과 (입장 제어)"""
+
+class MicroBatcher:
+    """
+    요청 단위 submit()을 배치 단위 predict_fn 호출로 묶는 디스패처
+
+    Args:
+        predict_fn (callable): 입력 목록 → 같은 순서의 결과 목록 (스레드 풀에서 실행)
+        max_batch (int): 한 번에 묶는 최대 요청 수
+        max_wait (float): 첫 요청 도착 후 추가 요청을 기다리는 시간 (초)
+        max_pending (int): 대기 + 처리 중 요청 수 상한
+        workers (int): 동시에 실행하는 배치 수 (스레드 풀 크기)
+    """
+
+    def __init__(self, predict_fn, max_batch=32, max_wait=0.002, max_pending=256, workers=1):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.workers = workers
+        self.pending = 0
+        self.requests = 0
+        self.batches = 0
+        self.rejected = 0
+        self._queue = None
+        self._tasks = []
+        self._executor = None
+
+    @property
+    def started(self):
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.started:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='piggy-infer')
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("배처 종료"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def submit(self, item):
+        """입력 1건을 배치에 합류시키고 결과를 기다림 (상한 초과 시 Saturated)"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Saturated()
+        if not self.started:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending += 1
+        self.requests += 1
+        try:
+            self._queue.put_nowait((item, future))
+            return await future
+        finally:
+            self.pending -= 1
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # 배치가 아직 덜 찼으면 짧게 기다려 동시에 도착한 요청을 합류시킴
+            if self.max_wait > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            self.batches += 1
+            try:
+                results = await loop.run_in_executor(self._executor, self.predict_fn, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    def render_prometheus(self, prefix='piggy_microbatch'):
+        """요청/배치/거절 카운터와 현재 대기 수를 Prometheus text exposition format으로 출력"""
+        lines = []
+        for name, value in (('requests', self.requests), ('batches', self.batches), ('rejected', self.rejected)):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        lines.append(f"# TYPE {prefix}_pending gauge")
+        lines.append(f"{prefix}_pending {self.pending}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,130 @@
+"""
+Piggy 웹 앱 구조화 로깅
+- JSON 한 줄 레코드 (필드는 logger.info(msg, extra={'fields': {...}})로 전달)
+- QueueHandler → 백그라운드 QueueListener 스레드가 실제 출력 담당 (요청 스레드는 I/O 대기 없음)
+- 점수 계산 상세 추적은 sample_trace()로 일부 요청만 기록
+- fork된 자식 프로세스(gunicorn 워커)에서는 리스너 스레드를 자동으로 다시 시작
+
+환경 변수:
+    PIGGY_LOG_LEVEL        DEBUG / INFO / WARNING / ERROR (기본 INFO)
+    PIGGY_LOG_FORMAT       json / text (기본 json)
+    PIGGY_LOG_SAMPLE_RATE  상세 추적 기록 비율 0.0-1.0 (기본 0.01)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+LOGGER_NAME = 'piggy'
+
+_listener = None
+_sample_rate = 0.0
+_settings = {}
+
+class JsonFormatter(logging.Formatter):
+    """LogRecord → JSON 한 줄 (extra의 'fields' dict는 최상위 키로 병합)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """로컬 개발용 사람이 읽는 형식 (fields는 key=value로 덧붙임)"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += ' ' + ' '.join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """메시지 포맷팅을 리스너 스레드로 미루는 QueueHandler (예외 정보만 요청 스레드에서 문자열화)"""
+
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup_logging(level=None, fmt=None, sample_rate=None, stream=None):
+    """
+    'piggy' 로거에 큐 기반 핸들러 설정 (여러 번 호출해도 리스너는 하나)
+
+    Args:
+        level (str): 로그 레벨 (None이면 PIGGY_LOG_LEVEL)
+        fmt (str): 'json' 또는 'text' (None이면 PIGGY_LOG_FORMAT)
+        sample_rate (float): 상세 추적 기록 비율 (None이면 PIGGY_LOG_SAMPLE_RATE)
+        stream: 출력 스트림 (기본 stdout)
+
+    Returns:
+        Logger: 'piggy' 로거
+    """
+    global _listener, _sample_rate, _settings
+
+    level = (level or os.environ.get('PIGGY_LOG_LEVEL', 'INFO')).upper()
+    fmt = fmt or os.environ.get('PIGGY_LOG_FORMAT', 'json')
+    _sample_rate = float(os.environ.get('PIGGY_LOG_SAMPLE_RATE', 0.01) if sample_rate is None else sample_rate)
+    _settings = {'level': level, 'fmt': fmt, 'sample_rate': _sample_rate, 'stream': stream}
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    if _listener is not None:
+        _listener.stop()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+    return logger
+
+def shutdown_logging():
+    """큐에 남은 레코드 출력 후 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _restart_after_fork():
+    """fork 시 리스너 스레드는 복제되지 않으므로 자식 프로세스에서 큐/리스너를 새로 구성"""
+    global _listener
+    if _listener is not None:
+        _listener = None
+        setup_logging(**_settings)
+
+def get_logger(name=None):
+    """'piggy' 하위 로거 반환"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+def sample_trace():
+    """이번 요청의 상세 추적을 기록할지 여부 (PIGGY_LOG_SAMPLE_RATE 비율)"""
+    return _sample_rate > 0 and (_sample_rate >= 1 or random.random() < _sample_rate)
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
@@ -25,7 +25,7 @@ def score_row(r):
     
     s_essential = 20 if 0.50 <= essential <= 0.65 else (10 if (0.35 <= essential < 0.50) or (0.65 < essential <= 0.75) else 0)
     s_luxury = 20 if luxury <= 0.25 else (10 if luxury <= 0.40 else 0)
-    s_balance = 10 if all(r[c] >= 0.05 for c in ["식료품음료", "주거", "교통", "오락문화", "교육육아", "보건의료", "기타소비"]) else 0
+    s_balance = 10 if all(r[c] >= 0.05 for c in SPENDING_RATIO_COLS) else 0
     s_trx = 10 if (200 <= r["n_transactions"] <= 600) else 0
     
     penalty = 0
@@ -36,6 +36,26 @@ def score_row(r):
     
     return max(0, min(100, s_scale + s_essential + s_luxury + s_balance + s_trx + penalty))
 
+# 점수 구간(10점 단위)별 페르소나 - get_persona_from_score / add_financial_scores 공용
+PERSONAS = [
+    {"level": 1, "name": "아기달팽이", "emoji": "🐌", "description": "이제 막 출발! 지출 추적부터 차근차근"},
+    {"level": 2, "name": "새싹두더지", "emoji": "🕳️", "description": "보이지 않는 새는 구멍부터 막자(고정비 점검)"},
+    {"level": 3, "name": "콩돌고래", "emoji": "🐬", "description": "파도(변동비)에 흔들림, 작은 저축 습관 만들기"},
+    {"level": 4, "name": "도토리햄스터", "emoji": "🐹", "description": "조금씩 모으는 중, 비상금 1개월 치 도전"},
+    {"level": 5, "name": "체크펭귄", "emoji": "🐧", "description": "카드·구독 '체크'로 낭비 컷! 기본기 다지기"},
+    {"level": 6, "name": "균형수달", "emoji": "🦦", "description": "수입·지출 밸런스 안정, 3개월 비상금 완성 가즈아"},
+    {"level": 7, "name": "플랜여우", "emoji": "🦊", "description": "계획형 소비 + 자동저축, 투자 입문 준비"},
+    {"level": 8, "name": "달토끼", "emoji": "🚀", "description": "공격·수비 조화, 장기 목표(차·전세) 로드맵 구축"},
+    {"level": 9, "name": "부엉이", "emoji": "🦉", "description": "데이터로 소비 점검, 포트폴리오 분산/리밸런싱"},
+    {"level": 10, "name": "고래백만장", "emoji": "🐳", "description": "현금흐름·리스크 완벽 관리, 목표 달성 모드 유지"}
+]
+
+# 구간 경계 (np.digitize 기준: bins[i-1] <= score < bins[i])
+PERSONA_SCORE_BINS = np.array([10, 20, 30, 40, 50, 60, 70, 80, 90])
+PERSONA_LEVEL_BINS = np.array([20, 40, 60, 80])
+
+SPENDING_RATIO_COLS = ["식료품음료", "주거", "교통", "오락문화", "교육육아", "보건의료", "기타소비"]
+
 def get_persona_from_score(score):
     """
     Convert financial health score to persona level
@@ -46,39 +66,26 @@ def get_persona_from_score(score):
     Returns:
         dict: Persona information with level, name, emoji, and description
     """
-    personas = {
-        0: {"level": 1, "name": "아기달팽이", "emoji": "🐌", "description": "이제 막 출발! 지출 추적부터 차근차근"},
-        1: {"level": 2, "name": "새싹두더지", "emoji": "🕳️", "description": "보이지 않는 새는 구멍부터 막자(고정비 점검)"},
-        2: {"level": 3, "name": "콩돌고래", "emoji": "🐬", "description": "파도(변동비)에 흔들림, 작은 저축 습관 만들기"},
-        3: {"level": 4, "name": "도토리햄스터", "emoji": "🐹", "description": "조금씩 모으는 중, 비상금 1개월 치 도전"},
-        4: {"level": 5, "name": "체크펭귄", "emoji": "🐧", "description": "카드·구독 '체크'로 낭비 컷! 기본기 다지기"},
-        5: {"level": 6, "name": "균형수달", "emoji": "🦦", "description": "수입·지출 밸런스 안정, 3개월 비상금 완성 가즈아"},
-        6: {"level": 7, "name": "플랜여우", "emoji": "🦊", "description": "계획형 소비 + 자동저축, 투자 입문 준비"},
-        7: {"level": 8, "name": "달토끼", "emoji": "🚀", "description": "공격·수비 조화, 장기 목표(차·전세) 로드맵 구축"},
-        8: {"level": 9, "name": "부엉이", "emoji": "🦉", "description": "데이터로 소비 점검, 포트폴리오 분산/리밸런싱"},
-        9: {"level": 10, "name": "고래백만장", "emoji": "🐳", "description": "현금흐름·리스크 완벽 관리, 목표 달성 모드 유지"}
-    }
-    
     if score < 10:
-        return personas[0]
+        return PERSONAS[0]
     elif score < 20:
-        return personas[1]
+        return PERSONAS[1]
     elif score < 30:
-        return personas[2]
+        return PERSONAS[2]
     elif score < 40:
-        return personas[3]
+        return PERSONAS[3]
     elif score < 50:
-        return personas[4]
+        return PERSONAS[4]
     elif score < 60:
-        return personas[5]
+        return PERSONAS[5]
     elif score < 70:
-        return personas[6]
+        return PERSONAS[6]
     elif score < 80:
-        return personas[7]
+        return PERSONAS[7]
     elif score < 90:
-        return personas[8]
+        return PERSONAS[8]
     else:
-        return personas[9]
+        return PERSONAS[9]
 
 def get_persona_level_from_score(score):
     """
@@ -101,6 +108,40 @@ def get_persona_level_from_score(score):
     else:
         return 4  # 고급 (부엉이, 고래백만장)
 
+def score_frame(df):
+    """
+    Vectorized version of score_row over a whole dataframe
+    
+    Args:
+        df (DataFrame): Input dataframe with spending data
+        
+    Returns:
+        Series: Financial health scores (0-100), identical to df.apply(score_row, axis=1)
+    """
+    ts = df["total_spending"].to_numpy()
+    n_trx = df["n_transactions"].to_numpy()
+    
+    # score_row과 동일한 덧셈 순서를 유지해야 경계값에서 결과가 같음
+    essential = (df["식료품음료"] + df["주거"] + df["교육육아"] + df["보건의료"]).to_numpy()
+    luxury = (df["오락문화"] + df["기타소비"]).to_numpy()
+    fixed = (df["주거"] + df["교통"]).to_numpy()
+    health = df["보건의료"].to_numpy()
+    
+    s_scale = np.select([ts <= 3000, ts <= 5000], [20, 10], default=0)
+    s_essential = np.select(
+        [(essential >= 0.50) & (essential <= 0.65),
+         ((essential >= 0.35) & (essential < 0.50)) | ((essential > 0.65) & (essential <= 0.75))],
+        [20, 10], default=0
+    )
+    s_luxury = np.select([luxury <= 0.25, luxury <= 0.40], [20, 10], default=0)
+    s_balance = np.where((df[SPENDING_RATIO_COLS].to_numpy() >= 0.05).all(axis=1), 10, 0)
+    s_trx = np.where((n_trx >= 200) & (n_trx <= 600), 10, 0)
+    
+    penalty = np.where(fixed > 0.40, -10, 0) + np.where(health < 0.05, -5, 0)
+    
+    score = np.clip(s_scale + s_essential + s_luxury + s_balance + s_trx + penalty, 0, 100)
+    return pd.Series(score.astype(np.int64), index=df.index)
+
 def add_financial_scores(df):
     """
     Add financial health scores and persona-based labels to dataframe
@@ -113,20 +154,25 @@ def add_financial_scores(df):
     """
     df = df.copy()
     
-    df["재무건전_점수"] = df.apply(score_row, axis=1)
-    df["페르소나_레벨"] = df["재무건전_점수"].apply(get_persona_level_from_score)
+    df["재무건전_점수"] = score_frame(df)
+    scores = df["재무건전_점수"].to_numpy()
+    df["페르소나_레벨"] = np.digitize(scores, PERSONA_LEVEL_BINS)
     
-    # Add detailed persona information
-    persona_info = df["재무건전_점수"].apply(get_persona_from_score)
-    df["페르소나_이름"] = persona_info.apply(lambda x: x["name"])
-    df["페르소나_이모지"] = persona_info.apply(lambda x: x["emoji"])
-    df["페르소나_설명"] = persona_info.apply(lambda x: x["description"])
+    # Add detailed persona information (lookup by score bucket)
+    persona_idx = np.digitize(scores, PERSONA_SCORE_BINS)
+    for col, key in [("페르소나_이름", "name"), ("페르소나_이모지", "emoji"), ("페르소나_설명", "description")]:
+        lookup = np.array([p[key] for p in PERSONAS], dtype=object)
+        df[col] = pd.Series(lookup[persona_idx], index=df.index)
     
     # Keep binary label for compatibility
     df["재무건전_라벨"] = (df["재무건전_점수"] >= 60).astype(int)
     
     return df
 
+# 현실형 점수 임계값 (realistic_score / realistic_label / *_frame 공용)
+DSR_WARN, DSR_RISK = 0.30, 0.40
+DA_WARN, DA_RISK = 0.50, 0.70
+
 def nearest_quintile(y, ref_incomes, ref_quints):
     """
     Find nearest income quintile for given income
@@ -152,8 +198,8 @@ def realistic_score(r):
     Returns:
         float: Realistic financial score
     """
-    DSR_warn, DSR_risk = 0.30, 0.40
-    DA_warn, DA_risk = 0.50, 0.70
+    DSR_warn, DSR_risk = DSR_WARN, DSR_RISK
+    DA_warn, DA_risk = DA_WARN, DA_RISK
     
     dsr = float(r.get("DSR_ref", np.nan))
     da = float(r.get("DebtAsset_ref", np.nan))
@@ -190,12 +236,97 @@ def realistic_label(r):
     Returns:
         int: Financial health label (0=risky, 1=healthy)
     """
-    DSR_risk, DA_risk = 0.40, 0.70
+    DSR_risk, DA_risk = DSR_RISK, DA_RISK
     
     if (r["DSR_ref"] >= DSR_risk) or (r["DebtAsset_ref"] >= DA_risk):
         return 0
     return 1 if r["현실형_점수"] >= 60 else 0
 
+def nearest_quintiles(values, ref_incomes, ref_quints):
+    """
+    Vectorized nearest_quintile using one sort and one searchsorted
+    
+    Args:
+        values (array): Income values
+        ref_incomes (array): Reference income values
+        ref_quints (array): Reference quintile values
+        
+    Returns:
+        ndarray: Nearest quintile per value, identical to nearest_quintile
+            (ties resolve to the first reference row, as np.argmin does)
+    """
+    y = np.asarray(values, dtype=np.float64)
+    ref = np.asarray(ref_incomes, dtype=np.float64)
+    quints = np.asarray(ref_quints).astype(np.int64)
+    
+    # argmin은 NaN을 최솟값으로 취급: 참조값에 NaN이 있으면 첫 NaN 행
+    nan_ref = np.flatnonzero(np.isnan(ref))
+    if len(nan_ref):
+        idx = np.full(len(y), nan_ref[0])
+    else:
+        order = np.argsort(ref, kind="stable")
+        sorted_ref = ref[order]
+        n = len(sorted_ref)
+        
+        # 오른쪽 후보: y 이상인 첫 값 (동일값 구간의 첫 위치 = 원래 순서상 첫 행)
+        pos = np.searchsorted(sorted_ref, y, side="left")
+        right = np.minimum(pos, n - 1)
+        # 왼쪽 후보: y 미만인 마지막 값의 동일값 구간 첫 위치
+        left = np.searchsorted(sorted_ref, sorted_ref[np.maximum(pos - 1, 0)], side="left")
+        
+        d_left = np.abs(sorted_ref[left] - y)
+        d_right = np.abs(sorted_ref[right] - y)
+        take_left = (pos > 0) & ((pos == n) | (d_left < d_right) |
+                                 ((d_left == d_right) & (order[left] < order[right])))
+        idx = np.where(take_left, order[left], order[right])
+        # y가 ±inf이면 모든 거리가 inf → argmin은 첫 행
+        idx[np.isinf(y)] = 0
+    
+    # y가 NaN이면 모든 거리가 NaN → argmin은 첫 행
+    idx[np.isnan(y)] = 0
+    return quints[idx]
+
+def realistic_score_frame(df):
+    """
+    Vectorized version of realistic_score over a whole dataframe
+    
+    Args:
+        df (DataFrame): Data with DSR_ref, DebtAsset_ref and est_quintile columns
+        
+    Returns:
+        Series: Realistic scores, identical to df.apply(realistic_score, axis=1)
+    """
+    nan = pd.Series(np.nan, index=df.index)
+    dsr = df.get("DSR_ref", nan).to_numpy(dtype=np.float64)
+    da = df.get("DebtAsset_ref", nan).to_numpy(dtype=np.float64)
+    quint = df.get("est_quintile", pd.Series(3, index=df.index)).to_numpy()
+    
+    # 비교 전에 유한값 여부를 먼저 걸러야 inf 입력에서 realistic_score와 같음
+    dsr_ok = np.isfinite(dsr)
+    da_ok = np.isfinite(da)
+    s_fin = np.full(len(df), 60.0)
+    s_fin -= np.select([dsr_ok & (dsr >= DSR_RISK), dsr_ok & (dsr >= DSR_WARN)], [30, 15], default=0)
+    s_fin -= np.select([da_ok & (da >= DA_RISK), da_ok & (da >= DA_WARN)], [25, 10], default=0)
+    
+    # 소득분위 보정 (저소득층 완충 / 고소득층 엄격)
+    s_fin += np.select([quint <= 2, quint >= 4], [5, -5], default=0)
+    
+    return pd.Series(np.clip(s_fin, 0, 100), index=df.index)
+
+def realistic_label_frame(df):
+    """
+    Vectorized version of realistic_label over a whole dataframe
+    
+    Args:
+        df (DataFrame): Data with DSR_ref, DebtAsset_ref and 현실형_점수 columns
+        
+    Returns:
+        Series: Labels (0=risky, 1=healthy), identical to df.apply(realistic_label, axis=1)
+    """
+    risky = (df["DSR_ref"] >= DSR_RISK) | (df["DebtAsset_ref"] >= DA_RISK)
+    healthy = ~risky & (df["현실형_점수"] >= 60)
+    return healthy.astype(np.int64)
+
 def add_realistic_scores(df_real, ref_tbl):
     """
     Add realistic scores and labels based on reference table
@@ -209,16 +340,16 @@ def add_realistic_scores(df_real, ref_tbl):
     """
     df_real = df_real.copy()
     
-    # Estimate income quintiles
-    ref_incomes = ref_tbl["처분가능소득_만원"].values
-    ref_quints = ref_tbl["소득분위"].values
-    df_real["est_quintile"] = df_real["est_income_만원"].apply(
-        lambda y: nearest_quintile(y, ref_incomes, ref_quints)
+    # Estimate income quintiles (참조 소득은 한 번만 정렬)
+    df_real["est_quintile"] = nearest_quintiles(
+        df_real["est_income_만원"].to_numpy(dtype=np.float64),
+        ref_tbl["처분가능소득_만원"].values,
+        ref_tbl["소득분위"].values
     )
     
     # Calculate realistic scores
-    df_real["현실형_점수"] = df_real.apply(realistic_score, axis=1)
-    df_real["현실형_라벨"] = df_real.apply(realistic_label, axis=1)
+    df_real["현실형_점수"] = realistic_score_frame(df_real)
+    df_real["현실형_라벨"] = realistic_label_frame(df_real)
     
     return df_real
 
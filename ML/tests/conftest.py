@@ -0,0 +1,95 @@
+import os
+import sys
+
+# ML 모듈은 패키지가 아닌 평면 스크립트이므로 상위 디렉토리를 import 경로에 추가
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+# 서빙과 공유하는 런타임 모듈 (feature_pipeline, model_registry)
+sys.path.insert(0, os.path.join(os.path.dirname(ML_DIR), "priv", "python"))
+# 웹 앱 보조 모듈 (micro_batch 등)
+sys.path.insert(0, os.path.join(ML_DIR, "piggy_web_test"))
+
+# 여러 테스트 모듈이 공유하는 데이터/모델 생성 헬퍼 (from conftest import ...)
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from feature_pipeline import FEATURE_NAMES, SPENDING_COLS
+from scoring import SPENDING_RATIO_COLS
+
+def legacy_counts(forest):
+    """구버전 sklearn처럼 분류 트리 리프에 비율 대신 클래스별 가중 카운트 저장 (배포된 pickle 재현)"""
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        tree.value[...] *= tree.weighted_n_node_samples[:, None, None]
+    return forest
+
+def make_bundle(X, n_estimators=10, seed=1):
+    """특성 행렬 X로 학습한 RandomForest + StandardScaler 모델 번들 (pickle 번들과 같은 키)"""
+    rng = np.random.default_rng(seed)
+    scaler = StandardScaler().fit(X)
+    return {
+        'regressor': RandomForestRegressor(n_estimators=n_estimators, random_state=0).fit(scaler.transform(X), rng.uniform(0, 80, len(X))),
+        'classifier': RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit(scaler.transform(X), rng.integers(0, 4, len(X))),
+        'scaler': scaler,
+        'feature_names': FEATURE_NAMES
+    }
+
+def make_training_frame(n, seed):
+    """정제가 필요 없는 학습 데이터 (점수는 주거 비율/거래 수와 상관)"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.dirichlet(np.ones(len(SPENDING_COLS)), size=n), columns=SPENDING_COLS)
+    df['total_spending'] = rng.uniform(100, 600, n)
+    df['mean_spending'] = rng.uniform(0.5, 5, n)
+    df['n_transactions'] = rng.integers(20, 400, n)
+    df['est_income_만원'] = rng.uniform(200, 600, n)
+    score = 40 + 60 * df['주거'] + 0.05 * df['n_transactions'] + rng.normal(scale=5, size=n)
+    df['재무건전_점수'] = score.clip(0, 100).round()
+    df['재무건전_라벨'] = (df['재무건전_점수'] >= 60).astype(int)
+    return df
+
+def make_dirty_training_frame(n, seed):
+    """음수/NaN/이상치/비율합 이탈 행이 섞인 학습 데이터"""
+    rng = np.random.default_rng(seed)
+    ratios = rng.dirichlet(np.ones(len(SPENDING_COLS)), size=n)
+    ratios *= rng.choice([1.0, 1.0, 1.0, 0.85, 1.15], size=(n, 1))
+    df = pd.DataFrame(ratios, columns=SPENDING_COLS)
+    df["total_spending"] = rng.lognormal(5.5, 0.6, size=n)
+    df["mean_spending"] = rng.lognormal(0.5, 0.5, size=n)
+    df["n_transactions"] = rng.integers(-5, 900, size=n)
+    df["est_income_만원"] = rng.normal(380, 150, size=n)
+    df["재무건전_점수"] = rng.integers(0, 100, size=n).astype(float)
+    df["재무건전_라벨"] = (df["재무건전_점수"] >= 60).astype(float)
+    df["페르소나_이름"] = rng.choice(["균형수달", "체크펭귄", "부엉이"], size=n)
+    df.loc[rng.random(n) < 0.02, "재무건전_라벨"] = np.nan
+    df.loc[rng.random(n) < 0.02, "total_spending"] = np.nan
+    df.loc[rng.random(n) < 0.01, "mean_spending"] = -1.0
+    df.loc[rng.random(n) < 0.02, "교통"] = np.nan
+    df.loc[rng.random(n) < 0.01, "est_income_만원"] = 1e5
+    return df
+
+def make_scoring_frame(n, seed):
+    """경계값(0.05, 0.25, 3000, 200 등)에 자주 걸리도록 반올림한 랜덤 입력"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "total_spending": rng.choice([rng.uniform(0, 6000), 3000, 5000, 5000.5], size=n),
+        "n_transactions": rng.integers(0, 800, size=n),
+    })
+    df.loc[rng.random(n) < 0.1, "n_transactions"] = 200
+    df.loc[rng.random(n) < 0.1, "n_transactions"] = 600
+    for col in SPENDING_RATIO_COLS:
+        df[col] = np.round(rng.uniform(0, 0.45, size=n), 2)
+    df.loc[rng.random(n) < 0.02, "보건의료"] = np.nan
+    df.loc[rng.random(n) < 0.02, "total_spending"] = np.nan
+    return df
+
+def make_feature_frame(n, seed):
+    """특성 공학 입력 (지출 비율 합 1 근처, 구간 경계값 200/400/50/300 포함)"""
+    rng = np.random.default_rng(seed)
+    ratios = rng.dirichlet(np.ones(len(SPENDING_COLS)), size=n)
+    df = pd.DataFrame(np.round(ratios, 2), columns=SPENDING_COLS)
+    df["total_spending"] = rng.choice([rng.uniform(10, 800), 200.0, 400.0], size=n)
+    df["mean_spending"] = rng.uniform(0.1, 5, size=n)
+    df["n_transactions"] = rng.choice([rng.integers(0, 600), 50, 300], size=n)
+    df["est_income_만원"] = rng.uniform(100, 900, size=n)
+    return df
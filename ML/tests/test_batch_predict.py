@@ -0,0 +1,126 @@
+"""
+batch_predict 스트리밍 예측: 일괄 예측과의 동등성, 멀티프로세스 순서 보존, 중단 후 재개
+"""
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+import batch_predict
+from feature_pipeline import FEATURE_NAMES, SPENDING_COLS, engineer_features_frame, frame_to_matrix
+from conftest import legacy_counts, make_bundle
+
+def make_users(n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.dirichlet(np.ones(len(SPENDING_COLS)), size=n), columns=SPENDING_COLS)
+    df.insert(0, 'user_id', np.arange(n))
+    df['total_spending'] = rng.uniform(100, 900, n)
+    df['mean_spending'] = rng.uniform(0.5, 5, n)
+    df['n_transactions'] = rng.integers(10, 500, n)
+    return df
+
+@pytest.fixture
+def model_path(tmp_path):
+    X = frame_to_matrix(engineer_features_frame(make_users(300, seed=0)), FEATURE_NAMES)
+    bundle = make_bundle(X, n_estimators=5)
+    path = tmp_path / "model.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(bundle, f)
+    return str(path)
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / "users.csv"
+    make_users(1000, seed=2).to_csv(path, index=False)
+    return str(path)
+
+def test_streaming_matches_single_batch(model_path, input_csv, tmp_path):
+    output = str(tmp_path / "scored.csv")
+    stats = batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=128)
+
+    with open(model_path, "rb") as f:
+        expected = batch_predict.predict_chunk(pickle.load(f), pd.read_csv(input_csv))
+    result = pd.read_csv(output)
+
+    assert stats['total_rows'] == 1000
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_ndjson_round_trip(model_path, input_csv, tmp_path):
+    ndjson_input = str(tmp_path / "users.ndjson")
+    pd.read_csv(input_csv).to_json(ndjson_input, orient="records", lines=True)
+    csv_output, ndjson_output = str(tmp_path / "a.csv"), str(tmp_path / "b.ndjson")
+
+    batch_predict.predict_file(input_csv, csv_output, model_path=model_path, chunk_size=300)
+    batch_predict.predict_file(ndjson_input, ndjson_output, model_path=model_path, chunk_size=300)
+
+    pd.testing.assert_frame_equal(pd.read_json(ndjson_output, lines=True), pd.read_csv(csv_output),
+                                  check_dtype=False)
+
+def test_workers_preserve_order(model_path, input_csv, tmp_path):
+    single, multi = str(tmp_path / "single.csv"), str(tmp_path / "multi.csv")
+    batch_predict.predict_file(input_csv, single, model_path=model_path, chunk_size=100)
+    batch_predict.predict_file(input_csv, multi, model_path=model_path, chunk_size=100, workers=2)
+
+    with open(single, "rb") as a, open(multi, "rb") as b:
+        assert a.read() == b.read()
+
+def test_resume_after_crash(model_path, input_csv, tmp_path, monkeypatch):
+    reference, output = str(tmp_path / "reference.csv"), str(tmp_path / "scored.csv")
+    batch_predict.predict_file(input_csv, reference, model_path=model_path, chunk_size=100)
+
+    # 4번째 청크에서 중단 + 체크포인트 이후의 불완전한 기록을 흉내
+    calls = {'n': 0}
+    original = batch_predict._score_chunk
+
+    def crashing(chunk, ndjson, header):
+        calls['n'] += 1
+        if calls['n'] == 4:
+            with open(output, "ab") as f:
+                f.write(b"partial,row")
+            raise RuntimeError("crash")
+        return original(chunk, ndjson, header)
+
+    monkeypatch.setattr(batch_predict, "_score_chunk", crashing)
+    with pytest.raises(RuntimeError):
+        batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=100)
+    monkeypatch.setattr(batch_predict, "_score_chunk", original)
+
+    stats = batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=100)
+
+    assert stats['resumed_from'] == 300
+    assert stats['rows'] == 700
+    with open(reference, "rb") as a, open(output, "rb") as b:
+        assert a.read() == b.read()
+
+def test_resume_rejects_different_job(model_path, input_csv, tmp_path, monkeypatch):
+    output = str(tmp_path / "scored.csv")
+    original = batch_predict._score_chunk
+    calls = {'n': 0}
+
+    def crashing(*args):
+        calls['n'] += 1
+        if calls['n'] == 2:
+            raise RuntimeError("crash")
+        return original(*args)
+
+    monkeypatch.setattr(batch_predict, "_score_chunk", crashing)
+    with pytest.raises(RuntimeError):
+        batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=100)
+    monkeypatch.setattr(batch_predict, "_score_chunk", original)
+
+    with pytest.raises(ValueError):
+        batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=200)
+    stats = batch_predict.predict_file(input_csv, output, model_path=model_path, chunk_size=200, resume=False)
+    assert stats['total_rows'] == 1000
+
+def test_probability_columns_sum_to_one():
+    """구버전 카운트 리프 번들도 서빙과 같은 정규화 확률을 출력 (청크 크기와 무관)"""
+    users = make_users(400, seed=5)
+    bundle = make_bundle(frame_to_matrix(engineer_features_frame(make_users(300, seed=0)), FEATURE_NAMES), n_estimators=5)
+    legacy_counts(bundle['classifier'])
+
+    result = batch_predict.predict_chunk(bundle, users)
+    proba_cols = [col for col in result.columns if col.startswith('위험_확률_')]
+    assert len(proba_cols) == 4
+    np.testing.assert_allclose(result[proba_cols].sum(axis=1), 1.0)
+    pd.testing.assert_frame_equal(batch_predict.predict_chunk(bundle, users.iloc[:50]), result.iloc[:50])
+
@@ -0,0 +1,35 @@
+"""
+확률 보정 방식(holdout / oof / cv)별 학습: 단계별 소요 시간 기록, 평탄화 평가기와 보정 확률 일치
+"""
+import numpy as np
+import pytest
+from train_consumption_pattern import ConsumptionPatternModel, CALIBRATION_MODES
+from conftest import make_training_frame
+
+@pytest.mark.parametrize("calibration", CALIBRATION_MODES)
+def test_calibration_modes(calibration):
+    model = ConsumptionPatternModel(tune_hyperparams=False, calibration=calibration)
+    model.train(make_training_frame(800, seed=0), validated=True)
+
+    stages = model.training_metadata['stage_seconds']
+    assert {'features', 'fit_regressor', 'fit_classifier', 'evaluate', 'total'} <= set(stages)
+    assert ('calibration' in stages) == (calibration != 'oof')
+    assert model.training_metadata['calibration'] == calibration
+
+    n_models = len(model.calibrated_classifier.calibrated_classifiers_)
+    assert n_models == (3 if calibration == 'cv' else 1)
+    if calibration == 'oof':
+        # 보정기 안의 전체 학습 모델을 그대로 재사용 (추가 학습 없음)
+        assert model.classifier is model.calibrated_classifier.calibrated_classifiers_[0].estimator
+
+    X = model.engineer_consumption_features(make_training_frame(200, seed=1))[model.feature_names]
+    compiled = model.compile_trees()
+    np.testing.assert_allclose(compiled.classifier.predict_proba(X.to_numpy()),
+                               model.calibrated_classifier.predict_proba(X), rtol=1e-9, atol=1e-12)
+
+def test_unknown_calibration_mode():
+    with pytest.raises(ValueError):
+        ConsumptionPatternModel(calibration='sigmoid')
+
+def test_default_calibration_is_cv():
+    assert ConsumptionPatternModel().calibration == 'cv'
@@ -0,0 +1,18 @@
+"""
+KOSIS 수집: 캐시 저장 실패가 정제 결과를 버리지 않는지 테스트
+"""
+import logging
+import data_load
+
+def test_cache_write_failure_keeps_table(tmp_path, monkeypatch, caplog):
+    path = tmp_path / "가구_연령별_소비.csv"
+    path.write_text("항목,2023\n식료품,12.5%\n주거,30.1%\n", encoding="utf-8")
+
+    def fail(cache_dir, key, df):
+        raise OSError("disk full")
+    monkeypatch.setattr(data_load, "_write_cache", fail)
+
+    with caplog.at_level(logging.WARNING, logger="piggy.data_load"):
+        out, enc, error = data_load._ingest_kosis_file(str(path), "key", str(tmp_path / "cache"))
+    assert error is None and out is not None and len(out) > 0
+    assert "disk full" in caplog.records[0].fields['error']
@@ -0,0 +1,53 @@
+"""
+validate_data_quality 마스크 기반 경로 / 2-pass 청크 경로와 기존 구현의 동등성 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import dataset_store
+from dataset_store import save_dataset, load_dataset, apply_schema
+from feature_pipeline import SPENDING_COLS
+from train_consumption_pattern import ConsumptionPatternModel
+from conftest import make_dirty_training_frame
+
+def reference_validate_data_quality(df):
+    """마스크 도입 이전 구현 (단계별 필터링)"""
+    df_clean = df.copy()
+    df_clean = df_clean.dropna(subset=['재무건전_점수', '재무건전_라벨'])
+    for col in ['total_spending', 'mean_spending', 'n_transactions', 'est_income_만원']:
+        df_clean = df_clean[df_clean[col] > 0]
+        Q1 = df_clean[col].quantile(0.25)
+        Q3 = df_clean[col].quantile(0.75)
+        IQR = Q3 - Q1
+        df_clean = df_clean[(df_clean[col] >= Q1 - 1.5 * IQR) & (df_clean[col] <= Q3 + 1.5 * IQR)]
+    df_clean['ratio_sum'] = df_clean[SPENDING_COLS].sum(axis=1)
+    df_clean = df_clean[(df_clean['ratio_sum'] >= 0.9) & (df_clean['ratio_sum'] <= 1.1)]
+    df_clean = df_clean.drop('ratio_sum', axis=1)
+    for col in SPENDING_COLS:
+        df_clean[col] = df_clean[col].fillna(0)
+    df_clean['n_transactions'] = df_clean['n_transactions'].fillna(0)
+    return df_clean
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_validate_data_quality_matches_reference(seed):
+    df = make_dirty_training_frame(5000, seed)
+    pd.testing.assert_frame_equal(ConsumptionPatternModel().validate_data_quality(df),
+                                  reference_validate_data_quality(df))
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_chunked_matches_in_memory(tmp_path, monkeypatch, parquet):
+    if parquet:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(dataset_store, "has_parquet", lambda: parquet)
+
+    df = apply_schema(make_dirty_training_frame(5000, 3))
+    source = save_dataset(df, str(tmp_path / "source"))
+
+    in_memory = ConsumptionPatternModel()
+    expected = in_memory.validate_data_quality(df).reset_index(drop=True)
+
+    chunked = ConsumptionPatternModel()
+    out_path = chunked.validate_data_quality_chunked(source, str(tmp_path / "cleaned"), chunk_size=777)
+
+    pd.testing.assert_frame_equal(load_dataset(out_path), apply_schema(expected))
+    assert chunked.data_quality_report == in_memory.data_quality_report
@@ -0,0 +1,89 @@
+"""
+dataset_store 저장/로드 왕복 테스트 (Parquet / .npy 열 디렉토리 / CSV 대체 경로)
+"""
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+import dataset_store
+from dataset_store import save_dataset, load_dataset, apply_schema, CATEGORICAL_COLS
+from scoring import add_financial_scores
+from conftest import make_scoring_frame
+
+@pytest.fixture
+def scored_frame():
+    df = add_financial_scores(make_scoring_frame(2000, seed=7))
+    df["est_income_만원"] = np.random.default_rng(7).uniform(100, 800, len(df))
+    return df
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_round_trip_with_projection(tmp_path, monkeypatch, scored_frame, parquet):
+    if parquet:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(dataset_store, "has_parquet", lambda: parquet)
+
+    path = save_dataset(scored_frame, str(tmp_path / "synth"))
+    expected = apply_schema(scored_frame)
+
+    loaded = load_dataset(str(tmp_path / "synth"))
+    pd.testing.assert_frame_equal(loaded, expected)
+    for col in CATEGORICAL_COLS:
+        assert isinstance(loaded[col].dtype, pd.CategoricalDtype)
+
+    columns = ["total_spending", "n_transactions", "재무건전_라벨"]
+    projected = load_dataset(path, columns=columns)
+    pd.testing.assert_frame_equal(projected, expected[columns])
+
+def test_csv_fallback_and_missing(tmp_path, scored_frame):
+    csv_path = tmp_path / "synth.csv"
+    scored_frame.to_csv(csv_path, index=False)
+
+    loaded = load_dataset(str(tmp_path / "synth"), columns=["total_spending", "재무건전_점수"])
+    assert loaded["재무건전_점수"].dtype == np.int64
+    np.testing.assert_allclose(loaded["total_spending"], scored_frame["total_spending"])
+
+    with pytest.raises(FileNotFoundError):
+        load_dataset(str(tmp_path / "missing"))
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_writer_skips_empty_leading_chunks(tmp_path, monkeypatch, scored_frame, parquet):
+    if parquet:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(dataset_store, "has_parquet", lambda: parquet)
+
+    # 빈 첫 청크의 object 열(페르소나_이름 등)로 스키마가 고정되면 다음 청크 기록이 실패했음
+    with dataset_store.DatasetWriter(str(tmp_path / "chunked")) as writer:
+        writer.write(scored_frame.iloc[:0])
+        writer.write(scored_frame.iloc[:500])
+        writer.write(scored_frame.iloc[500:500])
+        writer.write(scored_frame.iloc[500:])
+    assert writer.n_rows == len(scored_frame)
+    # 청크 기록의 범주 순서는 등장 순서 (값만 비교)
+    pd.testing.assert_frame_equal(load_dataset(writer.path), apply_schema(scored_frame), check_categorical=False)
+
+    with dataset_store.DatasetWriter(str(tmp_path / "empty")) as writer:
+        writer.write(scored_frame.iloc[:0])
+    loaded = load_dataset(writer.path)
+    assert len(loaded) == 0 and list(loaded.columns) == list(scored_frame.columns)
+
+def test_npy_chunks_do_not_materialize_full_frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_store, "has_parquet", lambda: False)
+    rng = np.random.default_rng(8)
+    n = 200_000
+    df = pd.DataFrame({col: rng.normal(size=n) for col in ["total_spending", "mean_spending", "교통", "주거"]})
+    df["페르소나_이름"] = pd.Categorical(rng.choice(["a", "b", "c"], n))
+    path = save_dataset(df, str(tmp_path / "large"))
+    full_bytes = df.memory_usage(deep=True).sum()
+
+    tracemalloc.start()
+    try:
+        chunks = [len(chunk) for chunk in dataset_store.iter_dataset_chunks(path, chunk_size=10_000)]
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sum(chunks) == n and max(chunks) == 10_000
+    assert peak < full_bytes / 4
+
+    streamed = pd.concat(dataset_store.iter_dataset_chunks(path, chunk_size=30_000))
+    pd.testing.assert_frame_equal(streamed, load_dataset(path))
+
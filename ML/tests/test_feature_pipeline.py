@@ -0,0 +1,56 @@
+"""
+feature_pipeline 학습/서빙 특성 동등성 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from feature_pipeline import (BASE_FEATURES, SPENDING_COLS, FEATURE_NAMES,
+                              build_feature_matrix, engineer_features_frame, frame_to_matrix)
+from train_consumption_pattern import ConsumptionPatternModel
+from conftest import make_feature_frame
+
+def legacy_engineer_features(df):
+    """feature_pipeline 도입 이전 pandas 구현"""
+    df_eng = df.copy()
+    df_eng['essential_spending_ratio'] = df_eng['주거'] + df_eng['식료품음료'] + df_eng['보건의료']
+    df_eng['discretionary_spending_ratio'] = df_eng['오락문화'] + df_eng['기타소비']
+    df_eng['investment_spending_ratio'] = df_eng['교육육아']
+    df_eng['transport_spending_ratio'] = df_eng['교통']
+    df_eng['avg_transaction_size'] = df_eng['total_spending'] / (df_eng['n_transactions'] + 1)
+    df_eng['transaction_frequency_score'] = np.where(
+        (df_eng['n_transactions'] >= 50) & (df_eng['n_transactions'] <= 300), 1, 0
+    )
+    df_eng['spending_balance_score'] = 1 / (1 + df_eng[SPENDING_COLS].std(axis=1))
+    df_eng['rational_spending_score'] = (
+        (df_eng['essential_spending_ratio'] >= 0.4) & (df_eng['essential_spending_ratio'] <= 0.7) &
+        (df_eng['discretionary_spending_ratio'] <= 0.3) &
+        (df_eng['investment_spending_ratio'] >= 0.05)
+    ).astype(int)
+    df_eng['spending_low'] = (df_eng['total_spending'] < 200).astype(int)
+    df_eng['spending_mid'] = ((df_eng['total_spending'] >= 200) & (df_eng['total_spending'] < 400)).astype(int)
+    df_eng['spending_high'] = (df_eng['total_spending'] >= 400).astype(int)
+    return df_eng
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_training_and_serving_features_match_bit_for_bit(seed):
+    df = make_feature_frame(2000, seed)
+    training = frame_to_matrix(ConsumptionPatternModel().engineer_consumption_features(df))
+    serving_batch = build_feature_matrix(df.to_dict('records'))
+    np.testing.assert_array_equal(training, serving_batch)
+    
+    for i in range(0, len(df), 97):
+        serving_row = build_feature_matrix(df.iloc[i].to_dict())
+        np.testing.assert_array_equal(serving_row[0], training[i])
+
+def test_matches_legacy_pandas_features():
+    df = make_feature_frame(2000, 7)
+    expected = legacy_engineer_features(df)[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(frame_to_matrix(engineer_features_frame(df)), expected)
+
+def test_feature_names_order_from_model():
+    df = make_feature_frame(10, 3)
+    names = list(reversed(FEATURE_NAMES))
+    np.testing.assert_array_equal(build_feature_matrix(df.to_dict('records'), names),
+                                  frame_to_matrix(engineer_features_frame(df), names))
+    with pytest.raises(ValueError):
+        build_feature_matrix(df.to_dict('records'), BASE_FEATURES + ['est_income_만원'])
@@ -0,0 +1,75 @@
+"""
+Successive Halving 탐색: 단계별 예산/후보 수, 공유 바이너리 Dataset과 직접 binning 결과 동일성,
+멀티프로세스 결과 일치, ConsumptionPatternModel 메타데이터 저장
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import lightgbm as lgb
+import hyperparameter_search as hpo
+from train_consumption_pattern import ConsumptionPatternModel
+from conftest import make_training_frame
+
+def make_xy(n, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    y = X[:, 0] * 3 + np.sin(X[:, 1] * 2) + rng.normal(scale=0.3, size=n)
+    return X, y
+
+def test_rungs_follow_budget_schedule():
+    X, y = make_xy(600, seed=0)
+    search = hpo.successive_halving(X[:450], y[:450], X[450:], y[450:], n_candidates=9, eta=3,
+                                    min_rounds=10, max_rounds=90, early_stopping_rounds=10)
+
+    rungs = pd.DataFrame(search['trials']).groupby('rung').agg(n=('trial', 'size'), budget=('budget', 'first'))
+    assert rungs['n'].tolist() == [9, 3, 1]
+    assert rungs['budget'].tolist() == [10, 30, 90]
+    assert search['n_trials'] == 13
+
+    final = [t for t in search['trials'] if t['rung'] == 2][0]
+    assert search['best_params'] == final['params']
+    assert search['best_score'] == final['score']
+    # 승급한 후보는 이전 단계에서 상위 1/eta에 든 후보
+    rung1 = sorted((t for t in search['trials'] if t['rung'] == 1), key=lambda t: t['score'])
+    assert final['trial'] == rung1[0]['trial']
+
+def test_shared_binary_dataset_matches_fresh_binning(tmp_path):
+    X, y = make_xy(500, seed=1)
+    params = dict(hpo.FIXED_PARAMS, **hpo.task_params('regression'), **hpo.sample_candidates(1)[0])
+
+    paths = hpo.build_binary_datasets(X[:400], y[:400], X[400:], y[400:], str(tmp_path))
+    hpo._init_worker(*paths, num_threads=1)
+    shared = hpo.run_trial(0, 0, params, 60, 10)
+    hpo._datasets.clear()
+
+    train = lgb.Dataset(X[:400], label=y[:400], params=hpo.DATASET_PARAMS)
+    valid = lgb.Dataset(X[400:], label=y[400:], reference=train, params=hpo.DATASET_PARAMS)
+    booster = lgb.train(dict(params, num_threads=1), train, num_boost_round=60, valid_sets=[valid],
+                        valid_names=['valid'], callbacks=[lgb.early_stopping(10, verbose=False)])
+
+    assert shared['best_iteration'] == booster.best_iteration
+    assert shared['score'] == pytest.approx(booster.best_score['valid']['l2'], rel=1e-12)
+
+def test_workers_match_single_process():
+    X, y = make_xy(400, seed=2)
+    labels = (y > np.median(y)).astype(int)
+    options = dict(task='classification', n_candidates=4, eta=2, min_rounds=10, max_rounds=40,
+                   early_stopping_rounds=10, balanced=True)
+
+    single = hpo.successive_halving(X[:300], labels[:300], X[300:], labels[300:], workers=1, **options)
+    multi = hpo.successive_halving(X[:300], labels[:300], X[300:], labels[300:], workers=2, **options)
+
+    assert multi['best_params'] == single['best_params']
+    assert multi['best_iteration'] == single['best_iteration']
+    assert multi['best_score'] == pytest.approx(single['best_score'], rel=1e-6)
+
+def test_model_persists_best_params():
+    model = ConsumptionPatternModel(tune_hyperparams=True, calibrate_probs=False, tune_candidates=3)
+    results = model.train(make_training_frame(600, seed=3), validated=True)
+
+    summary = model.training_metadata['hyperparameter_search']
+    assert set(summary) == {'regression', 'classification'}
+    assert 'trials' not in summary['regression']
+    assert model.regressor.get_params()['n_estimators'] == summary['regression']['best_iteration']
+    assert model.classifier.get_params()['num_leaves'] == summary['classification']['best_params']['num_leaves']
+    assert len(results['hyperparameter_search']['classification']['trials']) == 3 + 1
@@ -0,0 +1,92 @@
+"""
+증분 재계산 결과가 전체 재계산(add_financial_scores)과 같은지, 변경 행만 다시 계산하는지 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from incremental_scoring import incremental_score
+from scoring import add_financial_scores
+from conftest import make_scoring_frame
+
+def make_population(n, seed):
+    df = make_scoring_frame(n, seed=seed)
+    df["mean_spending"] = np.random.default_rng(seed).uniform(0.5, 5, n)
+    df.insert(0, "user_id", np.arange(n) + 1000)
+    return df
+
+def churn(df, seed):
+    """3% 행 수정, 신규 50명 추가, 20명 삭제"""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    touched = rng.choice(len(df), size=len(df) * 3 // 100, replace=False)
+    df.loc[df.index[touched], "total_spending"] *= rng.uniform(0.5, 1.5, len(touched))
+    new_users = make_population(50, seed + 1)
+    new_users["user_id"] += 10_000_000
+    df = pd.concat([df.drop(df.index[-20:]), new_users], ignore_index=True)
+    return df, len(touched)
+
+def test_incremental_matches_full_rescore(tmp_path):
+    store = str(tmp_path / "store")
+    day1 = make_population(3000, seed=11)
+    result1, stats1 = incremental_score(day1, store)
+    pd.testing.assert_frame_equal(result1, add_financial_scores(day1))
+    assert stats1["changed"] == stats1["new"] == 3000
+
+    day2, n_touched = churn(day1, seed=12)
+    result2, stats2 = incremental_score(day2, store)
+    pd.testing.assert_frame_equal(result2, add_financial_scores(day2))
+    assert stats2["new"] == 50 and stats2["removed"] == 20
+    assert stats2["changed"] <= n_touched + 50
+
+    _, stats3 = incremental_score(day2, store)
+    assert stats3["changed"] == 0
+
+def test_predict_fn_sees_only_changed_rows(tmp_path):
+    seen = []
+
+    def predict_fn(df):
+        seen.append(len(df))
+        return pd.DataFrame({"모델_점수": df["total_spending"] * 0.01}, index=df.index)
+    predict_fn.version = "stub"
+
+    store = str(tmp_path / "store")
+    day1 = make_population(1000, seed=21)
+    incremental_score(day1, store, predict_fn=predict_fn)
+    day2, _ = churn(day1, seed=22)
+    result, stats = incremental_score(day2, store, predict_fn=predict_fn)
+
+    assert seen == [1000, stats["changed"]]
+    np.testing.assert_allclose(result["모델_점수"], day2["total_spending"] * 0.01)
+
+    # 변경 없는 재실행: 모델 호출 없이 저장된 모델 출력 재사용
+    rerun, rerun_stats = incremental_score(day2, store, predict_fn=predict_fn)
+    assert rerun_stats["changed"] == 0 and len(seen) == 2
+    pd.testing.assert_frame_equal(rerun, result)
+
+def test_timestamp_change_detection(tmp_path):
+    store = str(tmp_path / "store")
+    day1 = make_population(500, seed=31)
+    day1["updated_at"] = np.int64(1)
+    incremental_score(day1, store, updated_col="updated_at")
+
+    day2 = day1.copy()
+    day2.loc[:9, "updated_at"] = 2
+    result, stats = incremental_score(day2, store, updated_col="updated_at")
+    assert stats["changed"] == 10
+    pd.testing.assert_frame_equal(result, add_financial_scores(day2))
+
+def test_duplicate_ids_rejected(tmp_path):
+    df = make_population(10, seed=41)
+    df.loc[1, "user_id"] = df.loc[0, "user_id"]
+    with pytest.raises(ValueError):
+        incremental_score(df, str(tmp_path / "store"))
+
+def test_empty_first_run_with_predict_fn(tmp_path):
+    def predict_fn(df):
+        return pd.DataFrame({"모델_점수": df["total_spending"] * 0.01}, index=df.index)
+    predict_fn.version = "stub"
+
+    result, stats = incremental_score(make_population(0, seed=31), str(tmp_path / "store"), predict_fn=predict_fn)
+    assert len(result) == 0 and stats["changed"] == 0
+    assert "모델_점수" in result.columns
+
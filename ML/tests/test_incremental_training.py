@@ -0,0 +1,89 @@
+"""
+점진 학습: 행 id 해시 분할(청크 크기와 무관, 클래스별 비율 유지), 청크별 이어서 부스팅,
+평탄화 평가기/번들 호환, 일괄 학습과 비슷한 성능
+"""
+import numpy as np
+import pytest
+import dataset_store
+from dataset_store import DatasetWriter, save_dataset
+from train_consumption_pattern import ConsumptionPatternModel, row_hash, SPLIT_SALT
+from conftest import make_training_frame
+
+def write_dataset(df, path, chunk_size=1000):
+    with DatasetWriter(str(path)) as writer:
+        for start in range(0, len(df), chunk_size):
+            writer.write(df.iloc[start:start + chunk_size])
+    return writer.path
+
+def test_row_hash_split_is_stable_and_balanced():
+    ids = np.arange(200_000)
+    u = row_hash(ids, SPLIT_SALT)
+
+    assert ((u >= 0) & (u < 1)).all()
+    np.testing.assert_array_equal(np.concatenate([row_hash(part, SPLIT_SALT) for part in np.array_split(ids, 7)]), u)
+    assert not np.array_equal(row_hash(ids, 1), u)
+
+    labels = (np.random.default_rng(0).random(len(ids)) < 0.3).astype(int)
+    for label in (0, 1):
+        assert (u[labels == label] < 0.2).mean() == pytest.approx(0.2, abs=0.01)
+
+def test_incremental_training(tmp_path):
+    df = make_training_frame(4000, seed=0)
+    path = write_dataset(df, tmp_path / "train")
+
+    model = ConsumptionPatternModel(tune_hyperparams=False, calibration='holdout')
+    results = model.train_incremental(path, chunk_size=700, bin_sample_size=1500)
+
+    meta = model.training_metadata
+    incremental = meta['incremental']
+    assert incremental['n_chunks'] == 6
+    assert incremental['bin_sample_size'] == 1500
+    assert meta['train_size'] + meta['test_size'] + incremental['calibration_size'] == len(df)
+    assert meta['test_size'] == int((row_hash(np.arange(len(df)), SPLIT_SALT) < 0.2).sum())
+    assert {'scan', 'binning', 'fit_regressor', 'fit_classifier', 'calibration', 'evaluate'} <= set(meta['stage_seconds'])
+    rounds = incremental['rounds_per_chunk']
+    assert model.regressor.booster_.num_trees() == rounds['regression'] * 6
+    assert model.classifier.booster_.num_trees() == rounds['classification'] * 6
+
+    assert model.scaler.n_samples_seen_ == meta['train_size']
+
+    batch = ConsumptionPatternModel(tune_hyperparams=False, calibration='holdout')
+    batch_results = batch.train(df, validated=True)
+    assert results['regression']['r2'] > batch_results['regression']['r2'] - 0.05
+    assert results['calibrated_classification']['log_loss'] < batch_results['calibrated_classification']['log_loss'] + 0.05
+
+    X = model.engineer_consumption_features(make_training_frame(200, seed=1))[model.feature_names]
+    compiled = model.compile_trees()
+    np.testing.assert_allclose(compiled.regressor.output(X.to_numpy())[:, 0], model.regressor.predict(X), rtol=1e-9)
+    np.testing.assert_allclose(compiled.classifier.predict_proba(X.to_numpy()),
+                               model.calibrated_classifier.predict_proba(X), rtol=1e-9, atol=1e-12)
+
+def test_incremental_rejects_refitting_calibration(tmp_path):
+    path = write_dataset(make_training_frame(100, seed=2), tmp_path / "small")
+    with pytest.raises(ValueError):
+        ConsumptionPatternModel(calibration='cv').train_incremental(path)
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_incremental_pipeline_stays_chunked(tmp_path, monkeypatch, parquet):
+    """pyarrow가 없어도(.npy 열 디렉터리) 정제 → 점진 학습이 청크 단위로만 읽음 (--incremental 경로)"""
+    if parquet:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(dataset_store, "has_parquet", lambda: parquet)
+    read_sizes = []
+    npy_frame = dataset_store._npy_frame
+    def spy(arrays, start=0, stop=None):
+        frame = npy_frame(arrays, start, stop)
+        read_sizes.append(len(frame))
+        return frame
+    monkeypatch.setattr(dataset_store, "_npy_frame", spy)
+
+    source = save_dataset(make_training_frame(3000, seed=3), str(tmp_path / "raw"))
+    model = ConsumptionPatternModel(tune_hyperparams=False, calibration='holdout')
+    cleaned = model.validate_data_quality_chunked(source, str(tmp_path / "cleaned"), chunk_size=700)
+    model.train_incremental(cleaned, chunk_size=700, bin_sample_size=1500)
+
+    assert cleaned.endswith(dataset_store.PARQUET_EXT if parquet else dataset_store.NPY_DIR_EXT)
+    assert model.training_metadata['incremental']['n_chunks'] == -(-model.training_metadata['n_samples'] // 700)
+    if not parquet:
+        assert read_sizes and max(read_sizes) <= 700
+
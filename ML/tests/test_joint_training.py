@@ -0,0 +1,48 @@
+"""
+회귀/분류기 공동 학습(공유 Dataset + 스레드 동시 학습): 개별 학습과 예측 일치, 모델별 학습 시간 기록,
+평탄화 평가기/번들 저장 호환
+"""
+import pickle
+import numpy as np
+import pytest
+from booster_models import BoosterRegressor, BoosterClassifier
+from train_consumption_pattern import ConsumptionPatternModel
+from conftest import make_training_frame
+
+def test_joint_matches_separate_training():
+    df = make_training_frame(1000, seed=0)
+    separate = ConsumptionPatternModel(tune_hyperparams=False, calibrate_probs=False)
+    separate.train(df, validated=True)
+    joint = ConsumptionPatternModel(tune_hyperparams=False, calibrate_probs=False, joint_training=True)
+    joint.train(df, validated=True)
+
+    assert isinstance(joint.regressor, BoosterRegressor)
+    assert isinstance(joint.classifier, BoosterClassifier)
+    X = joint.engineer_consumption_features(make_training_frame(300, seed=1))[joint.feature_names]
+    np.testing.assert_allclose(joint.regressor.predict(X), separate.regressor.predict(X), rtol=1e-12)
+    np.testing.assert_allclose(joint.classifier.predict_proba(X), separate.classifier.predict_proba(X), rtol=1e-12)
+    np.testing.assert_array_equal(joint.classifier.feature_importances_, separate.classifier.feature_importances_)
+
+def test_joint_holdout_records_per_model_timing(tmp_path):
+    model = ConsumptionPatternModel(tune_hyperparams=False, calibration='holdout', joint_training=True)
+    model.train(make_training_frame(800, seed=2), validated=True)
+
+    stages = model.training_metadata['stage_seconds']
+    assert {'binning', 'fit_joint', 'fit_regressor', 'fit_classifier', 'calibration'} <= set(stages)
+    assert model.training_metadata['joint_training']
+
+    X = model.engineer_consumption_features(make_training_frame(200, seed=3))[model.feature_names]
+    compiled = model.compile_trees()
+    np.testing.assert_allclose(compiled.regressor.output(X.to_numpy())[:, 0], model.regressor.predict(X), rtol=1e-9)
+    np.testing.assert_allclose(compiled.classifier.predict_proba(X.to_numpy()),
+                               model.calibrated_classifier.predict_proba(X), rtol=1e-9, atol=1e-12)
+
+    path = tmp_path / "joint.pkl"
+    model.save_model(str(path))
+    with open(path, 'rb') as f:
+        bundle = pickle.load(f)
+    np.testing.assert_allclose(bundle['regressor'].predict(X), model.regressor.predict(X))
+
+def test_joint_rejects_refitting_calibration():
+    with pytest.raises(ValueError):
+        ConsumptionPatternModel(joint_training=True, calibration='oof')
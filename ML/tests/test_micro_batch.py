@@ -0,0 +1,51 @@
+"""
+MicroBatcher 배치 묶음/결과 순서/입장 제어 테스트
+"""
+import asyncio
+import threading
+import pytest
+from micro_batch import MicroBatcher, Saturated
+
+def test_concurrent_requests_share_batches():
+    batch_sizes = []
+
+    def predict_fn(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(predict_fn, max_batch=8, max_wait=0.01)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(scenario()) == [i * 2 for i in range(20)]
+    assert sum(batch_sizes) == 20
+    assert max(batch_sizes) == 8 and len(batch_sizes) == 3
+
+def test_rejects_when_saturated_and_propagates_errors():
+    release = threading.Event()
+
+    def predict_fn(items):
+        release.wait(5)
+        if "bad" in items:
+            raise ValueError("bad input")
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(predict_fn, max_batch=4, max_wait=0, max_pending=2)
+        first = asyncio.ensure_future(batcher.submit("a"))
+        second = asyncio.ensure_future(batcher.submit("bad"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(Saturated):
+            await batcher.submit("c")
+        release.set()
+        outcomes = await asyncio.gather(first, second, return_exceptions=True)
+        await batcher.stop()
+        return outcomes, batcher.rejected
+
+    outcomes, rejected = asyncio.run(scenario())
+    assert rejected == 1
+    # 같은 배치에 묶인 요청은 모두 같은 예외를 받음
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
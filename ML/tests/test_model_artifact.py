@@ -0,0 +1,150 @@
+"""
+모델 아티팩트: pickle 번들과 같은 예측, mmap 로드, 스키마 검사, 레지스트리/학습 스크립트 연동
+"""
+import json
+import pickle
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+import model_registry
+from feature_pipeline import FEATURE_NAMES
+from model_artifact import (ArtifactSchemaError, MANIFEST_NAME, FORMAT_VERSION,
+                            is_artifact, load_artifact, load_bundle, resolve_model_path, save_artifact)
+from result_cache import ResultCache
+from train_consumption_pattern import ConsumptionPatternModel
+from tree_ensemble import compile_model
+from conftest import make_bundle, make_training_frame
+
+def rf_bundle(seed=0):
+    bundle = make_bundle(np.random.default_rng(seed).normal(size=(300, len(FEATURE_NAMES))), n_estimators=8, seed=seed)
+    bundle['training_metadata'] = {'class_distribution': {np.int64(0): np.int64(3)}, 'rmse': np.float64(1.5)}
+    return bundle
+
+def predict(bundle, X):
+    X_scaled = bundle['scaler'].transform(X)
+    return bundle['regressor'].predict(X_scaled), bundle['classifier'].predict_proba(X_scaled)
+
+@pytest.fixture(scope="module")
+def lgbm_model():
+    model = ConsumptionPatternModel(tune_hyperparams=False)
+    model.train(make_training_frame(1500, seed=0), validated=True)
+    return model
+
+def test_lightgbm_artifact_round_trip(lgbm_model, tmp_path):
+    path = str(tmp_path / "Fin_model_v2")
+    lgbm_model.save_model(path)
+    assert is_artifact(path)
+
+    X = lgbm_model.engineer_consumption_features(make_training_frame(300, seed=1))[lgbm_model.feature_names].to_numpy()
+    reg = lgbm_model.regressor.predict(X)
+    proba = lgbm_model.calibrated_classifier.predict_proba(X)
+
+    bundle = load_artifact(path)
+    assert bundle['model_version'] == 'consumption_pattern_v1.0'
+    assert bundle['feature_names'] == lgbm_model.feature_names
+    assert bundle['training_metadata']['n_samples'] == lgbm_model.training_metadata['n_samples']
+    # 학습 시 스케일러는 fit만 하고 모델은 원본 X로 학습 (서빙과 같은 경로로 비교)
+    X_scaled = lgbm_model.scaler.transform(X)
+    np.testing.assert_allclose(bundle['scaler'].transform(X), X_scaled, rtol=1e-12)
+    np.testing.assert_allclose(bundle['regressor'].predict(X), reg, rtol=1e-9)
+    np.testing.assert_allclose(bundle['classifier'].predict_proba(X), proba, rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(bundle['classifier'].classes_, lgbm_model.calibrated_classifier.classes_)
+
+    flat = load_artifact(path, native=False)
+    np.testing.assert_allclose(flat['regressor'].predict(X), reg, rtol=1e-9)
+    np.testing.assert_allclose(flat['classifier'].predict_proba(X), proba, rtol=1e-9, atol=1e-12)
+    assert compile_model(bundle) is bundle['compiled']
+
+def test_rf_artifact_matches_compiled_pickle(tmp_path):
+    original = rf_bundle()
+    path = save_artifact(original, str(tmp_path / "rf"))
+    X = np.random.default_rng(2).normal(size=(200, len(FEATURE_NAMES)))
+
+    bundle = load_artifact(path)
+    reg, proba = predict(bundle, X)
+    expected_reg = original['regressor'].predict(original['scaler'].transform(X))
+    np.testing.assert_allclose(reg, expected_reg, rtol=1e-9)
+    np.testing.assert_allclose(proba, compile_model(original).classifier.predict_proba(original['scaler'].transform(X)),
+                               rtol=1e-9, atol=1e-12)
+    assert bundle['training_metadata'] == {'class_distribution': {'0': 3}, 'rmse': 1.5}
+
+    # mmap이면 배열이 파일에 연결되고, mmap=False면 메모리로 읽음
+    assert isinstance(bundle['compiled'].regressor.threshold.base, np.memmap)
+    assert not isinstance(load_artifact(path, mmap=False)['compiled'].regressor.threshold.base, np.memmap)
+
+def test_save_replaces_existing_artifact(tmp_path):
+    path = str(tmp_path / "model")
+    save_artifact(rf_bundle(seed=0), path)
+    second = rf_bundle(seed=1)
+    save_artifact(second, path)
+
+    X = np.random.default_rng(3).normal(size=(50, len(FEATURE_NAMES)))
+    np.testing.assert_allclose(predict(load_artifact(path), X)[0], predict(second, X)[0], rtol=1e-9)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model"]
+
+def edit_manifest(path, edit):
+    manifest_path = f"{path}/{MANIFEST_NAME}"
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    edit(manifest)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+@pytest.mark.parametrize("edit", [
+    lambda m: m.update(format_version=FORMAT_VERSION + 1),
+    lambda m: m.update(format='other'),
+    lambda m: m['feature_names'].__setitem__(0, 'unknown_feature'),
+    lambda m: m.update(n_features=m['n_features'] - 1),
+    lambda m: m['arrays']['regressor/threshold.npy'].update(shape=[1]),
+    lambda m: m.pop('classifier'),
+])
+def test_schema_errors(tmp_path, edit):
+    path = save_artifact(rf_bundle(), str(tmp_path / "model"))
+    edit_manifest(path, edit)
+    with pytest.raises(ArtifactSchemaError):
+        load_artifact(path)
+
+def test_missing_array_file(tmp_path):
+    path = save_artifact(rf_bundle(), str(tmp_path / "model"))
+    (tmp_path / "model" / "scaler" / "mean.npy").unlink()
+    with pytest.raises(ArtifactSchemaError):
+        load_artifact(path)
+
+def test_registry_prefers_artifact_over_pickle(tmp_path, monkeypatch):
+    original = rf_bundle()
+    with open(tmp_path / "test_model.pkl", "wb") as f:
+        pickle.dump(original, f)
+    monkeypatch.setattr(model_registry, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(model_registry, "_cache", ResultCache())
+
+    assert model_registry.model_path("test_model").endswith("test_model.pkl")
+    assert isinstance(load_bundle(str(tmp_path / "test_model.pkl"))['regressor'], RandomForestRegressor)
+
+    features = dict(zip(FEATURE_NAMES, np.random.default_rng(4).normal(size=len(FEATURE_NAMES)).tolist()))
+    from_pickle = model_registry.predict(features, version="test_model")
+    model_registry.unload_model("test_model")
+
+    save_artifact(original, str(tmp_path / "test_model"))
+    try:
+        assert model_registry.model_path("test_model") == str(tmp_path / "test_model")
+        assert 'artifact_manifest' in model_registry.load_model("test_model")
+        from_artifact = model_registry.predict(features, version="test_model")
+        assert from_artifact['cache_hit'] is False
+        assert {k: from_artifact[k] for k in ('score', 'risk_class', 'risk_proba')} == \
+               {k: from_pickle[k] for k in ('score', 'risk_class', 'risk_proba')}
+    finally:
+        model_registry.unload_model("test_model")
+
+def test_resolve_model_path_prefers_directory(tmp_path):
+    stem = str(tmp_path / "Fin_model_v1")
+    assert resolve_model_path(stem) == stem  # 둘 다 없으면 그대로
+
+    with open(stem + ".pkl", "wb") as f:
+        pickle.dump(rf_bundle(), f)
+    assert resolve_model_path(stem) == stem + ".pkl"
+    assert resolve_model_path(stem + ".pkl") == stem + ".pkl"
+
+    # 재학습 기본 출력(디렉터리)이 생기면 .pkl 설정으로도 새 모델을 읽음
+    save_artifact(rf_bundle(seed=1), stem)
+    assert resolve_model_path(stem) == stem
+    assert resolve_model_path(stem + ".pkl") == stem
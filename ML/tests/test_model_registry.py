@@ -0,0 +1,50 @@
+"""
+model_registry.predict_batch (Elixir 배치 디스패처 경로)와 단건 predict의 동등성 테스트
+"""
+import pickle
+import numpy as np
+import pytest
+import model_registry
+from feature_pipeline import FEATURE_NAMES, SPENDING_COLS, build_feature_matrix
+from result_cache import ResultCache
+from conftest import make_bundle
+
+def make_features(n, seed):
+    rng = np.random.default_rng(seed)
+    ratios = rng.dirichlet(np.ones(len(SPENDING_COLS)), size=n)
+    rows = []
+    for i in range(n):
+        row = dict(zip(SPENDING_COLS, ratios[i].tolist()))
+        row.update({'total_spending': float(rng.uniform(100, 900)), 'mean_spending': float(rng.uniform(0.5, 5)),
+                    'n_transactions': int(rng.integers(10, 500)), 'est_income_만원': float(rng.uniform(150, 900))})
+        rows.append(row)
+    return rows
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    bundle = make_bundle(build_feature_matrix(make_features(400, seed=0), FEATURE_NAMES))
+    with open(tmp_path / "test_model.pkl", "wb") as f:
+        pickle.dump(bundle, f)
+
+    monkeypatch.setattr(model_registry, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(model_registry, "_cache", ResultCache())
+    yield model_registry
+    model_registry.unload_model("test_model")
+
+def test_predict_batch_matches_single_predictions(registry):
+    features = make_features(30, seed=2)
+    features[3]['mean_spending'] = None  # 누락값은 기본값으로 대체
+
+    # 일부는 미리 예측해 두어 배치 안에서 캐시 적중/미스가 섞이도록 함
+    warm = {i: registry.predict(features[i], version="test_model") for i in (0, 5, 17)}
+    batch = registry.predict_batch(features, version="test_model")
+
+    assert [r['cache_hit'] for r in batch['results']] == [i in warm for i in range(len(features))]
+    assert set(batch['timings_ms']) >= {'load', 'cache', 'features', 'model', 'total'}
+
+    registry._cache.invalidate()
+    for feature, result in zip(features, batch['results']):
+        single = registry.predict(feature, version="test_model")
+        assert single['cache_hit'] is False
+        assert {k: single[k] for k in ('score', 'risk_class', 'risk_proba')} == \
+               {k: result[k] for k in ('score', 'risk_class', 'risk_proba')}
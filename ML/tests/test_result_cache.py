@@ -0,0 +1,50 @@
+"""
+result_cache LRU/TTL/버전 무효화 테스트
+"""
+import result_cache
+from result_cache import ResultCache
+
+def test_key_is_order_independent_and_rounded():
+    cache = ResultCache(decimals=6)
+    a = cache.make_key("v1", {"교통": 0.1 + 0.2, "total_spending": 300})
+    b = cache.make_key("v1", {"total_spending": 300.0, "교통": 0.3})
+    assert a == b
+    assert cache.make_key("v2", {"total_spending": 300.0, "교통": 0.3}) != a
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(maxsize=2, ttl=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용 → b가 퇴출 대상
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1,
+                             "evictions": 1, "expirations": 0}
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl=10)
+    cache.put("a", 1)
+    now[0] = 109.0
+    assert cache.get("a") == 1
+    now[0] = 111.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_invalidate_by_version():
+    cache = ResultCache()
+    k1 = cache.make_key("v1", {"x": 1})
+    k2 = cache.make_key("v2", {"x": 1})
+    cache.put(k1, "old")
+    cache.put(k2, "new")
+    cache.invalidate("v1")
+    assert cache.get(k1) is None
+    assert cache.get(k2) == "new"
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,80 @@
+"""
+scoring 벡터화 경로와 행 단위(score_row/get_persona_*) 경로의 동등성 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from scoring import (score_row, score_frame, add_financial_scores,
+                     get_persona_from_score, get_persona_level_from_score,
+                     nearest_quintile, nearest_quintiles, realistic_score, realistic_label,
+                     add_realistic_scores)
+from conftest import make_scoring_frame
+
+def reference_add_financial_scores(df):
+    """벡터화 이전 구현 (row-wise apply)"""
+    df = df.copy()
+    df["재무건전_점수"] = df.apply(score_row, axis=1)
+    df["페르소나_레벨"] = df["재무건전_점수"].apply(get_persona_level_from_score)
+    persona_info = df["재무건전_점수"].apply(get_persona_from_score)
+    df["페르소나_이름"] = persona_info.apply(lambda x: x["name"])
+    df["페르소나_이모지"] = persona_info.apply(lambda x: x["emoji"])
+    df["페르소나_설명"] = persona_info.apply(lambda x: x["description"])
+    df["재무건전_라벨"] = (df["재무건전_점수"] >= 60).astype(int)
+    return df
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_score_frame_matches_score_row(seed):
+    df = make_scoring_frame(5000, seed)
+    expected = df.apply(score_row, axis=1)
+    pd.testing.assert_series_equal(score_frame(df), expected)
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_add_financial_scores_matches_reference(seed):
+    df = make_scoring_frame(3000, seed)
+    df.index = df.index * 3 + 7  # 비연속 인덱스에서도 정렬 유지
+    pd.testing.assert_frame_equal(add_financial_scores(df), reference_add_financial_scores(df))
+
+def make_realistic_frame(n, seed):
+    """참조 소득과 같은 값/중간값(동률), NaN/inf, 임계값 경계를 섞은 입력"""
+    rng = np.random.default_rng(seed)
+    ref_tbl = pd.DataFrame({
+        "처분가능소득_만원": [300.0, 150.0, 450.0, 300.0, 620.0, 90.0, 450.0],
+        "소득분위": [3, 1, 4, 2, 5, 1, 5],
+    })
+    incomes = rng.uniform(0, 800, size=n)
+    pick = rng.random(n)
+    incomes[pick < 0.15] = rng.choice(ref_tbl["처분가능소득_만원"].to_numpy(), size=(pick < 0.15).sum())
+    incomes[(pick >= 0.15) & (pick < 0.25)] = rng.choice([120.0, 225.0, 375.0, 535.0], size=((pick >= 0.15) & (pick < 0.25)).sum())
+    incomes[(pick >= 0.25) & (pick < 0.27)] = np.nan
+    incomes[(pick >= 0.27) & (pick < 0.28)] = np.inf
+    df = pd.DataFrame({
+        "est_income_만원": incomes,
+        "DSR_ref": rng.choice([0.1, 0.3, 0.35, 0.4, 0.6, np.nan, np.inf], size=n),
+        "DebtAsset_ref": rng.choice([0.2, 0.5, 0.6, 0.7, 0.9, np.nan], size=n),
+    })
+    return df, ref_tbl
+
+def reference_add_realistic_scores(df_real, ref_tbl):
+    """벡터화 이전 구현 (row-wise apply)"""
+    df_real = df_real.copy()
+    ref_incomes = ref_tbl["처분가능소득_만원"].values
+    ref_quints = ref_tbl["소득분위"].values
+    df_real["est_quintile"] = df_real["est_income_만원"].apply(
+        lambda y: nearest_quintile(y, ref_incomes, ref_quints)
+    )
+    df_real["현실형_점수"] = df_real.apply(realistic_score, axis=1)
+    df_real["현실형_라벨"] = df_real.apply(realistic_label, axis=1)
+    return df_real
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_add_realistic_scores_matches_reference(seed):
+    df, ref_tbl = make_realistic_frame(4000, seed)
+    df.index = df.index * 2 + 5
+    pd.testing.assert_frame_equal(add_realistic_scores(df, ref_tbl), reference_add_realistic_scores(df, ref_tbl))
+
+def test_nearest_quintiles_nan_reference():
+    ref_incomes = np.array([100.0, np.nan, 300.0])
+    ref_quints = np.array([1, 2, 3])
+    values = np.array([90.0, 310.0, np.nan])
+    expected = [nearest_quintile(y, ref_incomes, ref_quints) for y in values]
+    np.testing.assert_array_equal(nearest_quintiles(values, ref_incomes, ref_quints), expected)
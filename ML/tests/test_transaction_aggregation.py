@@ -0,0 +1,77 @@
+"""
+거래 내역 집계: 수기 계산과의 일치, 증분 적재 = 전체 일괄 집계, 배치 중복 적재 방지
+"""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from feature_pipeline import SPENDING_COLS
+from transaction_aggregation import (TransactionStore, aggregate_transactions, normalize_transactions,
+                                     partials_to_features, USER_ID_COL, MONTH_COL)
+
+RAW_CATEGORIES = SPENDING_COLS + ['카페', '병원', '관리비', '알수없음']
+
+def make_transactions(n, seed, months=("2024-05", "2024-06")):
+    rng = np.random.default_rng(seed)
+    starts = pd.to_datetime([f"{m}-01" for m in months])
+    return pd.DataFrame({
+        'user_id': rng.integers(0, 200, n),
+        'timestamp': starts[rng.integers(0, len(months), n)] + pd.to_timedelta(rng.integers(0, 27 * 86400, n), unit="s"),
+        'amount': rng.integers(1_000, 200_000, n).astype(float),
+        'category': np.array(RAW_CATEGORIES, dtype=object)[rng.integers(0, len(RAW_CATEGORIES), n)]
+    })
+
+def test_features_match_hand_computation():
+    tx = pd.DataFrame({
+        'user_id': [1, 1, 1, 1, 2],
+        'timestamp': ['2024-06-01', '2024-06-03', '2024-06-20', '2024-06-21', '2024-06-05'],
+        'amount': [30_000, 50_000, 20_000, -10_000, 40_000],
+        'category': ['카페', '주거', '알수없음', '카페', '교통']
+    })
+    features = partials_to_features(aggregate_transactions(normalize_transactions(tx))).set_index(USER_ID_COL)
+
+    user = features.loc[1]
+    assert user[MONTH_COL] == 202406
+    assert user['n_transactions'] == 3  # 환불은 거래 건수에서 제외
+    assert user['total_spending'] == pytest.approx(9.0)
+    assert user['mean_spending'] == pytest.approx(3.0)
+    assert user['식료품음료'] == pytest.approx(2 / 9)
+    assert user['주거'] == pytest.approx(5 / 9)
+    assert user['기타소비'] == pytest.approx(2 / 9)
+    assert features.loc[2, '교통'] == pytest.approx(1.0)
+    assert features[SPENDING_COLS].sum(axis=1).to_numpy() == pytest.approx(1.0)
+
+def test_incremental_append_matches_full_aggregation(tmp_path):
+    history = make_transactions(5000, seed=0)
+    new = make_transactions(800, seed=1, months=("2024-06", "2024-07"))
+
+    store = TransactionStore(str(tmp_path / "store"))
+    store.append(history, batch_id="history")
+    may_path = [os.path.join(store.path, name) for name in os.listdir(store.path) if name.startswith("202405")][0]
+    may_mtime = os.path.getmtime(may_path)
+
+    stats = store.append([new.iloc[:300], new.iloc[300:]], batch_id="daily")
+
+    assert stats['months'] == [202406, 202407]
+    assert os.path.getmtime(may_path) == may_mtime  # 새 배치에 없는 월은 다시 쓰지 않음
+    assert store.months() == [202405, 202406, 202407]
+
+    everything = partials_to_features(aggregate_transactions(normalize_transactions(pd.concat([history, new]))))
+    for month in store.months():
+        expected = everything[everything[MONTH_COL] == month].sort_values(USER_ID_COL).reset_index(drop=True)
+        result = store.features(month).sort_values(USER_ID_COL).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_batch_id_is_idempotent(tmp_path):
+    store = TransactionStore(str(tmp_path / "store"))
+    tx = make_transactions(500, seed=2)
+
+    store.append(tx, batch_id="20240601")
+    before = store.features("2024-06")
+    stats = store.append(tx, batch_id="20240601")
+
+    assert stats['skipped']
+    pd.testing.assert_frame_equal(store.features("2024-06"), before)
+
+def test_missing_month_is_empty(tmp_path):
+    assert TransactionStore(str(tmp_path / "store")).features(202401).empty
@@ -0,0 +1,116 @@
+"""
+tree_ensemble 평탄화 평가기와 원본 sklearn/LightGBM 추정기의 예측 동등성 테스트
+"""
+import numpy as np
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+import model_registry
+from model_artifact import load_bundle
+from tree_ensemble import BundlePredictor, compile_estimator, compile_classifier, compile_model
+from conftest import legacy_counts
+
+lightgbm = pytest.importorskip("lightgbm")
+
+def make_data(n_classes, seed=0, n=600, n_features=8):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, n_features))
+    y_reg = X[:, 0] * 3 + np.sin(X[:, 1]) * 2 + rng.normal(scale=0.3, size=n)
+    y_cls = np.digitize(X[:, 0] + X[:, 2] * 0.5, np.linspace(-1, 1, n_classes - 1))
+    X_test = rng.normal(size=(300, n_features))
+    return X, y_reg, y_cls, X_test
+
+def test_random_forest_regressor():
+    X, y, _, X_test = make_data(2)
+    model = RandomForestRegressor(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    np.testing.assert_allclose(compile_estimator(model).output(X_test)[:, 0], model.predict(X_test), rtol=1e-12)
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_random_forest_classifier(n_classes):
+    X, _, y, X_test = make_data(n_classes)
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    compiled = compile_classifier(model)
+    np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+def test_lightgbm_regressor_with_missing_values():
+    X, y, _, X_test = make_data(2)
+    X[::7, 3] = np.nan
+    X_test[::5, 3] = np.nan
+    X_test[::11, 4] = np.nan
+    model = lightgbm.LGBMRegressor(n_estimators=60, num_leaves=15, verbosity=-1, random_state=0).fit(X, y)
+    np.testing.assert_allclose(compile_estimator(model).output(X_test)[:, 0], model.predict(X_test), rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_lightgbm_classifier(n_classes):
+    X, _, y, X_test = make_data(n_classes)
+    model = lightgbm.LGBMClassifier(n_estimators=60, num_leaves=15, verbosity=-1, random_state=0).fit(X, y)
+    compiled = compile_classifier(model)
+    np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+@pytest.mark.parametrize("mode", ["cv", "oof", "prefit"])
+def test_isotonic_calibrated_classifier(n_classes, mode):
+    X, _, y, X_test = make_data(n_classes, seed=1)
+    base = lightgbm.LGBMClassifier(n_estimators=40, num_leaves=15, verbosity=-1, random_state=0)
+    if mode == "prefit":
+        # 학습 시 holdout 보정 모드와 같은 구성
+        from train_consumption_pattern import prefit_calibrator
+        model = prefit_calibrator(base.fit(X[:400], y[:400])).fit(X[400:], y[400:])
+    else:
+        model = CalibratedClassifierCV(base, method='isotonic', cv=3, ensemble=(mode == "cv")).fit(X, y)
+    compiled = compile_classifier(model)
+    np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+def test_compiled_model_bundle_single_and_batch():
+    X, y_reg, y_cls, X_test = make_data(2, seed=2)
+    scaler = StandardScaler().fit(X)
+    regressor = lightgbm.LGBMRegressor(n_estimators=40, verbosity=-1, random_state=0).fit(scaler.transform(X), y_reg)
+    classifier = RandomForestClassifier(n_estimators=20, random_state=0).fit(scaler.transform(X), y_cls)
+    compiled = compile_model({'regressor': regressor, 'classifier': classifier, 'scaler': scaler})
+    
+    X_scaled = scaler.transform(X_test)
+    batch = compiled.predict(X_test)
+    np.testing.assert_allclose(batch['consumption_score'], regressor.predict(X_scaled), rtol=1e-9)
+    np.testing.assert_allclose(batch['risk_probabilities'], classifier.predict_proba(X_scaled), rtol=1e-9)
+    
+    single = compiled.predict(X_test[:1])
+    assert single['consumption_score'][0] == batch['consumption_score'][0]
+    np.testing.assert_array_equal(single['risk_probabilities'][0], batch['risk_probabilities'][0])
+
+@pytest.mark.parametrize("compiled_max_rows", [0, 10_000])
+def test_bundle_predictor_native_path_matches_compiled(compiled_max_rows):
+    X, y_reg, y_cls, X_test = make_data(3, seed=3)
+    scaler = StandardScaler().fit(X)
+    bundle = {
+        'regressor': RandomForestRegressor(n_estimators=15, random_state=0).fit(scaler.transform(X), y_reg),
+        'classifier': legacy_counts(RandomForestClassifier(n_estimators=15, random_state=0).fit(scaler.transform(X), y_cls)),
+        'scaler': scaler
+    }
+    predictor = BundlePredictor(bundle, compiled_max_rows=compiled_max_rows)
+    expected = compile_model(bundle).predict(X_test)
+    result = predictor.predict(X_test)
+
+    np.testing.assert_allclose(result['consumption_score'], expected['consumption_score'], rtol=1e-12)
+    np.testing.assert_allclose(result['risk_probabilities'], expected['risk_probabilities'], rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(result['risk_classification'], expected['risk_classification'])
+    np.testing.assert_allclose(result['risk_probabilities'].sum(axis=1), 1.0)
+
+@pytest.mark.parametrize("version", ["Fin_model_v1", "Fin_model_v1_1"])
+def test_shipped_models_independent_of_batch_size(version):
+    """같은 사용자는 단건/소규모/대량 배치 어디에 속해도 같은 등급·확률"""
+    bundle = load_bundle(model_registry.model_path(version))
+    predictor = BundlePredictor(bundle)
+    rng = np.random.default_rng(4)
+    X = bundle['scaler'].mean_ + rng.normal(size=(300, len(bundle['feature_names']))) * bundle['scaler'].scale_
+
+    large = predictor.predict(X)
+    small = predictor.predict(X[:100])
+    np.testing.assert_allclose(large['risk_probabilities'].sum(axis=1), 1.0)
+    np.testing.assert_array_equal(small['risk_classification'], large['risk_classification'][:100])
+    np.testing.assert_allclose(small['risk_probabilities'], large['risk_probabilities'][:100], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(small['consumption_score'], large['consumption_score'][:100], rtol=1e-9)
+
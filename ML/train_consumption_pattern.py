@@ -4,21 +4,76 @@
 - 순수 소비패턴만 분석
 - 소득/지출/저축 비율은 별도 rule-based 처리
 """
+import os
+import math
+import time
 import numpy as np
 import pandas as pd
 import pickle
 import joblib
 from datetime import datetime
-from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.metrics import accuracy_score, roc_auc_score, confusion_matrix, classification_report
 from sklearn.metrics import log_loss
 from utils import RANDOM_SEED, show_importance
+from feature_pipeline import BASE_FEATURES, DERIVED_FEATURES, SPENDING_COLS, engineer_features_frame
+from tree_ensemble import compile_model
+from model_artifact import save_artifact
+from booster_models import BoosterRegressor, BoosterClassifier, balanced_weights
+from stage_timing import StageTimer, MetricsRegistry
+from dataset_store import load_dataset, iter_dataset_chunks, DatasetWriter
 import warnings
 warnings.filterwarnings('ignore')
 
+# 필수 컬럼 (부채 관련 제외) - 학습 데이터 로드 시 이 컬럼만 읽음
+LABEL_COLUMNS = ['재무건전_점수', '재무건전_라벨']
+TRAINING_COLUMNS = BASE_FEATURES + ['est_income_만원'] + LABEL_COLUMNS
+
+# IQR 이상치 제거 대상 (순서대로 적용)
+QUALITY_NUMERIC_COLS = ['total_spending', 'mean_spending', 'n_transactions', 'est_income_만원']
+
+# 확률 보정 방식
+# - holdout: 학습 데이터 일부를 떼어 분류기를 1회 학습하고, 떼어 둔 데이터로 isotonic 보정
+# - oof: CV 1회의 out-of-fold 확률로 보정기 학습, 같은 CV에서 전체 데이터로 학습한 분류기 1개 재사용
+# - cv: 전체 학습 + CalibratedClassifierCV(cv=3) fold 모델 3개 앙상블 (기본값)
+# cv는 모든 행으로 보정하지만 분류기를 4번 학습하고, holdout/oof는 학습 1회로 빠른 대신
+# holdout은 분류기가 80%만 보고 oof는 보정 분포가 서빙 분류기와 약간 다를 수 있어 명시적으로 선택
+CALIBRATION_MODES = ('holdout', 'oof', 'cv')
+
+# 공동 학습(joint_training) 공유 Dataset 생성 파라미터
+# min_data_in_leaf 등 학습 파라미터가 바뀌어도 binning을 재사용하도록 사전 특성 필터링 비활성화
+JOINT_DATASET_PARAMS = {'feature_pre_filter': False, 'verbosity': -1}
+
+# 점진 학습(train_incremental) 행 분할/표본 추출용 해시 salt
+SPLIT_SALT = 0
+BIN_SAMPLE_SALT = 1
+
+def row_hash(row_ids, salt=0):
+    """
+    행 id → [0, 1) 균등 해시 (splitmix64)
+    
+    셔플 없이 청크 순서와 무관하게 같은 행이 항상 같은 값을 가지므로 결정적 분할/표본 추출에 사용
+    """
+    with np.errstate(over='ignore'):
+        x = np.asarray(row_ids, dtype=np.uint64) + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15)
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+def prefit_calibrator(estimator, method='isotonic'):
+    """이미 학습된 분류기를 다시 학습하지 않고 보정만 하는 CalibratedClassifierCV"""
+    try:
+        from sklearn.frozen import FrozenEstimator  # sklearn>=1.6 (cv='prefit' 대체)
+        return CalibratedClassifierCV(FrozenEstimator(estimator), method=method)
+    except ImportError:
+        return CalibratedClassifierCV(estimator, method=method, cv='prefit')
+
 class ConsumptionPatternModel:
     """
     소비패턴 분석 모델
@@ -26,10 +81,23 @@ class ConsumptionPatternModel:
     - 소득/지출/저축 비율은 별도 처리
     """
     
-    def __init__(self, use_lightgbm=True, tune_hyperparams=True, calibrate_probs=True):
+    def __init__(self, use_lightgbm=True, tune_hyperparams=False, calibrate_probs=True,
+                 tune_workers=1, tune_candidates=27, calibration='cv', calibration_size=0.2,
+                 joint_training=False):
+        if calibration not in CALIBRATION_MODES:
+            raise ValueError(f"지원하지 않는 보정 방식: {calibration} (지원: {CALIBRATION_MODES})")
+        if joint_training and calibrate_probs and calibration != 'holdout':
+            # oof/cv는 보정기가 분류기를 복제해 fold마다 다시 binning하므로 공유 Dataset 이점이 없음
+            raise ValueError("joint_training은 calibration='holdout' (또는 보정 없음)만 지원")
         self.use_lightgbm = use_lightgbm
         self.tune_hyperparams = tune_hyperparams
         self.calibrate_probs = calibrate_probs
+        self.calibration = calibration
+        self.calibration_size = calibration_size
+        self.tune_workers = tune_workers
+        self.tune_candidates = tune_candidates
+        self.joint_training = joint_training
+        self.search_results = {}
         self.regressor = None
         self.classifier = None
         self.calibrated_classifier = None
@@ -38,53 +106,83 @@ class ConsumptionPatternModel:
         self.training_metadata = {}
         self.data_quality_report = {}
     
-    def validate_data_quality(self, df):
-        """데이터 품질 검증 및 정제"""
-        print("\n데이터 품질 검증 시작...")
-        original_size = len(df)
-        
-        # 필수 컬럼 (부채 관련 제외)
-        required_cols = ['total_spending', 'mean_spending', 'n_transactions',
-                        '교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거',
-                        'est_income_만원', '재무건전_점수', '재무건전_라벨']
-        
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            raise ValueError(f"필수 컬럼 누락: {missing_cols}")
+    def _quality_mask(self, read_columns):
+        """
+        정제 후 남길 행 마스크 계산 (필요한 컬럼만 읽고 전체 DataFrame은 복사하지 않음)
         
-        df_clean = df.copy()
+        Args:
+            read_columns (callable): 컬럼 목록 → (행 slice, 청크 DataFrame) iterator
         
+        Returns:
+            tuple: (keep mask ndarray, 단계별 제거 수 dict)
+        """
         # 라벨 누락 샘플 제거
-        before_label_clean = len(df_clean)
-        df_clean = df_clean.dropna(subset=['재무건전_점수', '재무건전_라벨'])
-        label_removed = before_label_clean - len(df_clean)
-        
-        # 음수값 및 이상치 제거
-        numeric_cols = ['total_spending', 'mean_spending', 'n_transactions', 'est_income_만원']
-        for col in numeric_cols:
-            before_clean = len(df_clean)
-            df_clean = df_clean[df_clean[col] > 0]
-            # 이상치 제거 (IQR 방법)
-            Q1 = df_clean[col].quantile(0.25)
-            Q3 = df_clean[col].quantile(0.75)
+        keep = np.concatenate([chunk[LABEL_COLUMNS].notna().all(axis=1).to_numpy()
+                               for _, chunk in read_columns(LABEL_COLUMNS)])
+        label_removed = int(len(keep) - keep.sum())
+        
+        # 음수값 및 이상치 제거 (IQR 방법) - 앞 컬럼 필터를 통과한 행 기준으로 순차 계산
+        for col in QUALITY_NUMERIC_COLS:
+            before_clean = int(keep.sum())
+            positive = np.zeros(len(keep), dtype=bool)
+            survivors = []
+            for rows, chunk in read_columns([col]):
+                values = chunk[col].to_numpy(dtype=np.float64)
+                positive[rows] = keep[rows] & (values > 0)
+                survivors.append(values[positive[rows]])
+            values = np.concatenate(survivors)
+            
+            if len(values):
+                Q1, Q3 = np.quantile(values, [0.25, 0.75])
+            else:
+                Q1 = Q3 = np.nan
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
-            df_clean = df_clean[(df_clean[col] >= lower_bound) & (df_clean[col] <= upper_bound)]
-            outliers_removed = before_clean - len(df_clean)
+            
+            keep = positive
+            keep[positive] = (values >= lower_bound) & (values <= upper_bound)
+            outliers_removed = before_clean - int(keep.sum())
             if outliers_removed > 0:
                 print(f"{col}: {outliers_removed}개 이상치 제거")
         
         # 비율 컬럼 합계 검증
-        ratio_cols = ['교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
-        df_clean['ratio_sum'] = df_clean[ratio_cols].sum(axis=1)
-        before_ratio_clean = len(df_clean)
-        df_clean = df_clean[(df_clean['ratio_sum'] >= 0.9) & (df_clean['ratio_sum'] <= 1.1)]
-        ratio_removed = before_ratio_clean - len(df_clean)
-        df_clean = df_clean.drop('ratio_sum', axis=1)
+        before_ratio_clean = int(keep.sum())
+        for rows, chunk in read_columns(SPENDING_COLS):
+            ratio_sum = chunk[SPENDING_COLS].sum(axis=1).to_numpy()
+            keep[rows] &= (ratio_sum >= 0.9) & (ratio_sum <= 1.1)
+        ratio_removed = before_ratio_clean - int(keep.sum())
+        
+        return keep, {'label_removed': label_removed, 'ratio_removed': ratio_removed}
+    
+    def _set_quality_report(self, original_size, final_size, stats):
+        """데이터 품질 리포트 저장 및 출력"""
+        self.data_quality_report = {
+            'original_size': original_size,
+            'final_size': final_size,
+            'removed_samples': original_size - final_size,
+            'label_removed': stats['label_removed'],
+            'ratio_removed': stats['ratio_removed'],
+            'removal_rate': (original_size - final_size) / original_size * 100
+        }
+        
+        print(f"데이터 정제 완료: {original_size} → {final_size} ({self.data_quality_report['removal_rate']:.1f}% 제거)")
+    
+    def validate_data_quality(self, df):
+        """데이터 품질 검증 및 정제"""
+        print("\n데이터 품질 검증 시작...")
+        original_size = len(df)
+        
+        missing_cols = [col for col in TRAINING_COLUMNS if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"필수 컬럼 누락: {missing_cols}")
+        
+        # 마스크를 먼저 계산하고 한 번만 필터링 (중간 사본 없음)
+        keep, stats = self._quality_mask(lambda cols: [(slice(0, len(df)), df[cols])])
+        df_clean = df[keep]
         
         # 누락값 처리
-        for col in ratio_cols:
+        for col in SPENDING_COLS:
             df_clean[col] = df_clean[col].fillna(0)
         
         for col in ['total_spending', 'mean_spending', 'est_income_만원']:
@@ -95,73 +193,78 @@ class ConsumptionPatternModel:
         
         df_clean['n_transactions'] = df_clean['n_transactions'].fillna(0)
         
-        # 데이터 품질 리포트
-        self.data_quality_report = {
-            'original_size': original_size,
-            'final_size': len(df_clean),
-            'removed_samples': original_size - len(df_clean),
-            'label_removed': label_removed,
-            'ratio_removed': ratio_removed,
-            'removal_rate': (original_size - len(df_clean)) / original_size * 100
-        }
-        
-        print(f"데이터 정제 완료: {original_size} → {len(df_clean)} ({self.data_quality_report['removal_rate']:.1f}% 제거)")
+        self._set_quality_report(original_size, len(df_clean), stats)
         
         return df_clean
     
-    def engineer_consumption_features(self, df):
-        """소비패턴 특성 공학 (소득/지출 비율 제외)"""
-        df_eng = df.copy()
-        
-        # 1. 소비 구조 특성
-        df_eng['essential_spending_ratio'] = df_eng['주거'] + df_eng['식료품음료'] + df_eng['보건의료']
-        df_eng['discretionary_spending_ratio'] = df_eng['오락문화'] + df_eng['기타소비']
-        df_eng['investment_spending_ratio'] = df_eng['교육육아']  # 투자성 지출
-        df_eng['transport_spending_ratio'] = df_eng['교통']
-        
-        # 2. 거래 패턴 특성
-        df_eng['avg_transaction_size'] = df_eng['total_spending'] / (df_eng['n_transactions'] + 1)
-        df_eng['transaction_frequency_score'] = np.where(
-            (df_eng['n_transactions'] >= 50) & (df_eng['n_transactions'] <= 300), 1, 0
-        )
+    def validate_data_quality_chunked(self, source_path, output_path, chunk_size=100_000):
+        """
+        2-pass 청크 단위 데이터 품질 검증 (메모리보다 큰 데이터셋용)
+        - 1차: 필터 컬럼만 청크로 읽어 행 유지 마스크와 IQR 경계 계산
+          (메모리: 행당 마스크 1바이트 + 현재 컬럼 8바이트)
+        - 2차: 청크별로 필터링하여 컬럼형 파일로 기록
+        결과는 validate_data_quality(load_dataset(source_path))와 동일
+        
+        Args:
+            source_path (str): 원본 데이터셋 경로 (Parquet/.npcols/CSV)
+            output_path (str): 정제 결과 데이터셋 경로 (확장자 제외)
+            chunk_size (int): 청크당 행 수
+        
+        Returns:
+            str: 기록된 데이터셋 경로
+        """
+        print("\n데이터 품질 검증 시작 (청크 모드)...")
+        
+        columns = list(next(iter_dataset_chunks(source_path, chunk_size=1)).columns)
+        missing_cols = [col for col in TRAINING_COLUMNS if col not in columns]
+        if missing_cols:
+            raise ValueError(f"필수 컬럼 누락: {missing_cols}")
         
-        # 3. 소비 균형도 (표준편차 기반)
-        spending_cols = ['교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
-        df_eng['spending_balance_score'] = 1 / (1 + df_eng[spending_cols].std(axis=1))
+        def read_columns(cols):
+            for chunk in iter_dataset_chunks(source_path, columns=cols, chunk_size=chunk_size):
+                yield slice(chunk.index[0], chunk.index[-1] + 1), chunk
         
-        # 4. 합리적 소비 패턴 점수
-        df_eng['rational_spending_score'] = (
-            (df_eng['essential_spending_ratio'] >= 0.4) & (df_eng['essential_spending_ratio'] <= 0.7) &
-            (df_eng['discretionary_spending_ratio'] <= 0.3) &
-            (df_eng['investment_spending_ratio'] >= 0.05)
-        ).astype(int)
+        # 1차 패스: 마스크/경계 계산
+        keep, stats = self._quality_mask(read_columns)
         
-        # 5. 지출 크기별 더미 변수 (소득 대비가 아닌 절대적 크기)
-        df_eng['spending_low'] = (df_eng['total_spending'] < 200).astype(int)
-        df_eng['spending_mid'] = ((df_eng['total_spending'] >= 200) & (df_eng['total_spending'] < 400)).astype(int)
-        df_eng['spending_high'] = (df_eng['total_spending'] >= 400).astype(int)
+        # 2차 패스: 청크 필터링 후 기록
+        # (양수 필터에서 NaN 행이 이미 제거되므로 중앙값 대체는 발생하지 않음)
+        with DatasetWriter(output_path) as writer:
+            for rows, chunk in read_columns(None):
+                chunk = chunk[keep[rows]]
+                chunk[SPENDING_COLS] = chunk[SPENDING_COLS].fillna(0)
+                chunk['n_transactions'] = chunk['n_transactions'].fillna(0)
+                writer.write(chunk)
         
-        return df_eng
+        self._set_quality_report(len(keep), writer.n_rows, stats)
+        print(f"정제 데이터 저장: {writer.path}")
+        
+        return writer.path
+    
+    def engineer_consumption_features(self, df):
+        """소비패턴 특성 공학 (소득/지출 비율 제외)"""
+        # 서빙(Flask/Pythonx)과 동일한 feature_pipeline 커널 사용
+        return engineer_features_frame(df)
     
-    def prepare_features(self, df):
-        """소비패턴 특성 준비"""
+    def prepare_features(self, df, validated=False):
+        """소비패턴 특성 준비 (validated=True: validate_data_quality_chunked로 이미 정제된 데이터)"""
         # 데이터 품질 검증
-        df_clean = self.validate_data_quality(df)
+        df_clean = df if validated else self.validate_data_quality(df)
         
+        X, y_reg, y_cls = self._features_and_targets(df_clean)
+        
+        print(f"\n소비패턴 특성 준비 완료: {len(self.feature_names)}개 특성, {len(X)}개 샘플")
+        print(f"특성 목록: {self.feature_names}")
+        
+        return X, y_reg, y_cls
+    
+    def _features_and_targets(self, df_clean):
+        """정제된 데이터 → (특성, 회귀 타깃, 분류 라벨) (청크 단위 학습에서도 사용)"""
         # 소비패턴 특성 공학
         df_eng = self.engineer_consumption_features(df_clean)
         
         # 소비패턴 분석용 특성 선택 (소득 제외)
-        base_features = ['total_spending', 'mean_spending', 'n_transactions',
-                        '교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
-        
-        consumption_features = ['essential_spending_ratio', 'discretionary_spending_ratio',
-                               'investment_spending_ratio', 'transport_spending_ratio',
-                               'avg_transaction_size', 'transaction_frequency_score',
-                               'spending_balance_score', 'rational_spending_score',
-                               'spending_low', 'spending_mid', 'spending_high']
-        
-        feature_cols = base_features + consumption_features
+        feature_cols = BASE_FEATURES + DERIVED_FEATURES
         
         X = df_eng[feature_cols].copy()
         
@@ -171,13 +274,42 @@ class ConsumptionPatternModel:
         
         self.feature_names = feature_cols
         
-        print(f"\n소비패턴 특성 준비 완료: {len(feature_cols)}개 특성, {len(X)}개 샘플")
-        print(f"특성 목록: {feature_cols}")
-        
         return X, y_reg, y_cls
     
-    def _get_base_models(self):
-        """기본 모델 생성"""
+    def tune(self, X_train, y_reg_train, y_cls_train):
+        """
+        LightGBM 하이퍼파라미터 탐색 (Successive Halving, hyperparameter_search.py)
+        
+        학습 데이터에서 검증 폴드를 떼어 조기 종료/순위 결정에 사용하고, 테스트 데이터는 사용하지 않음
+        
+        Returns:
+            dict: 과제별 최적 파라미터 ('regression'/'classification', n_estimators = 조기 종료 라운드)
+        """
+        from hyperparameter_search import successive_halving
+        
+        X_fit, X_valid, y_reg_fit, y_reg_valid, y_cls_fit, y_cls_valid = train_test_split(
+            X_train, y_reg_train, y_cls_train, test_size=0.2, random_state=RANDOM_SEED, stratify=y_cls_train
+        )
+        print(f"\n하이퍼파라미터 탐색: 후보 {self.tune_candidates}개, 워커 {self.tune_workers}개 "
+              f"(Fit {len(X_fit)} / Valid {len(X_valid)})")
+        
+        options = {'n_candidates': self.tune_candidates, 'workers': self.tune_workers}
+        self.search_results = {
+            'regression': successive_halving(X_fit, y_reg_fit, X_valid, y_reg_valid,
+                                             task='regression', **options),
+            'classification': successive_halving(X_fit, y_cls_fit, X_valid, y_cls_valid,
+                                                 task='classification', balanced=True, **options)
+        }
+        return {task: dict(search['best_params'], n_estimators=search['best_iteration'])
+                for task, search in self.search_results.items()}
+    
+    def _get_base_models(self, tuned=None, native=None):
+        """
+        기본 모델 생성 (tuned: tune() 결과가 있으면 LightGBM 기본 파라미터 대신 사용)
+        native=True이면 lgb.Dataset으로 직접 학습하는 Booster 래퍼 (기본: joint_training 여부)
+        """
+        if native is None:
+            native = self.joint_training
         if self.use_lightgbm:
             try:
                 from lightgbm import LGBMRegressor, LGBMClassifier
@@ -188,32 +320,30 @@ class ConsumptionPatternModel:
                     'force_col_wise': True,
                 }
                 
-                reg = LGBMRegressor(
-                    n_estimators=400,
-                    num_leaves=31,
-                    learning_rate=0.05,
-                    feature_fraction=0.8,
-                    bagging_fraction=0.8,
-                    bagging_freq=5,
-                    min_data_in_leaf=20,
-                    lambda_l1=0.1,
-                    lambda_l2=0.1,
-                    **base_params
-                )
+                default_params = {
+                    'n_estimators': 400,
+                    'num_leaves': 31,
+                    'learning_rate': 0.05,
+                    'feature_fraction': 0.8,
+                    'bagging_fraction': 0.8,
+                    'bagging_freq': 5,
+                    'min_data_in_leaf': 20,
+                    'lambda_l1': 0.1,
+                    'lambda_l2': 0.1,
+                }
+                reg_params = dict(default_params, **(tuned or {}).get('regression', {}))
+                clf_params = dict(default_params, **(tuned or {}).get('classification', {}))
                 
-                clf = LGBMClassifier(
-                    n_estimators=400,
-                    num_leaves=31,
-                    learning_rate=0.05,
-                    feature_fraction=0.8,
-                    bagging_fraction=0.8,
-                    bagging_freq=5,
-                    min_data_in_leaf=20,
-                    lambda_l1=0.1,
-                    lambda_l2=0.1,
-                    class_weight='balanced',
-                    **base_params
-                )
+                if native:
+                    # 공유 Dataset으로 학습하는 네이티브 Booster 래퍼 (random_state → seed)
+                    native_params = {'seed': RANDOM_SEED, 'verbosity': -1, 'force_col_wise': True}
+                    reg_rounds, clf_rounds = reg_params.pop('n_estimators'), clf_params.pop('n_estimators')
+                    reg = BoosterRegressor(dict(reg_params, **native_params), reg_rounds)
+                    clf = BoosterClassifier(dict(clf_params, **native_params), clf_rounds, class_weight='balanced')
+                    return reg, clf
+                
+                reg = LGBMRegressor(**reg_params, **base_params)
+                clf = LGBMClassifier(**clf_params, class_weight='balanced', **base_params)
                 
                 return reg, clf
             except ImportError:
@@ -237,12 +367,15 @@ class ConsumptionPatternModel:
         )
         return reg, clf
     
-    def train(self, df, test_size=0.2):
+    def train(self, df, test_size=0.2, validated=False):
         """모델 훈련"""
         print(f"\n=== 소비패턴 모델 학습 시작 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ===")
+        # 학습 단계별 소요 시간 (서빙 /metrics 레지스트리와 분리)
+        timer = StageTimer('train', registry=MetricsRegistry())
         
         # 데이터 준비
-        X, y_reg, y_cls = self.prepare_features(df)
+        with timer.span('features'):
+            X, y_reg, y_cls = self.prepare_features(df, validated=validated)
         
         # 데이터 분할
         X_train, X_test, y_reg_train, y_reg_test, y_cls_train, y_cls_test = train_test_split(
@@ -252,31 +385,77 @@ class ConsumptionPatternModel:
         print(f"데이터 분할: Train({len(X_train)}) / Test({len(X_test)})")
         
         # 특성 스케일링
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        with timer.span('scaling'):
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
         
-        # 모델 학습
-        self.regressor, self.classifier = self._get_base_models()
-        self.regressor.fit(X_train, y_reg_train)
-        self.classifier.fit(X_train, y_cls_train)
+        # 하이퍼파라미터 탐색 (LightGBM만 지원)
+        tuned = None
+        if self.tune_hyperparams and self.use_lightgbm:
+            with timer.span('tuning'):
+                tuned = self.tune(X_train, y_reg_train, y_cls_train)
         
-        # 확률 보정
-        if self.calibrate_probs:
-            print("확률 보정 수행...")
-            self.calibrated_classifier = CalibratedClassifierCV(
-                self.classifier, method='isotonic', cv=3
-            )
-            self.calibrated_classifier.fit(X_train, y_cls_train)
+        # 모델 학습
+        self.regressor, self.classifier = self._get_base_models(tuned)
+        if isinstance(self.regressor, BoosterRegressor):
+            # 공유 binning + 두 모델 동시 학습 (+ holdout 보정)
+            self._fit_joint(X_train, y_reg_train, y_cls_train, timer)
+        else:
+            with timer.span('fit_regressor'):
+                self.regressor.fit(X_train, y_reg_train)
+            
+            # 분류기 학습 + 확률 보정
+            self._fit_classifier(X_train, y_cls_train, timer)
         
         # 예측 및 평가
-        y_reg_pred = self.regressor.predict(X_test)
-        y_cls_pred = self.classifier.predict(X_test)
-        y_cls_proba = self.classifier.predict_proba(X_test)
+        with timer.span('evaluate'):
+            y_reg_pred = self.regressor.predict(X_test)
+            y_cls_pred = self.classifier.predict(X_test)
+            y_cls_proba = self.classifier.predict_proba(X_test)
+            
+            if self.calibrated_classifier:
+                y_cls_pred_cal = self.calibrated_classifier.predict(X_test)
+                y_cls_proba_cal = self.calibrated_classifier.predict_proba(X_test)
+        timer.finish()
         
-        if self.calibrated_classifier:
-            y_cls_pred_cal = self.calibrated_classifier.predict(X_test)
-            y_cls_proba_cal = self.calibrated_classifier.predict_proba(X_test)
+        # 학습 메타데이터
+        self._set_training_metadata(
+            n_samples=len(X), train_size=len(X_train), test_size=len(X_test),
+            class_distribution=dict(pd.Series(y_cls_train).value_counts().sort_index()), timer=timer
+        )
+        
+        calibrated = (y_cls_pred_cal, y_cls_proba_cal) if self.calibrated_classifier else None
+        return self._evaluation_results(y_reg_test, y_reg_pred, y_cls_test, y_cls_pred, y_cls_proba, calibrated)
+    
+    def _set_training_metadata(self, n_samples, train_size, test_size, class_distribution, timer, **extra):
+        """학습 메타데이터 저장 (train / train_incremental 공용, extra는 학습 방식별 추가 항목)"""
+        self.training_metadata = {
+            'timestamp': datetime.now().isoformat(),
+            'model_type': 'ConsumptionPattern_LightGBM' if self.use_lightgbm else 'ConsumptionPattern_RandomForest',
+            'model_purpose': 'consumption_pattern_analysis',
+            'score_contribution': 0.8,  # 전체 점수의 80% 기여
+            'n_features': len(self.feature_names),
+            'n_samples': n_samples,
+            'train_size': train_size,
+            'test_size': test_size,
+            'class_distribution': class_distribution,
+            'data_quality': self.data_quality_report,
+            'calibration': self.calibration if self.calibrate_probs else None,
+            'joint_training': self.joint_training and isinstance(self.regressor, BoosterRegressor),
+            'stage_seconds': {stage: round(seconds, 3) for stage, seconds in timer.stages.items()},
+            **extra
+        }
+        if self.search_results:
+            # 후보별 기록(trials)은 결과 리포트로만 반환하고 번들에는 요약만 저장
+            self.training_metadata['hyperparameter_search'] = {
+                task: {k: v for k, v in search.items() if k != 'trials'}
+                for task, search in self.search_results.items()
+            }
+    
+    def _evaluation_results(self, y_reg_test, y_reg_pred, y_cls_test, y_cls_pred, y_cls_proba, calibrated=None):
+        """테스트 예측 → 평가 지표/결과 dict (calibrated: 보정 분류기의 (예측, 확률))"""
+        y_reg_test, y_cls_test = np.asarray(y_reg_test), np.asarray(y_cls_test)
         
         # 메트릭 계산
         rmse = np.sqrt(mean_squared_error(y_reg_test, y_reg_pred))
@@ -296,20 +475,6 @@ class ConsumptionPatternModel:
         
         cm = confusion_matrix(y_cls_test, y_cls_pred)
         
-        # 학습 메타데이터
-        self.training_metadata = {
-            'timestamp': datetime.now().isoformat(),
-            'model_type': 'ConsumptionPattern_LightGBM' if self.use_lightgbm else 'ConsumptionPattern_RandomForest',
-            'model_purpose': 'consumption_pattern_analysis',
-            'score_contribution': 0.8,  # 전체 점수의 80% 기여
-            'n_features': len(self.feature_names),
-            'n_samples': len(X),
-            'train_size': len(X_train),
-            'test_size': len(X_test),
-            'class_distribution': dict(pd.Series(y_cls_train).value_counts().sort_index()),
-            'data_quality': self.data_quality_report
-        }
-        
         # 결과 정리
         results = {
             'regression': {
@@ -317,7 +482,7 @@ class ConsumptionPatternModel:
                 'mae': mae,
                 'r2': r2,
                 'predictions': pd.DataFrame({
-                    '실제': y_reg_test.values, 
+                    '실제': y_reg_test, 
                     '예측': np.round(y_reg_pred, 1)
                 })
             },
@@ -328,14 +493,18 @@ class ConsumptionPatternModel:
                 'confusion_matrix': cm,
                 'classification_report': classification_report(y_cls_test, y_cls_pred),
                 'predictions': pd.DataFrame({
-                    '실제': y_cls_test.values, 
+                    '실제': y_cls_test, 
                     '예측': y_cls_pred
                 })
             },
             'metadata': self.training_metadata
         }
         
-        if self.calibrated_classifier:
+        if self.search_results:
+            results['hyperparameter_search'] = self.search_results
+        
+        if calibrated is not None:
+            y_cls_pred_cal, y_cls_proba_cal = calibrated
             acc_cal = accuracy_score(y_cls_test, y_cls_pred_cal)
             try:
                 logloss_cal = log_loss(y_cls_test, y_cls_proba_cal)
@@ -346,13 +515,268 @@ class ConsumptionPatternModel:
                 'accuracy': acc_cal,
                 'log_loss': logloss_cal,
                 'predictions': pd.DataFrame({
-                    '실제': y_cls_test.values, 
+                    '실제': y_cls_test, 
                     '예측': y_cls_pred_cal
                 })
             }
         
         return results
     
+    def _fit_classifier(self, X_train, y_cls_train, timer):
+        """
+        분류기 학습 + 확률 보정 (calibration 방식별 학습 횟수)
+        - holdout: 분류기 1회 (calibration_size만큼 제외) + 보정기만 학습
+        - oof: CV fold 모델 k개 + 전체 1회, 서빙은 전체 학습 모델 1개 + 보정기
+        - cv: 전체 1회 + fold 모델 k개 (서빙은 fold 모델 k개 앙상블)
+        """
+        if not self.calibrate_probs:
+            with timer.span('fit_classifier'):
+                self.classifier.fit(X_train, y_cls_train)
+            return
+        
+        print(f"확률 보정 수행 ({self.calibration})...")
+        if self.calibration == 'holdout':
+            X_fit, X_cal, y_fit, y_cal = train_test_split(
+                X_train, y_cls_train, test_size=self.calibration_size, random_state=RANDOM_SEED, stratify=y_cls_train
+            )
+            with timer.span('fit_classifier'):
+                self.classifier.fit(X_fit, y_fit)
+            with timer.span('calibration'):
+                self.calibrated_classifier = prefit_calibrator(self.classifier).fit(X_cal, y_cal)
+        
+        elif self.calibration == 'oof':
+            # ensemble=False: cross_val_predict 확률로 보정기 학습 후 전체 데이터로 1회 학습
+            # fold 학습과 전체 학습이 한 호출 안에서 일어나므로 한 단계로 기록
+            with timer.span('fit_classifier'):
+                self.calibrated_classifier = CalibratedClassifierCV(
+                    self.classifier, method='isotonic', cv=3, ensemble=False
+                ).fit(X_train, y_cls_train)
+            # 보정기 안의 전체 데이터 학습 모델을 미보정 분류기로 재사용 (추가 학습 없음)
+            self.classifier = self.calibrated_classifier.calibrated_classifiers_[0].estimator
+        
+        else:
+            with timer.span('fit_classifier'):
+                self.classifier.fit(X_train, y_cls_train)
+            with timer.span('calibration'):
+                self.calibrated_classifier = CalibratedClassifierCV(
+                    self.classifier, method='isotonic', cv=3
+                ).fit(X_train, y_cls_train)
+    
+    def _fit_joint(self, X_train, y_reg_train, y_cls_train, timer):
+        """
+        회귀/분류기 공동 학습 (joint_training)
+        - 학습 행렬을 1회만 binning한 lgb.Dataset을 두 모델이 공유 (분류기는 행 subset + 라벨/가중치만 교체)
+        - 두 모델을 스레드 2개로 동시 학습, 모델마다 num_threads = 코어 수 / 2 (코어 과다 할당 방지)
+        - 모델별 학습 시간은 fit_regressor / fit_classifier, 동시 학습 구간 전체는 fit_joint로 기록
+        """
+        import lightgbm as lgb
+        
+        y_cls_train = np.asarray(y_cls_train)
+        cls_idx, cal_idx = np.arange(len(X_train)), None
+        if self.calibrate_probs:
+            # _fit_classifier holdout과 같은 분할 (인덱스만 분할)
+            cls_idx, cal_idx = train_test_split(
+                cls_idx, test_size=self.calibration_size, random_state=RANDOM_SEED, stratify=y_cls_train
+            )
+            cls_idx = np.sort(cls_idx)
+        
+        with timer.span('binning'):
+            base = lgb.Dataset(np.asarray(X_train, dtype=np.float64), params=JOINT_DATASET_PARAMS,
+                               free_raw_data=False).construct()
+            reg_set = base.subset(np.arange(len(X_train))).construct()
+            reg_set.set_label(np.asarray(y_reg_train))
+            
+            classes, y_fit = np.unique(y_cls_train[cls_idx], return_inverse=True)
+            cls_set = base.subset(cls_idx).construct()
+            cls_set.set_label(y_fit)
+            cls_set.set_weight(balanced_weights(y_fit))
+        
+        num_threads = max(1, (os.cpu_count() or 1) // 2)
+        
+        def fit(model, dataset, **kwargs):
+            start = time.perf_counter()
+            model.fit_dataset(dataset, num_threads=num_threads, **kwargs)
+            return time.perf_counter() - start
+        
+        print(f"회귀/분류 공동 학습 (공유 Dataset, 모델당 스레드 {num_threads}개)...")
+        with timer.span('fit_joint'):
+            # LightGBM 학습은 GIL을 해제하므로 스레드로 동시 실행
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                reg_future = pool.submit(fit, self.regressor, reg_set)
+                cls_future = pool.submit(fit, self.classifier, cls_set, classes=classes)
+                timer.record('fit_regressor', reg_future.result())
+                timer.record('fit_classifier', cls_future.result())
+        
+        if cal_idx is not None:
+            print(f"확률 보정 수행 ({self.calibration})...")
+            with timer.span('calibration'):
+                self.calibrated_classifier = prefit_calibrator(self.classifier).fit(
+                    X_train.iloc[cal_idx], y_cls_train[cal_idx]
+                )
+    
+    def train_incremental(self, data_path, chunk_size=100_000, test_size=0.2, bin_sample_size=200_000,
+                          max_calibration_rows=500_000):
+        """
+        점진 학습 (메모리보다 큰 데이터셋, LightGBM 전용)
+        - 정제된 데이터셋(validate_data_quality_chunked 결과)을 청크로 스트리밍, 전체를 메모리에 올리지 않음
+        - 행 분할: 행 id(데이터셋 내 위치) 해시로 test / 보정 / 학습 구간 결정 (전체 셔플 없음)
+          해시가 라벨과 무관하므로 클래스별 test 비율도 기대값이 test_size (층화 분할과 같은 효과)
+          보정 구간은 train()의 holdout과 같은 비율이되 최대 max_calibration_rows행
+        - 1차 패스: 스케일러 partial_fit, 클래스 분포 집계, binning 표본 추출, 보정 구간 수집
+        - binning: 학습 행 표본(bin_sample_size개)으로만 bin 경계 계산, 모든 청크 Dataset이 reference로 공유
+        - 2차 패스: 청크마다 init_model/keep_training_booster로 이어서 부스팅 (전체 라운드 수를 청크 수로 분배)
+        - 3차 패스: test 구간만 예측하여 평가
+        메모리: 청크 1개 + binning 표본 + 보정 구간 특성 + test 예측값
+        
+        Args:
+            data_path (str): 정제된 데이터셋 경로 (Parquet/.npcols/CSV)
+            chunk_size (int): 청크당 행 수
+            test_size (float): test 구간 비율
+            bin_sample_size (int): bin 경계 계산에 사용할 최대 학습 행 수
+            max_calibration_rows (int): 보정 구간 최대 행 수 (calibrate_probs=True일 때 학습에서 제외)
+        
+        Returns:
+            dict: train()과 같은 형식의 평가 결과
+        """
+        import lightgbm as lgb
+        
+        if not self.use_lightgbm:
+            raise ValueError("점진 학습은 LightGBM만 지원")
+        if self.calibrate_probs and self.calibration != 'holdout':
+            raise ValueError("점진 학습은 calibration='holdout' (또는 보정 없음)만 지원")
+        if self.tune_hyperparams:
+            print("점진 학습에서는 하이퍼파라미터 탐색을 건너뜀 (기본 파라미터 사용)")
+        
+        print(f"\n=== 소비패턴 모델 점진 학습 시작 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ===")
+        timer = StageTimer('train', registry=MetricsRegistry())
+        
+        train_start = test_size
+        if self.calibrate_probs:
+            # 보정 구간 폭은 전체 행 수로 결정 (라벨 컬럼 1개만 읽어 행 수 계산)
+            n_total = sum(len(chunk) for chunk in
+                          iter_dataset_chunks(data_path, columns=LABEL_COLUMNS[1:], chunk_size=chunk_size))
+            train_start += min(self.calibration_size * (1 - test_size), max_calibration_rows / max(n_total, 1))
+        
+        def chunks():
+            """청크별 (특성, 회귀 타깃, 분류 라벨, 분할 해시값, 행 id)"""
+            for chunk in iter_dataset_chunks(data_path, columns=TRAINING_COLUMNS, chunk_size=chunk_size):
+                X, y_reg, y_cls = self._features_and_targets(chunk)
+                row_ids = chunk.index.to_numpy()
+                yield X, y_reg.to_numpy(), y_cls.to_numpy(), row_hash(row_ids, SPLIT_SALT), row_ids
+        
+        # 1차 패스: 통계/표본 수집
+        self.scaler = StandardScaler()
+        class_counts = {}
+        n_rows = n_train = n_chunks = 0
+        sample_X, sample_keys = None, np.empty(0)
+        cal_X, cal_y = [], []
+        with timer.span('scan'):
+            for X, y_reg, y_cls, u, row_ids in chunks():
+                n_rows += len(X)
+                n_chunks += 1
+                train = u >= train_start
+                if self.calibrate_probs:
+                    cal = (u >= test_size) & ~train
+                    cal_X.append(X[cal])
+                    cal_y.append(y_cls[cal])
+                if not train.any():
+                    continue
+                
+                X_train = X[train]
+                n_train += len(X_train)
+                self.scaler.partial_fit(X_train)
+                for label, count in zip(*np.unique(y_cls[train], return_counts=True)):
+                    class_counts[label] = class_counts.get(label, 0) + int(count)
+                
+                # binning 표본: 해시값이 가장 작은 학습 행 bin_sample_size개 (균등 무작위 표본)
+                sample_X = X_train if sample_X is None else pd.concat([sample_X, X_train])
+                sample_keys = np.concatenate([sample_keys, row_hash(row_ids[train], BIN_SAMPLE_SALT)])
+                if len(sample_keys) > bin_sample_size:
+                    keep = np.argpartition(sample_keys, bin_sample_size)[:bin_sample_size]
+                    sample_X, sample_keys = sample_X.iloc[keep], sample_keys[keep]
+        if n_train == 0:
+            raise ValueError(f"학습 구간에 해당하는 행이 없습니다: {data_path}")
+        
+        with timer.span('binning'):
+            reference = lgb.Dataset(sample_X.to_numpy(dtype=np.float64), params=JOINT_DATASET_PARAMS).construct()
+        n_sample = len(sample_X)
+        del sample_X, sample_keys
+        
+        self.regressor, self.classifier = self._get_base_models(native=True)
+        if not isinstance(self.regressor, BoosterRegressor):
+            raise ValueError("점진 학습은 LightGBM이 설치되어 있어야 합니다")
+        
+        # class_weight='balanced'와 같은 가중치 (청크가 아닌 전체 학습 구간 분포 기준)
+        classes = np.array(sorted(class_counts))
+        class_weight = n_train / (len(classes) * np.array([class_counts[c] for c in classes]))
+        self.classifier.classes_ = classes
+        reg_rounds = max(1, math.ceil(self.regressor.n_estimators / n_chunks))
+        clf_rounds = max(1, math.ceil(self.classifier.n_estimators / n_chunks))
+        print(f"점진 학습: 학습 {n_train}행, 청크 {n_chunks}개 x 라운드 {reg_rounds}(회귀)/{clf_rounds}(분류), "
+              f"binning 표본 {n_sample}행")
+        
+        # 2차 패스: 청크마다 이어서 부스팅
+        for X, y_reg, y_cls, u, _ in chunks():
+            train = u >= train_start
+            if not train.any():
+                continue
+            X_train = X[train].to_numpy(dtype=np.float64)
+            with timer.span('fit_regressor'):
+                reg_set = lgb.Dataset(X_train, label=y_reg[train], reference=reference, params=JOINT_DATASET_PARAMS)
+                self.regressor.boost_dataset(reg_set, reg_rounds)
+            with timer.span('fit_classifier'):
+                encoded = np.searchsorted(classes, y_cls[train])
+                cls_set = lgb.Dataset(X_train, label=encoded, weight=class_weight[encoded],
+                                      reference=reference, params=JOINT_DATASET_PARAMS)
+                self.classifier.boost_dataset(cls_set, clf_rounds)
+        self.regressor.booster_.free_dataset()
+        self.classifier.booster_.free_dataset()
+        
+        n_cal = 0
+        if self.calibrate_probs:
+            print(f"확률 보정 수행 ({self.calibration})...")
+            X_cal, y_cal = pd.concat(cal_X), np.concatenate(cal_y)
+            n_cal = len(X_cal)
+            with timer.span('calibration'):
+                self.calibrated_classifier = prefit_calibrator(self.classifier).fit(X_cal, y_cal)
+            del X_cal, y_cal, cal_X, cal_y
+        
+        # 3차 패스: test 구간 평가
+        parts = {key: [] for key in ('y_reg', 'y_cls', 'reg', 'cls', 'proba', 'cal', 'cal_proba')}
+        with timer.span('evaluate'):
+            for X, y_reg, y_cls, u, _ in chunks():
+                test = u < test_size
+                if not test.any():
+                    continue
+                X_test = X[test]
+                parts['y_reg'].append(y_reg[test])
+                parts['y_cls'].append(y_cls[test])
+                parts['reg'].append(self.regressor.predict(X_test))
+                parts['cls'].append(self.classifier.predict(X_test))
+                parts['proba'].append(self.classifier.predict_proba(X_test))
+                if self.calibrated_classifier:
+                    parts['cal'].append(self.calibrated_classifier.predict(X_test))
+                    parts['cal_proba'].append(self.calibrated_classifier.predict_proba(X_test))
+        timer.finish()
+        test = {key: np.concatenate(values) if values else None for key, values in parts.items()}
+        
+        self._set_training_metadata(
+            n_samples=n_rows, train_size=n_train, test_size=len(test['y_reg']),
+            class_distribution=dict(zip(classes, [class_counts[c] for c in classes])), timer=timer,
+            incremental={
+                'chunk_size': chunk_size,
+                'n_chunks': n_chunks,
+                'rounds_per_chunk': {'regression': reg_rounds, 'classification': clf_rounds},
+                'bin_sample_size': n_sample,
+                'calibration_size': n_cal,
+                'split': 'row_hash'
+            }
+        )
+        
+        calibrated = (test['cal'], test['cal_proba']) if self.calibrated_classifier else None
+        return self._evaluation_results(test['y_reg'], test['reg'], test['y_cls'], test['cls'], test['proba'],
+                                        calibrated)
+    
     def predict(self, X):
         """소비패턴 점수 예측 (0-80점)"""
         if self.regressor is None or self.classifier is None:
@@ -415,8 +839,22 @@ class ConsumptionPatternModel:
         
         return results
     
+    def compile_trees(self):
+        """저장 번들과 동일한 구성(보정 분류기 우선)의 평탄화 트리 평가기 생성"""
+        if self.regressor is None or self.classifier is None:
+            raise ValueError("Models not trained yet. Call train() first.")
+        
+        return compile_model({
+            'regressor': self.regressor,
+            'classifier': self.calibrated_classifier if self.calibrated_classifier else self.classifier,
+            'scaler': self.scaler
+        })
+    
     def save_model(self, filepath):
-        """모델 저장"""
+        """
+        모델 저장 - 버전 관리 아티팩트 디렉터리 (model_artifact.py)
+        filepath가 .pkl이면 이전 pickle 번들로 저장
+        """
         model_data = {
             'regressor': self.regressor,
             'classifier': self.calibrated_classifier if self.calibrated_classifier else self.classifier,
@@ -427,19 +865,48 @@ class ConsumptionPatternModel:
             'model_version': 'consumption_pattern_v1.0'
         }
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
+        if filepath.endswith('.pkl'):
+            with open(filepath, 'wb') as f:
+                pickle.dump(model_data, f)
+        else:
+            filepath = save_artifact(model_data, filepath)
         
         print(f"소비패턴 모델 저장 완료: {filepath}")
 
-def train_consumption_pattern_model(df, use_lightgbm=True, test_size=0.2):
-    """소비패턴 모델 훈련 함수"""
+def train_consumption_pattern_model(df, use_lightgbm=True, test_size=0.2, data_quality_report=None,
+                                    tune_hyperparams=False, tune_workers=1, tune_candidates=27,
+                                    calibration=None, joint_training=False, incremental_chunk_size=None):
+    """
+    소비패턴 모델 훈련 함수
+    
+    data_quality_report가 주어지면 df는 validate_data_quality_chunked로 이미 정제된 데이터로 보고
+    품질 검증을 건너뜀
+    
+    tune_hyperparams=True이면 LightGBM 하이퍼파라미터 탐색 후 최적 파라미터로 학습
+    (기본은 빠른 훈련을 위해 고정 파라미터)
+    
+    incremental_chunk_size가 주어지면 df는 정제된 데이터셋 경로로 보고 청크 단위 점진 학습
+    (train_incremental, 하이퍼파라미터 탐색/공동 학습 미적용)
+    
+    calibration을 생략하면 기본 cv, 공동/점진 학습은 holdout (두 방식은 holdout 보정만 지원)
+    """
+    if calibration is None:
+        calibration = 'holdout' if joint_training or incremental_chunk_size else 'cv'
     model = ConsumptionPatternModel(
         use_lightgbm=use_lightgbm,
-        tune_hyperparams=False,  # 빠른 훈련을 위해 비활성화
-        calibrate_probs=True
+        tune_hyperparams=tune_hyperparams,
+        calibrate_probs=True,
+        tune_workers=tune_workers,
+        tune_candidates=tune_candidates,
+        calibration=calibration,
+        joint_training=joint_training
     )
-    results = model.train(df, test_size=test_size)
+    if data_quality_report is not None:
+        model.data_quality_report = data_quality_report
+    if incremental_chunk_size:
+        results = model.train_incremental(df, chunk_size=incremental_chunk_size, test_size=test_size)
+    else:
+        results = model.train(df, test_size=test_size, validated=data_quality_report is not None)
     
     # 결과 출력
     print(f"\n=== 소비패턴 모델 학습 결과 ===")
@@ -457,28 +924,90 @@ def train_consumption_pattern_model(df, use_lightgbm=True, test_size=0.2):
         cal_logloss_str = f"{results['calibrated_classification']['log_loss']:.3f}" if not np.isnan(results['calibrated_classification']['log_loss']) else 'NA'
         print(f"[보정된 분류] ACC={results['calibrated_classification']['accuracy']:.3f} | LogLoss={cal_logloss_str}")
     
+    for task, search in results.get('hyperparameter_search', {}).items():
+        print(f"\n[탐색 {task}] {search['n_trials']}회 시도, {search['elapsed_s']:.1f}초 | "
+              f"{search['metric']}={search['best_score']:.5f} | 라운드={search['best_iteration']}")
+        print(f"최적 파라미터: {search['best_params']}")
+    
+    stage_seconds = results['metadata']['stage_seconds']
+    print("\n[단계별 학습 시간] " + " | ".join(f"{stage}={seconds:.2f}s" for stage, seconds in stage_seconds.items()))
+    
     # 특성 중요도
     model.get_feature_importance('both')
     
     return model, results
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="소비패턴 분석 모델 훈련 스크립트")
+    parser.add_argument('--data', default='data/synth_finance_scored_final',
+                        help='학습 데이터셋 경로 (확장자 생략 시 컬럼형 우선, 없으면 CSV)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='지정 시 2-pass 청크 정제 후 학습 (메모리보다 큰 데이터셋용)')
+    parser.add_argument('--cleaned-path', default='data/synth_finance_cleaned',
+                        help='청크 정제 결과 저장 경로')
+    parser.add_argument('--calibration', choices=CALIBRATION_MODES, default=None,
+                        help='확률 보정 방식 (기본 cv: 전체 데이터 + fold 모델 3개 앙상블, '
+                             'holdout: 분류기 1회 학습, oof: CV 1회 / --joint, --incremental은 holdout)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='청크 정제 후 데이터셋을 청크로 스트리밍하며 점진 학습 (전체를 메모리에 올리지 않음)')
+    parser.add_argument('--joint', action='store_true',
+                        help='회귀/분류기를 공유 Dataset으로 동시 학습 (holdout 보정만 지원)')
+    parser.add_argument('--tune', action='store_true', help='LightGBM 하이퍼파라미터 탐색 후 학습')
+    parser.add_argument('--tune-workers', type=int, default=1, help='탐색 후보를 동시에 학습하는 프로세스 수')
+    parser.add_argument('--tune-candidates', type=int, default=27, help='탐색 첫 단계 후보 수')
+    parser.add_argument('--output', default='Fin_model_v1',
+                        help='모델 저장 경로 (아티팩트 디렉터리, .pkl이면 이전 pickle 번들)')
+    parser.add_argument('--tune-report', default='hyperparameter_search.csv',
+                        help='후보별 소요 시간/검증 점수 리포트 저장 경로')
+    args = parser.parse_args()
+    
     print("소비패턴 분석 모델 훈련 스크립트")
     
     try:
-        # 데이터 로드
-        df = pd.read_csv('data/synth_finance_scored_final.csv')
-        print(f"데이터 로드 완료: {len(df)} 샘플")
+        data_quality_report = None
+        chunk_size = args.chunk_size or (100_000 if args.incremental else None)
+        if chunk_size:
+            # 정제는 청크 단위로 디스크에 기록하고, 학습에는 정제된 특성/라벨 컬럼만 로드
+            cleaner = ConsumptionPatternModel()
+            data_path = cleaner.validate_data_quality_chunked(args.data, args.cleaned_path,
+                                                              chunk_size=chunk_size)
+            data_quality_report = cleaner.data_quality_report
+        else:
+            data_path = args.data
+        
+        if args.incremental:
+            # 정제된 데이터셋을 청크로 스트리밍 (전체 로드 없음)
+            df = data_path
+        else:
+            # 데이터 로드 (컬럼형 데이터셋 우선, 없으면 CSV) - 특성/라벨 컬럼만 읽음
+            df = load_dataset(data_path, columns=TRAINING_COLUMNS)
+            print(f"데이터 로드 완료: {len(df)} 샘플")
         
         # 모델 훈련
         model, results = train_consumption_pattern_model(
             df, 
             use_lightgbm=True, 
-            test_size=0.2
+            test_size=0.2,
+            data_quality_report=data_quality_report,
+            tune_hyperparams=args.tune,
+            tune_workers=args.tune_workers,
+            tune_candidates=args.tune_candidates,
+            calibration=args.calibration,
+            joint_training=args.joint,
+            incremental_chunk_size=chunk_size if args.incremental else None
         )
         
+        if 'hyperparameter_search' in results:
+            from hyperparameter_search import trials_frame
+            report = pd.concat([trials_frame(search).assign(task=task)
+                                for task, search in results['hyperparameter_search'].items()])
+            report.to_csv(args.tune_report, index=False)
+            print(f"탐색 리포트 저장: {args.tune_report}")
+        
         # 모델 저장
-        model.save_model('Fin_model_v1.pkl')
+        model.save_model(args.output)
         
         print("\n소비패턴 모델 훈련 및 저장 완료!")
         
@@ -0,0 +1,260 @@
+"""
+거래 단위 집계 엔진
+
+사용법:
+    python transaction_aggregation.py ingest --input ./data/card_tx_20240601.csv --store ./data/tx_store
+    python transaction_aggregation.py features --store ./data/tx_store --month 2024-06 --output ./data/features_202406
+
+- 카드 거래 원본(사용자, 시각, 금액, 카테고리) → 사용자/월별 모델 입력
+  (total_spending, mean_spending, n_transactions, 7개 소비 카테고리 비율)
+- 더할 수 있는 부분합을 월 파티션(dataset_store)으로 저장 → 새 배치 추가 시 거래 이력 전체를
+  다시 읽지 않고 해당 월만 다시 기록
+- 모든 단계는 컬럼형 데이터의 벡터화 group-by
+"""
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+import pandas as pd
+from utils import SHARED_PYTHON_DIR  # noqa: F401 (feature_pipeline import 경로 등록)
+from dataset_store import save_dataset, load_dataset, resolve_dataset, iter_dataset_chunks
+from feature_pipeline import SPENDING_COLS
+
+USER_ID_COL = "user_id"
+MONTH_COL = "month"
+TX_STORE_PATH = "./data/tx_store"
+
+# 카드사 원 단위 금액 → 모델 입력 단위(만원)
+AMOUNT_UNIT = 10_000
+
+# 원천 카테고리명 → 모델 소비 카테고리 (SPENDING_COLS 이름은 그대로, 나머지는 기타소비)
+CATEGORY_MAP = {
+    '교육': '교육육아', '육아': '교육육아', '학원': '교육육아', '도서': '교육육아',
+    '대중교통': '교통', '택시': '교통', '주유': '교통', '자동차': '교통',
+    '의료': '보건의료', '병원': '보건의료', '약국': '보건의료',
+    '식료품': '식료품음료', '음식': '식료품음료', '외식': '식료품음료', '카페': '식료품음료', '마트': '식료품음료',
+    '문화': '오락문화', '여가': '오락문화', '여행': '오락문화', '오락': '오락문화', '쇼핑': '기타소비',
+    '관리비': '주거', '공과금': '주거', '월세': '주거', '통신': '주거'
+}
+
+AMOUNT_COLS = [f"{col}_amount" for col in SPENDING_COLS]
+PARTIAL_COLS = ["n_transactions", "amount_total"] + AMOUNT_COLS
+
+def normalize_transactions(df, user_col=USER_ID_COL, time_col="timestamp", amount_col="amount",
+                           category_col="category", amount_unit=AMOUNT_UNIT, category_map=None):
+    """
+    거래 원본 컬럼 → (user_id, month, 만원 단위 금액, 카테고리 인덱스)
+
+    Args:
+        df (DataFrame): 거래 원본
+        user_col, time_col, amount_col, category_col (str): 원본 컬럼명
+        amount_unit (float): 원본 금액을 만원으로 바꾸는 나눗수
+        category_map (dict): 원천 카테고리 → SPENDING_COLS 이름 (기본 CATEGORY_MAP)
+
+    Returns:
+        DataFrame: user_id, month (YYYYMM 정수), amount (float), category (SPENDING_COLS 인덱스)
+    """
+    mapping = dict(category_map if category_map is not None else CATEGORY_MAP)
+    mapping.update({col: col for col in SPENDING_COLS})
+    codes = {col: i for i, col in enumerate(SPENDING_COLS)}
+
+    timestamps = pd.to_datetime(df[time_col])
+    # 카테고리 종류는 적으므로 고유값만 매핑 후 코드로 펼침
+    raw = df[category_col].astype("category")
+    lookup = np.array([codes[mapping.get(str(c), '기타소비')] for c in raw.cat.categories], dtype=np.int64)
+    category = np.where(raw.cat.codes.to_numpy() >= 0, lookup[raw.cat.codes.to_numpy()], codes['기타소비'])
+
+    return pd.DataFrame({
+        USER_ID_COL: df[user_col].to_numpy(),
+        MONTH_COL: (timestamps.dt.year * 100 + timestamps.dt.month).to_numpy(np.int64),
+        'amount': pd.to_numeric(df[amount_col]).to_numpy(np.float64) / amount_unit,
+        'category': category
+    })
+
+def aggregate_transactions(tx):
+    """
+    정규화된 거래의 사용자/월별 부분합 (더할 수 있는 합계)
+
+    환불(음수 금액)은 해당 카테고리 금액에서 차감하고 거래 수에는 포함하지 않음
+
+    Args:
+        tx (DataFrame): normalize_transactions 결과
+
+    Returns:
+        DataFrame: user_id, month, n_transactions, amount_total, <카테고리>_amount
+    """
+    keys = [USER_ID_COL, MONTH_COL]
+    by_category = (tx.groupby(keys + ['category'], sort=False)['amount'].sum()
+                   .unstack('category', fill_value=0.0)
+                   .reindex(columns=range(len(SPENDING_COLS)), fill_value=0.0))
+    by_category.columns = AMOUNT_COLS
+
+    partial = tx.assign(n_transactions=(tx['amount'] > 0).astype(np.int64)).groupby(keys, sort=False).agg(
+        n_transactions=('n_transactions', 'sum'), amount_total=('amount', 'sum'))
+    return partial.join(by_category).reset_index()
+
+def merge_partials(*partials):
+    """같은 사용자/월 키의 부분합 병합 (합계는 더할 수 있음)"""
+    present = [p for p in partials if p is not None and len(p)]
+    if not present:
+        return pd.DataFrame(columns=[USER_ID_COL, MONTH_COL] + PARTIAL_COLS)
+    return pd.concat(present, ignore_index=True).groupby([USER_ID_COL, MONTH_COL], sort=False)[PARTIAL_COLS].sum().reset_index()
+
+def partials_to_features(partial):
+    """
+    부분합 → 모델 입력
+
+    Args:
+        partial (DataFrame): aggregate_transactions / merge_partials 결과
+
+    Returns:
+        DataFrame: user_id, month, total_spending, mean_spending, n_transactions, SPENDING_COLS 비율
+    """
+    total = partial['amount_total'].to_numpy(np.float64)
+    n = partial['n_transactions'].to_numpy(np.int64)
+    features = pd.DataFrame({
+        USER_ID_COL: partial[USER_ID_COL].to_numpy(),
+        MONTH_COL: partial[MONTH_COL].to_numpy(),
+        'total_spending': total,
+        'mean_spending': np.divide(total, n, out=np.zeros_like(total), where=n > 0),
+        'n_transactions': n
+    })
+    amounts = partial[AMOUNT_COLS].to_numpy(np.float64)
+    ratios = np.divide(amounts, total[:, None], out=np.zeros_like(amounts), where=total[:, None] > 0)
+    for i, col in enumerate(SPENDING_COLS):
+        features[col] = ratios[:, i]
+    return features
+
+class TransactionStore:
+    """
+    사용자/월별 부분합의 월 파티션 저장소
+
+    구성: 월마다 <path>/<YYYYMM>.(parquet|npcols) + 적재한 배치 ID를 기록한 manifest.json
+    """
+
+    def __init__(self, path=TX_STORE_PATH):
+        self.path = path
+        self.manifest_path = os.path.join(path, "manifest.json")
+
+    def _month_path(self, month):
+        return os.path.join(self.path, str(month))
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'batches': []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        with open(self.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def months(self):
+        """저장된 월 파티션 (YYYYMM 정수, 오름차순)"""
+        if not os.path.isdir(self.path):
+            return []
+        stems = {os.path.splitext(name)[0] for name in os.listdir(self.path)}
+        return sorted(int(stem) for stem in stems if stem.isdigit())
+
+    def load_partials(self, month):
+        """한 달치 부분합 (데이터가 없으면 None)"""
+        if resolve_dataset(self._month_path(month)) is None:
+            return None
+        return load_dataset(self._month_path(month))
+
+    def append(self, transactions, batch_id=None, **normalize_kwargs):
+        """
+        거래 원본 배치 추가
+
+        배치에 포함된 월 파티션만 읽고 다시 기록. 이미 적재한 batch_id는 건너뛰므로
+        같은 배치를 재전송해도 안전함
+
+        Args:
+            transactions (DataFrame | iterable): 거래 원본 또는 그 청크들
+            batch_id (str): 재시도 중복 방지용 배치 ID (선택)
+            **normalize_kwargs: 컬럼명 / 금액 단위 / 카테고리 매핑 (normalize_transactions 참고)
+
+        Returns:
+            dict: batch_id, skipped, rows, months (갱신한 YYYYMM 목록), user_months (갱신한 키 수)
+        """
+        manifest = self._read_manifest()
+        if batch_id is not None and batch_id in manifest['batches']:
+            return {'batch_id': batch_id, 'skipped': True, 'rows': 0, 'months': [], 'user_months': 0}
+
+        chunks = [transactions] if isinstance(transactions, pd.DataFrame) else transactions
+        batch, rows = None, 0
+        for chunk in chunks:
+            rows += len(chunk)
+            batch = merge_partials(batch, aggregate_transactions(normalize_transactions(chunk, **normalize_kwargs)))
+
+        os.makedirs(self.path, exist_ok=True)
+        months = sorted(int(m) for m in batch[MONTH_COL].unique()) if batch is not None else []
+        staged = []
+        for month in months:
+            merged = merge_partials(self.load_partials(month), batch[batch[MONTH_COL] == month])
+            staged.append((save_dataset(merged, self._month_path(month) + "_tmp"), month))
+
+        # 모든 월을 임시 파일로 기록한 뒤 교체 → 중간 실패 시 기존 파티션 유지
+        for tmp_path, month in staged:
+            final_path = self._month_path(month) + os.path.splitext(tmp_path)[1]
+            if os.path.isdir(final_path):
+                shutil.rmtree(final_path)
+            os.replace(tmp_path, final_path)
+
+        if batch_id is not None:
+            manifest['batches'].append(batch_id)
+            self._write_manifest(manifest)
+
+        return {'batch_id': batch_id, 'skipped': False, 'rows': rows, 'months': months,
+                'user_months': 0 if batch is None else len(batch)}
+
+    def features(self, month):
+        """
+        해당 월에 거래가 있는 모든 사용자의 모델 입력
+
+        Args:
+            month (int | str): YYYYMM 또는 "YYYY-MM"
+
+        Returns:
+            DataFrame: 사용자당 1행 (partials_to_features 참고), 데이터가 없으면 빈 DataFrame
+        """
+        partial = self.load_partials(int(str(month).replace("-", "")))
+        if partial is None:
+            return partials_to_features(merge_partials())
+        return partials_to_features(partial)
+
+def main():
+    parser = argparse.ArgumentParser(description="카드 거래 내역 → 사용자/월별 모델 입력 집계")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="거래 내역 배치 추가")
+    ingest.add_argument("--input", required=True, help="거래 내역 CSV / 컬럼형 데이터셋")
+    ingest.add_argument("--store", default=TX_STORE_PATH)
+    ingest.add_argument("--batch-id", help="중복 적재 방지용 배치 ID (기본: 입력 파일명)")
+    ingest.add_argument("--chunk-size", type=int, default=1_000_000)
+    ingest.add_argument("--amount-unit", type=float, default=AMOUNT_UNIT, help="금액 ÷ 이 값 = 만원")
+
+    features = sub.add_parser("features", help="월별 모델 입력 생성")
+    features.add_argument("--store", default=TX_STORE_PATH)
+    features.add_argument("--month", required=True, help="YYYY-MM")
+    features.add_argument("--output", required=True, help="모델 입력 데이터셋 저장 경로")
+    args = parser.parse_args()
+
+    store = TransactionStore(args.store)
+    if args.command == "ingest":
+        batch_id = args.batch_id or os.path.basename(args.input)
+        stats = store.append(iter_dataset_chunks(args.input, chunk_size=args.chunk_size),
+                             batch_id=batch_id, amount_unit=args.amount_unit)
+        if stats['skipped']:
+            print(f"이미 적재된 배치입니다: {batch_id}")
+        else:
+            print(f"거래 {stats['rows']:,}건 적재 → 월 {stats['months']}, 사용자-월 {stats['user_months']:,}건 갱신")
+    else:
+        df = store.features(args.month)
+        print(f"{args.month} 사용자 {len(df):,}명")
+        save_dataset(df, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@
 Utility functions for financial health prediction model
 """
 import warnings
+import codecs
+import hashlib
 import os
 import re
+import sys
 import numpy as np
 import pandas as pd
 
@@ -13,18 +16,54 @@ warnings.filterwarnings("ignore")
 RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
 
+# Runtime modules shared with the Pythonx bridge (feature_pipeline, model_registry)
+SHARED_PYTHON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "priv", "python")
+if SHARED_PYTHON_DIR not in sys.path:
+    sys.path.append(SHARED_PYTHON_DIR)
+
+CSV_ENCODINGS = ["euc-kr", "utf-8"]
+SNIFF_BYTES = 64 * 1024
+
+def sniff_encoding(path, candidates=CSV_ENCODINGS, nbytes=SNIFF_BYTES):
+    """
+    Detect file encoding from a prefix of the file instead of parsing it
+    
+    Args:
+        path (str): Path to text file
+        candidates (list): Encodings to try, in priority order
+        nbytes (int): Number of leading bytes to inspect
+        
+    Returns:
+        str: First candidate that decodes the prefix, or None
+    """
+    with open(path, "rb") as f:
+        head = f.read(nbytes)
+    for enc in candidates:
+        try:
+            # final=False: 접두부 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+            codecs.getincrementaldecoder(enc)().decode(head, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return None
+
 def read_csv_safely(path):
     """
     Read CSV file with encoding detection (EUC-KR first, then UTF-8)
     
+    The encoding is sniffed from the file prefix so the file is normally
+    parsed once; the remaining encodings are only tried if that parse fails.
+    
     Args:
         path (str): Path to CSV file
         
     Returns:
         tuple: (DataFrame, encoding_used)
     """
+    sniffed = sniff_encoding(path)
+    order = [sniffed] + [e for e in CSV_ENCODINGS if e != sniffed] if sniffed else CSV_ENCODINGS
     enc_tried = []
-    for enc in ["euc-kr", "utf-8"]:
+    for enc in order:
         try:
             df = pd.read_csv(path, encoding=enc)
             return df, enc
@@ -33,6 +72,23 @@ def read_csv_safely(path):
             continue
     raise ValueError(f"인코딩 실패: {path} (tried {enc_tried})")
 
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Content hash of a file (used as a cache key for derived tables)
+    
+    Args:
+        path (str): Path to file
+        chunk_size (int): Read block size in bytes
+        
+    Returns:
+        str: Hex digest (BLAKE2b, 128-bit)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
 def clean_text(s):
     """
     Clean text by removing special characters and normalizing spaces
@@ -50,6 +106,25 @@ def clean_text(s):
             .replace("−", "-")      # 음수기호 통일
             .strip())
 
+def clean_text_series(ser):
+    """
+    Vectorized clean_text for a whole column
+    
+    Args:
+        ser (Series): Input column
+        
+    Returns:
+        Series: Cleaned column (missing values are kept as-is)
+    """
+    mask = ser.notna()
+    if not mask.any():
+        return ser
+    cleaned = (ser[mask].astype(str)
+               .str.replace("\u00a0", "", regex=False)  # NBSP
+               .str.replace("−", "-", regex=False)      # 음수기호 통일
+               .str.strip())
+    return ser.where(~mask, cleaned)
+
 def std_whitespace(s):
     """
     Standardize whitespace in string
@@ -26,6 +26,11 @@ config :piggybank,
   ecto_repos: [Piggybank.Repo],
   generators: [timestamp_type: :utc_datetime]
 
+# Pythonx 추론 마이크로 배칭: 최대 max_wait_ms 동안 또는 max_batch건까지 모아 한 번에 예측
+config :piggybank, Piggybank.FinanceAi.BatchDispatcher,
+  max_batch: 16,
+  max_wait_ms: 5
+
 # Configures the endpoint
 config :piggybank, PiggybankWeb.Endpoint,
   url: [host: "localhost"],
@@ -14,6 +14,8 @@ defmodule Piggybank.Application do
       {Phoenix.PubSub, name: Piggybank.PubSub},
       # Start the Finch HTTP client for sending emails
       {Finch, name: Piggybank.Finch},
+      # Pythonx 추론 호출 마이크로 배칭
+      Piggybank.FinanceAi.BatchDispatcher,
       # Start a worker by calling: Piggybank.Worker.start_link(arg)
       # {Piggybank.Worker, arg},
       # Start to serve requests, typically the last entry
@@ -0,0 +1,164 @@
+defmodule Piggybank.FinanceAi.BatchDispatcher do
+  @moduledoc """
+  Pythonx 추론 호출 마이크로 배칭
+
+  Pythonx 호출은 GIL을 잡으므로 요청마다 따로 호출해도 결국 직렬화된다.
+  동시에 들어온 예측 요청을 최대 `max_wait_ms` 동안 또는 `max_batch`건까지 모아
+  `model_registry.predict_batch` 한 번(특성 행렬 1개)으로 처리하고 결과를 각 호출자에게 돌려준다.
+
+  시작 시 `piggy_bridge` 모듈을 1회 import하고 모델을 미리 로드한다. 이후 배치마다
+  `score_batch` 함수 객체에 특성 목록만 넘겨 호출하므로 요청 경로에서 코드 문자열을
+  만들거나 import를 반복하지 않는다.
+
+  설정:
+
+      config :piggybank, Piggybank.FinanceAi.BatchDispatcher,
+        max_batch: 16,
+        max_wait_ms: 5
+
+  배치마다 `[:piggybank, :finance_ai, :batch, :stop]` 텔레메트리 이벤트를 발행한다.
+  측정값은 Pythonx 호출 소요 시간(`:duration`, native 단위), 배치 크기(`:batch_size`),
+  Python 측 단계별 소요 시간(`:python_*`, 밀리초)이다.
+  """
+  use GenServer
+
+  require Logger
+
+  # 시작 시 1회: import 경로 설정, 진입 모듈 import, 모델 로드
+  @bootstrap_code """
+  import sys
+
+  if python_dir not in sys.path:
+      sys.path.insert(0, python_dir)
+
+  import piggy_bridge
+
+  piggy_bridge.warmup()
+  score_batch = piggy_bridge.score_batch
+  """
+
+  # 배치마다: 상주 함수 객체 호출
+  @call_code "score_batch(features_list)"
+
+  # model_registry.predict_batch가 돌려주는 timings_ms 키 → 텔레메트리 측정값 이름
+  @python_stages %{
+    "load" => :python_load,
+    "cache" => :python_cache,
+    "features" => :python_features,
+    "model" => :python_model,
+    "total" => :python_total
+  }
+
+  # 시작 시 초기화에 실패했다면 첫 배치가 모델 로드(수 초)를 포함하므로 여유 있게
+  @call_timeout 15_000
+
+  def start_link(opts \\ []) do
+    GenServer.start_link(__MODULE__, opts, name: Keyword.get(opts, :name, __MODULE__))
+  end
+
+  @doc """
+  특성 맵 1건을 배치에 합류시켜 예측하고 `{:ok, result}` 또는 `{:error, reason}`을 반환한다.
+  """
+  def predict(features, server \\ __MODULE__) do
+    GenServer.call(server, {:predict, features}, @call_timeout)
+  end
+
+  @impl true
+  def init(opts) do
+    config = Keyword.merge(Application.get_env(:piggybank, __MODULE__, []), opts)
+
+    state = %{
+      max_batch: Keyword.get(config, :max_batch, 16),
+      max_wait_ms: Keyword.get(config, :max_wait_ms, 5),
+      bridge: nil,
+      pending: [],
+      count: 0,
+      timer: nil
+    }
+
+    {:ok, state, {:continue, :bootstrap}}
+  end
+
+  @impl true
+  def handle_continue(:bootstrap, state), do: {:noreply, bootstrap(state)}
+
+  @impl true
+  def handle_call({:predict, features}, from, state) do
+    state = %{state | pending: [{from, features} | state.pending], count: state.count + 1}
+
+    cond do
+      state.count >= state.max_batch ->
+        {:noreply, flush(state)}
+
+      state.timer == nil ->
+        token = make_ref()
+        Process.send_after(self(), {:flush, token}, state.max_wait_ms)
+        {:noreply, %{state | timer: token}}
+
+      true ->
+        {:noreply, state}
+    end
+  end
+
+  @impl true
+  def handle_info({:flush, token}, %{timer: token} = state), do: {:noreply, flush(state)}
+
+  # 배치가 가득 차서 이미 처리된 뒤 도착한 타이머
+  def handle_info({:flush, _stale}, state), do: {:noreply, state}
+
+  defp flush(%{pending: []} = state), do: %{state | timer: nil}
+
+  defp flush(state) do
+    state = bootstrap(state)
+    {callers, features} = state.pending |> Enum.reverse() |> Enum.unzip()
+
+    start = System.monotonic_time()
+    {replies, timings} = run_batch(state.bridge, features)
+    emit_batch_telemetry(System.monotonic_time() - start, length(features), timings)
+
+    callers
+    |> Enum.zip(replies)
+    |> Enum.each(fn {from, reply} -> GenServer.reply(from, reply) end)
+
+    %{state | pending: [], count: 0, timer: nil}
+  end
+
+  # Python 환경/모델을 쓸 수 없으면 앱 기동은 계속하고 다음 배치에서 다시 시도
+  defp bootstrap(%{bridge: nil} = state) do
+    {_result, globals} = Pythonx.eval(@bootstrap_code, %{"python_dir" => python_dir()})
+    %{state | bridge: Map.take(globals, ["score_batch"])}
+  rescue
+    error ->
+      Logger.warning("piggy_bridge 초기화 실패: #{Exception.message(error)}")
+      state
+  end
+
+  defp bootstrap(state), do: state
+
+  defp run_batch(nil, features),
+    do: {List.duplicate({:error, :bridge_unavailable}, length(features)), %{}}
+
+  defp run_batch(bridge, features) do
+    {result_obj, _globals} = Pythonx.eval(@call_code, Map.put(bridge, "features_list", features))
+
+    %{"results" => results, "timings_ms" => timings} = Pythonx.decode(result_obj)
+
+    {Enum.map(results, &{:ok, &1}), timings}
+  rescue
+    error -> {List.duplicate({:error, error}, length(features)), %{}}
+  end
+
+  defp emit_batch_telemetry(duration, batch_size, timings) do
+    measurements =
+      for {stage, key} <- @python_stages,
+          is_number(timings[stage]),
+          into: %{duration: duration, batch_size: batch_size},
+          do: {key, timings[stage]}
+
+    :telemetry.execute([:piggybank, :finance_ai, :batch, :stop], measurements, %{})
+  end
+
+  defp python_dir do
+    Path.join(Application.app_dir(:piggybank, "priv"), "python")
+  end
+end
@@ -74,6 +74,48 @@ defmodule PiggybankWeb.Telemetry do
           "The time the connection spent waiting before being checked out for the query"
       ),
 
+      # Finance AI Metrics (Pythonx 예측 호출)
+      summary("piggybank.finance_ai.predict.stop.duration",
+        tags: [:cache],
+        unit: {:native, :millisecond},
+        description: "The time a caller waited for its prediction, including batching"
+      ),
+      counter("piggybank.finance_ai.predict.stop.duration",
+        tags: [:cache],
+        description: "Predictions by result cache hit/miss"
+      ),
+      summary("piggybank.finance_ai.batch.stop.duration",
+        unit: {:native, :millisecond},
+        description: "The time spent in one batched Pythonx call"
+      ),
+      summary("piggybank.finance_ai.batch.stop.batch_size",
+        description: "The number of predictions per batched Pythonx call"
+      ),
+      distribution("piggybank.finance_ai.batch.stop.batch_size",
+        reporter_options: [buckets: [1, 2, 4, 8, 16, 32]],
+        description: "Batch size distribution"
+      ),
+      summary("piggybank.finance_ai.batch.stop.python_load",
+        unit: :millisecond,
+        description: "The time spent resolving the resident model bundle"
+      ),
+      summary("piggybank.finance_ai.batch.stop.python_cache",
+        unit: :millisecond,
+        description: "The time spent on result cache lookups"
+      ),
+      summary("piggybank.finance_ai.batch.stop.python_features",
+        unit: :millisecond,
+        description: "The time spent building the stacked feature matrix"
+      ),
+      summary("piggybank.finance_ai.batch.stop.python_model",
+        unit: :millisecond,
+        description: "The time spent in model inference"
+      ),
+      summary("piggybank.finance_ai.batch.stop.python_total",
+        unit: :millisecond,
+        description: "The total time spent inside model_registry.predict_batch"
+      ),
+
       # VM Metrics
       summary("vm.memory.total", unit: {:byte, :kilobyte}),
       summary("vm.total_run_queue_lengths.total"),
@@ -0,0 +1,107 @@
+"""
+LightGBM Booster를 sklearn 추정기 인터페이스로 감싼 모델 (학습 공유 Dataset용)
+- fit_dataset(): 미리 binning한 lgb.Dataset으로 학습 (회귀/분류가 같은 binning을 재사용)
+- fit(): 일반 sklearn 추정기처럼 행렬로 학습 (CalibratedClassifierCV 등이 복제 후 재학습할 때)
+- predict / predict_proba / feature_importances_ / booster_ 는 LGBMRegressor, LGBMClassifier와 동일하게 동작
+  → 서빙(Flask/Pythonx), 확률 보정, tree_ensemble 평탄화가 그대로 사용
+모델 번들 pickle이 이 모듈의 클래스를 참조하므로 서빙 import 경로(priv/python)에 위치
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, RegressorMixin
+
+class _BoosterModel(BaseEstimator):
+
+    def __init__(self, params=None, n_estimators=100, class_weight=None):
+        self.params = params
+        self.n_estimators = n_estimators
+        self.class_weight = class_weight
+
+    def _objective_params(self):
+        raise NotImplementedError
+
+    def fit_dataset(self, dataset, num_threads=None):
+        """
+        미리 생성한 lgb.Dataset으로 학습 (라벨/가중치는 Dataset에 설정되어 있어야 함)
+
+        Args:
+            dataset (lgb.Dataset): 학습 데이터 (분류는 0..k-1로 인코딩된 라벨)
+            num_threads (int): 이 모델 학습에 사용할 스레드 수 (동시 학습 시 코어 분할)
+        """
+        self.__dict__.pop('booster_', None)
+        self.boost_dataset(dataset, self.n_estimators, num_threads=num_threads)
+        self.booster_ = self.booster_.free_dataset()
+        return self
+
+    def boost_dataset(self, dataset, num_boost_round, num_threads=None):
+        """
+        기존 booster_에 이어서 부스팅 (없으면 새로 학습) - 청크 단위 점진 학습용
+
+        Dataset은 아직 construct되지 않은 상태여야 함 (기존 모델 예측값을 init_score로 설정)
+        keep_training_booster=True로 모델 문자열 직렬화 없이 다음 청크에서 이어서 학습
+        """
+        import lightgbm as lgb
+        params = dict(self.params or {}, **self._objective_params())
+        if num_threads is not None:
+            params['num_threads'] = num_threads
+        self.booster_ = lgb.train(params, dataset, num_boost_round=num_boost_round,
+                                  init_model=getattr(self, 'booster_', None), keep_training_booster=True)
+        self.n_features_in_ = self.booster_.num_feature()
+        return self
+
+    @property
+    def feature_importances_(self):
+        """분할 횟수 기준 중요도 (LGBMModel 기본 importance_type='split'과 동일)"""
+        return self.booster_.feature_importance(importance_type='split')
+
+    def _raw_predict(self, X):
+        return self.booster_.predict(np.asarray(X, dtype=np.float64))
+
+class BoosterRegressor(RegressorMixin, _BoosterModel):
+    """LGBMRegressor 대응"""
+
+    def _objective_params(self):
+        return {'objective': 'regression'}
+
+    def fit(self, X, y, sample_weight=None):
+        import lightgbm as lgb
+        dataset = lgb.Dataset(np.asarray(X, dtype=np.float64), label=np.asarray(y), weight=sample_weight)
+        return self.fit_dataset(dataset)
+
+    def predict(self, X):
+        return self._raw_predict(X)
+
+class BoosterClassifier(ClassifierMixin, _BoosterModel):
+    """LGBMClassifier 대응 (class_weight='balanced' 지원)"""
+
+    def _objective_params(self):
+        if len(self.classes_) == 2:
+            return {'objective': 'binary'}
+        return {'objective': 'multiclass', 'num_class': len(self.classes_)}
+
+    def fit_dataset(self, dataset, num_threads=None, classes=None):
+        """classes: 인코딩 전 원래 클래스 값 (Dataset 라벨 i → classes[i])"""
+        if classes is not None:
+            self.classes_ = np.asarray(classes)
+        return super().fit_dataset(dataset, num_threads=num_threads)
+
+    def fit(self, X, y, sample_weight=None):
+        import lightgbm as lgb
+        self.classes_, encoded = np.unique(np.asarray(y), return_inverse=True)
+        if sample_weight is None and self.class_weight == 'balanced':
+            sample_weight = balanced_weights(encoded)
+        dataset = lgb.Dataset(np.asarray(X, dtype=np.float64), label=encoded, weight=sample_weight)
+        return self.fit_dataset(dataset)
+
+    def predict_proba(self, X):
+        raw = self._raw_predict(X)
+        if raw.ndim == 1:
+            return np.column_stack([1.0 - raw, raw])
+        return raw
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def balanced_weights(y):
+    """class_weight='balanced'와 같은 표본 가중치 (n_samples / (n_classes * 클래스별 개수))"""
+    classes, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    return (len(y) / (len(classes) * counts))[inverse]
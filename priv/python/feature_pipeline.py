@@ -0,0 +1,114 @@
+"""
+소비패턴 모델 특성 공학 (학습 / Flask 서빙 / Pythonx 브릿지 공용)
+- derive_features: 기본 특성 행렬 → 파생 특성 행렬 (유일한 계산 커널)
+- build_feature_matrix: dict 레코드용 NumPy 경로 (단일 행/소규모 배치)
+- engineer_features_frame: DataFrame용 벡터화 경로 (학습)
+두 경로가 같은 커널을 사용하므로 학습/서빙 특성이 비트 단위로 일치
+"""
+import numpy as np
+
+BASE_FEATURES = ['total_spending', 'mean_spending', 'n_transactions',
+                 '교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
+
+SPENDING_COLS = ['교육육아', '교통', '기타소비', '보건의료', '식료품음료', '오락문화', '주거']
+
+DERIVED_FEATURES = ['essential_spending_ratio', 'discretionary_spending_ratio',
+                    'investment_spending_ratio', 'transport_spending_ratio',
+                    'avg_transaction_size', 'transaction_frequency_score',
+                    'spending_balance_score', 'rational_spending_score',
+                    'spending_low', 'spending_mid', 'spending_high']
+
+# 0/1 더미 특성 (DataFrame 경로에서 int로 유지)
+FLAG_FEATURES = ['transaction_frequency_score', 'rational_spending_score',
+                 'spending_low', 'spending_mid', 'spending_high']
+
+FEATURE_NAMES = BASE_FEATURES + DERIVED_FEATURES
+
+def derive_features(base):
+    """
+    기본 특성 행렬로부터 파생 특성 계산
+
+    Args:
+        base (ndarray): (n, 10) 행렬, 열 순서는 BASE_FEATURES
+
+    Returns:
+        ndarray: (n, 11) 행렬, 열 순서는 DERIVED_FEATURES
+    """
+    base = np.asarray(base, dtype=np.float64)
+    total_spending = base[:, 0]
+    n_transactions = base[:, 2]
+    spending = base[:, 3:10]
+    education, transport, other, medical, food, entertainment, housing = spending.T
+
+    # 1. 소비 구조 특성
+    essential = housing + food + medical
+    discretionary = entertainment + other
+    investment = education
+
+    # 2. 거래 패턴 특성
+    avg_transaction_size = total_spending / (n_transactions + 1)
+    frequency = (n_transactions >= 50) & (n_transactions <= 300)
+
+    # 3. 소비 균형도 (표본 표준편차 기반)
+    balance = 1 / (1 + spending.std(axis=1, ddof=1))
+
+    # 4. 합리적 소비 패턴 점수
+    rational = (essential >= 0.4) & (essential <= 0.7) & (discretionary <= 0.3) & (investment >= 0.05)
+
+    # 5. 지출 크기별 더미 변수
+    spending_low = total_spending < 200
+    spending_mid = (total_spending >= 200) & (total_spending < 400)
+    spending_high = total_spending >= 400
+
+    return np.column_stack([
+        essential, discretionary, investment, transport,
+        avg_transaction_size, frequency, balance, rational,
+        spending_low, spending_mid, spending_high
+    ]).astype(np.float64)
+
+def _select(full, feature_names):
+    """FEATURE_NAMES 순서의 행렬에서 모델의 feature_names 순서로 열 선택"""
+    if feature_names is None or list(feature_names) == FEATURE_NAMES:
+        return full
+    index = {name: i for i, name in enumerate(FEATURE_NAMES)}
+    try:
+        return full[:, [index[name] for name in feature_names]]
+    except KeyError as e:
+        raise ValueError(f"지원하지 않는 특성: {e}") from None
+
+def build_feature_matrix(records, feature_names=None):
+    """
+    NumPy 경로: dict 레코드로부터 모델 입력 행렬 생성
+
+    Args:
+        records (dict | list): BASE_FEATURES 키를 가진 레코드 (또는 목록)
+        feature_names (list): 모델 pickle의 feature_names (None이면 FEATURE_NAMES)
+
+    Returns:
+        ndarray: (n, len(feature_names)) 행렬
+    """
+    if isinstance(records, dict):
+        records = [records]
+    base = np.array([[r[name] for name in BASE_FEATURES] for r in records], dtype=np.float64)
+    full = np.hstack([base, derive_features(base)])
+    return _select(full, feature_names)
+
+def engineer_features_frame(df):
+    """
+    DataFrame 경로: 기본 특성 컬럼을 가진 DataFrame에 파생 특성 컬럼 추가
+
+    Args:
+        df (DataFrame): BASE_FEATURES 컬럼을 포함한 데이터
+
+    Returns:
+        DataFrame: 파생 특성이 추가된 사본
+    """
+    df_eng = df.copy()
+    derived = derive_features(df_eng[BASE_FEATURES].to_numpy(dtype=np.float64))
+    for i, name in enumerate(DERIVED_FEATURES):
+        df_eng[name] = derived[:, i].astype(int) if name in FLAG_FEATURES else derived[:, i]
+    return df_eng
+
+def frame_to_matrix(df_eng, feature_names=None):
+    """engineer_features_frame 결과 → 모델 입력 행렬"""
+    return df_eng[list(feature_names or FEATURE_NAMES)].to_numpy(dtype=np.float64)
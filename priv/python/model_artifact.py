@@ -0,0 +1,350 @@
+"""
+버전 관리 모델 아티팩트 (pickle 번들 대체)
+- 디렉터리 1개 = 모델 1개
+    manifest.json        형식 버전, 모델 버전, 특성 이름, 학습 메타데이터, 배열 목록(dtype/shape)
+    scaler/*.npy         StandardScaler 평균/표준편차
+    regressor/*.npy      평탄화 트리 배열 (tree_ensemble.FlatForest)
+    classifier_<i>/*.npy 분류 모델(보정 fold별) 평탄화 트리 배열 + isotonic 보정 구간
+    *.lgb.txt            LightGBM 모델이면 네이티브 텍스트 부스터
+- 로드 시 매니페스트 스키마 검사 후 배열은 mmap으로 연결 (필요한 페이지만 읽음)
+- sklearn/LightGBM 클래스 구조에 의존하지 않으므로 라이브러리 업그레이드 후에도 로드 가능
+  (LightGBM이 설치되어 있으면 대량 배치용으로 네이티브 부스터 사용)
+"""
+import os
+import json
+import pickle
+import shutil
+from datetime import datetime
+import numpy as np
+from feature_pipeline import FEATURE_NAMES
+from tree_ensemble import (CompiledClassifier, CompiledModel, FlatForest, ForestRegressor, NativeForest,
+                           compile_model, _calibrated_base)
+
+FORMAT = 'piggy-model'
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# FlatForest 배열 필드 (저장 순서)
+FOREST_ARRAYS = ('feature', 'threshold', 'left', 'right', 'default_left', 'missing_type', 'value', 'roots')
+FOREST_ATTRS = ('max_depth', 'aggregate', 'transform', 'sigmoid', 'float32_input')
+
+class ArtifactSchemaError(ValueError):
+    """매니페스트/배열이 이 코드가 읽을 수 있는 형식과 다름"""
+
+class ArrayScaler:
+    """저장된 평균/표준편차로 StandardScaler.transform과 같은 연산 수행"""
+
+    def __init__(self, mean=None, scale=None):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.with_mean = mean is not None
+        self.with_std = scale is not None
+
+    def transform(self, X):
+        X = np.array(X, dtype=np.float64)
+        if self.mean_ is not None:
+            X -= self.mean_
+        if self.scale_ is not None:
+            X /= self.scale_
+        return X
+
+def is_artifact(path):
+    """모델 아티팩트 디렉터리 여부"""
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+def resolve_model_path(path):
+    """
+    모델 경로 해석: <stem> 아티팩트 디렉터리 우선, 없으면 <stem>.pkl
+
+    path는 확장자 없는 이름/.pkl 경로 모두 가능 (학습 기본 출력이 디렉터리여도 기존 서빙 설정 그대로 사용)
+    둘 다 없으면 path 그대로 반환 (로드 시 FileNotFoundError)
+    """
+    stem = path[:-len(".pkl")] if path.endswith(".pkl") else path
+    if os.path.isdir(stem):
+        return stem
+    pickle_path = stem + ".pkl"
+    return pickle_path if os.path.isfile(pickle_path) else path
+
+def _jsonable(value):
+    """학습 메타데이터 → JSON 직렬화 가능한 값 (NumPy 스칼라/배열, 비문자열 키 변환)"""
+    if isinstance(value, dict):
+        return {str(_jsonable(k)): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def _native_booster(model):
+    """LightGBM 모델이면 Booster 반환 (sklearn 래퍼, booster_models 래퍼, Booster 직접)"""
+    booster = getattr(model, 'booster_', model)
+    return booster if type(booster).__name__ == 'Booster' else None
+
+def _library_versions():
+    """저장 시점 라이브러리 버전 (참고용, 로드 시 검사하지 않음)"""
+    versions = {'numpy': np.__version__}
+    for name in ('sklearn', 'lightgbm'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            pass
+    return versions
+
+class _Writer:
+    """아티팩트 디렉터리에 배열/텍스트 파일을 쓰고 매니페스트용 목록 기록"""
+
+    def __init__(self, root):
+        self.root = root
+        self.arrays = {}
+
+    def array(self, name, values):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        values = np.ascontiguousarray(values)
+        np.save(path, values)
+        self.arrays[name] = {'dtype': values.dtype.str, 'shape': list(values.shape)}
+        return name
+
+    def text(self, name, text):
+        with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+        return name
+
+    def forest(self, prefix, forest):
+        spec = {attr: getattr(forest, attr) for attr in FOREST_ATTRS}
+        spec['arrays'] = {field: self.array(f"{prefix}/{field}.npy", getattr(forest, field))
+                          for field in FOREST_ARRAYS}
+        spec['max_feature'] = int(forest.feature.max()) if len(forest.feature) else -1
+        return spec
+
+def save_artifact(model_data, path):
+    """
+    모델 번들(dict) → 아티팩트 디렉터리
+
+    같은 경로의 기존 아티팩트는 새 디렉터리를 다 쓴 뒤 교체 (로드 중인 프로세스는 이전 파일 유지)
+
+    Args:
+        model_data (dict): regressor, classifier, scaler, feature_names를 포함한 모델 번들
+        path (str): 아티팩트 디렉터리 경로
+
+    Returns:
+        str: 아티팩트 경로
+    """
+    compiled = compile_model(model_data)
+    feature_names = list(model_data['feature_names'])
+    path = os.path.abspath(path)
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    writer = _Writer(staging)
+
+    scaler = {
+        'mean': None if compiled.mean is None else writer.array("scaler/mean.npy", compiled.mean),
+        'scale': None if compiled.scale is None else writer.array("scaler/scale.npy", compiled.scale)
+    }
+
+    regressor = {'forest': writer.forest("regressor", compiled.regressor)}
+    booster = _native_booster(model_data['regressor'])
+    if booster is not None:
+        regressor['native'] = writer.text("regressor.lgb.txt", booster.model_to_string())
+
+    # 보정 모델은 fold별 원본 모델, 미보정 모델은 자기 자신
+    classifier_model = model_data['classifier']
+    bases = ([_calibrated_base(c) for c in classifier_model.calibrated_classifiers_]
+             if hasattr(classifier_model, 'calibrated_classifiers_') else [classifier_model])
+    classifier = {'classes': _jsonable(compiled.classifier.classes), 'calibrated': compiled.classifier.calibrators is not None,
+                  'models': []}
+    for i, forest in enumerate(compiled.classifier.forests):
+        entry = {'forest': writer.forest(f"classifier_{i}", forest), 'response': compiled.classifier.responses[i]}
+        booster = _native_booster(bases[i])
+        if booster is not None:
+            entry['native'] = writer.text(f"classifier_{i}.lgb.txt", booster.model_to_string())
+        if compiled.classifier.calibrators is not None:
+            entry['calibrators'] = [
+                {'x': writer.array(f"classifier_{i}/calibrator_{c}_x.npy", x_thr),
+                 'y': writer.array(f"classifier_{i}/calibrator_{c}_y.npy", y_thr),
+                 'x_min': x_min, 'x_max': x_max}
+                for c, (x_thr, y_thr, x_min, x_max) in enumerate(compiled.classifier.calibrators[i])
+            ]
+        classifier['models'].append(entry)
+
+    manifest = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'model_version': model_data.get('model_version', 'v1.0'),
+        'created_at': datetime.now().isoformat(),
+        'feature_names': feature_names,
+        'n_features': len(feature_names),
+        'training_metadata': _jsonable(model_data.get('training_metadata', {})),
+        'data_quality_report': _jsonable(model_data.get('data_quality_report', {})),
+        'libraries': _library_versions(),
+        'scaler': scaler,
+        'regressor': regressor,
+        'classifier': classifier,
+        'arrays': writer.arrays
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 기존 아티팩트를 옆으로 옮긴 뒤 교체 (디렉터리는 os.replace로 덮어쓸 수 없음)
+    retired = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, retired)
+    os.replace(staging, path)
+    shutil.rmtree(retired, ignore_errors=True)
+    return path
+
+def read_manifest(path):
+    """매니페스트 읽기 + 형식/버전 검사"""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise ArtifactSchemaError(f"매니페스트가 없습니다: {manifest_path}")
+    except json.JSONDecodeError as e:
+        raise ArtifactSchemaError(f"매니페스트를 읽을 수 없습니다: {manifest_path} ({e})")
+
+    if manifest.get('format') != FORMAT:
+        raise ArtifactSchemaError(f"모델 아티팩트 형식이 아닙니다: {manifest.get('format')!r}")
+    version = manifest.get('format_version')
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise ArtifactSchemaError(f"지원하지 않는 아티팩트 버전: {version} (지원: {FORMAT_VERSION} 이하)")
+    missing = [key for key in ('feature_names', 'n_features', 'scaler', 'regressor', 'classifier', 'arrays')
+               if key not in manifest]
+    if missing:
+        raise ArtifactSchemaError(f"매니페스트 필수 항목 누락: {missing}")
+    return manifest
+
+def _check_schema(manifest, feature_names):
+    """특성/배열 스키마 검사 (배열 내용은 읽지 않음)"""
+    n_features = manifest['n_features']
+    if len(manifest['feature_names']) != n_features:
+        raise ArtifactSchemaError(f"특성 수 불일치: feature_names {len(manifest['feature_names'])}개, "
+                                  f"n_features {n_features}")
+    unknown = [name for name in manifest['feature_names'] if name not in feature_names]
+    if unknown:
+        raise ArtifactSchemaError(f"특성 파이프라인이 계산하지 않는 특성: {unknown}")
+
+    for name in manifest['scaler'].values():
+        if name is not None and manifest['arrays'][name]['shape'] != [n_features]:
+            raise ArtifactSchemaError(f"스케일러 배열 크기 불일치: {name}")
+    forests = [manifest['regressor']['forest']] + [m['forest'] for m in manifest['classifier']['models']]
+    for forest in forests:
+        if forest['max_feature'] >= n_features:
+            raise ArtifactSchemaError(f"트리가 없는 특성 인덱스를 참조: {forest['max_feature']} >= {n_features}")
+    if not manifest['classifier']['models']:
+        raise ArtifactSchemaError("분류 모델이 없습니다")
+
+def _load_array(path, name, spec, mmap):
+    """배열 로드 + 매니페스트 dtype/shape 검사 (mmap이면 헤더만 읽음)"""
+    try:
+        values = np.load(os.path.join(path, name), mmap_mode='r' if mmap else None, allow_pickle=False)
+    except FileNotFoundError:
+        raise ArtifactSchemaError(f"배열 파일이 없습니다: {name}")
+    if values.dtype.str != spec['dtype'] or list(values.shape) != spec['shape']:
+        raise ArtifactSchemaError(f"배열 스키마 불일치: {name} ({values.dtype.str} {list(values.shape)}, "
+                                  f"매니페스트 {spec['dtype']} {spec['shape']})")
+    return values
+
+def _load_native(path, spec):
+    """네이티브 LightGBM 부스터 (없거나 LightGBM 미설치 시 None → 평탄화 배열 사용)"""
+    name = spec.get('native')
+    if not name:
+        return None
+    try:
+        import lightgbm as lgb
+    except ImportError:
+        return None
+    return NativeForest(lgb.Booster(model_file=os.path.join(path, name)), spec['forest']['transform'])
+
+def load_artifact(path, mmap=True, native=True, feature_names=FEATURE_NAMES):
+    """
+    아티팩트 디렉터리 → 모델 번들(dict, pickle 번들과 같은 키)
+
+    - regressor / classifier / scaler: predict, predict_proba, classes_, transform 제공
+      (네이티브 LightGBM 부스터가 있고 native=True면 부스터, 아니면 평탄화 배열로 평가)
+    - compiled: 평탄화 배열 평가기 (소규모 입력용, compile_model()이 그대로 반환)
+
+    Args:
+        path (str): 아티팩트 디렉터리
+        mmap (bool): 배열을 메모리 매핑으로 연결 (False면 전부 읽어 들임)
+        native (bool): LightGBM 네이티브 부스터 사용 여부
+        feature_names (list): 서빙 특성 파이프라인이 계산할 수 있는 특성 (스키마 검사용)
+
+    Returns:
+        dict: regressor, classifier, scaler, compiled, feature_names, training_metadata,
+              data_quality_report, model_version, artifact_manifest
+    """
+    manifest = read_manifest(path)
+    _check_schema(manifest, feature_names)
+    arrays = manifest['arrays']
+
+    def array(name):
+        if name not in arrays:
+            raise ArtifactSchemaError(f"매니페스트에 없는 배열: {name}")
+        return _load_array(path, name, arrays[name], mmap)
+
+    def forest(spec):
+        return FlatForest(*(array(spec['arrays'][field]) for field in FOREST_ARRAYS),
+                          **{attr: spec[attr] for attr in FOREST_ATTRS})
+
+    scaler_spec = manifest['scaler']
+    mean = None if scaler_spec['mean'] is None else array(scaler_spec['mean'])
+    scale = None if scaler_spec['scale'] is None else array(scaler_spec['scale'])
+
+    spec = manifest['classifier']
+    classes = np.asarray(spec['classes'])
+    flat_forests, native_forests, calibrators, responses = [], [], [], []
+    for model in spec['models']:
+        flat_forests.append(forest(model['forest']))
+        native_forests.append(_load_native(path, model) if native else None)
+        responses.append(model['response'])
+        if spec['calibrated']:
+            calibrators.append([(np.asarray(array(c['x'])), np.asarray(array(c['y'])), c['x_min'], c['x_max'])
+                                for c in model['calibrators']])
+    calibrators = calibrators if spec['calibrated'] else None
+
+    flat_regressor = forest(manifest['regressor']['forest'])
+    native_regressor = _load_native(path, manifest['regressor']) if native else None
+
+    compiled = CompiledModel(flat_regressor, CompiledClassifier(classes, flat_forests, calibrators, responses),
+                             mean=mean, scale=scale)
+    return {
+        'regressor': ForestRegressor(native_regressor or flat_regressor),
+        'classifier': CompiledClassifier(classes, [n or f for n, f in zip(native_forests, flat_forests)],
+                                         calibrators, responses),
+        'scaler': ArrayScaler(mean, scale),
+        'compiled': compiled,
+        'feature_names': list(manifest['feature_names']),
+        'training_metadata': manifest.get('training_metadata', {}),
+        'data_quality_report': manifest.get('data_quality_report', {}),
+        'model_version': manifest.get('model_version', 'v1.0'),
+        'artifact_manifest': manifest
+    }
+
+def _patch_estimators(model):
+    """구버전 sklearn으로 저장된 트리에 누락된 속성 추가 (pickle 번들 전용)"""
+    for estimator in getattr(model, 'estimators_', []):
+        if not hasattr(estimator, 'monotonic_cst'):
+            estimator.monotonic_cst = None
+
+def load_bundle(path, mmap=True):
+    """
+    모델 번들 로드: 아티팩트 디렉터리면 load_artifact, 아니면 pickle (구버전 sklearn 속성 보정 포함)
+    """
+    if os.path.isdir(path):
+        return load_artifact(path, mmap=mmap)
+
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    for key in ('regressor', 'classifier'):
+        if isinstance(model_data, dict) and key in model_data:
+            _patch_estimators(model_data[key])
+    return model_data
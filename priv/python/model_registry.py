@@ -0,0 +1,185 @@
+"""
+Pythonx 브릿지용 모델 레지스트리
+- 모델 버전별 아티팩트(없으면 pickle)를 최초 1회만 로드하여 인터프리터에 상주
+- 요청마다 predict(features)만 호출하여 추론 비용만 발생
+- 같은 특성 조합이 반복되면 결과 캐시에서 바로 반환 (모델 해제 시 해당 버전 캐시도 무효화)
+"""
+import os
+import logging
+import threading
+from feature_pipeline import build_feature_matrix
+from tree_ensemble import BundlePredictor
+from model_artifact import load_bundle, resolve_model_path
+from stage_timing import StageTimer
+from result_cache import ResultCache
+
+# priv/python/model_registry.py → priv/models
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+DEFAULT_VERSION = "Fin_model_v1"
+
+# 입력값이 없을 때 사용하는 기본값 (BAML 추출 누락 대비)
+# 파생 특성은 feature_pipeline이 기본 특성으로부터 계산
+DEFAULT_FEATURES = {
+    'total_spending': 100000.0,
+    'mean_spending': 1.8,
+    'n_transactions': 140,
+    '교육육아': 0.12,
+    '교통': 0.14,
+    '기타소비': 0.15,
+    '보건의료': 0.11,
+    '식료품음료': 0.22,
+    '오락문화': 0.08,
+    '주거': 0.18,
+    'est_income_만원': 380.0
+}
+
+# 웹 앱 구조화 로깅('piggy' 로거)이 설정되어 있으면 같은 JSON 출력으로 기록
+logger = logging.getLogger("piggy.model_registry")
+
+_models = {}
+_lock = threading.Lock()
+_cache = ResultCache.from_env()
+
+def _predictor(model_data, version):
+    """배치 크기와 무관하게 같은 결과를 내는 예측기 (평탄화 실패 시 네이티브 평가기만 사용)"""
+    predictor = BundlePredictor(model_data)
+    if predictor.compile_error is not None:
+        logger.warning("트리 평탄화 실패, 네이티브 평가기로 추론", extra={'fields': {
+            'model_version': version, 'error': str(predictor.compile_error)}})
+    return predictor
+
+def model_path(version=DEFAULT_VERSION):
+    """버전 → 모델 경로 (priv/models/<version> 아티팩트 디렉터리 우선, 없으면 <version>.pkl)"""
+    return resolve_model_path(os.path.join(MODELS_DIR, version) + ".pkl")
+
+def load_model(version=DEFAULT_VERSION):
+    """모델 번들 반환 (최초 호출 시에만 디스크에서 로드)"""
+    model_data = _models.get(version)
+    if model_data is not None:
+        return model_data
+
+    with _lock:
+        model_data = _models.get(version)
+        if model_data is None:
+            model_data = load_bundle(model_path(version))
+            model_data['predictor'] = _predictor(model_data, version)
+            _models[version] = model_data
+
+    return model_data
+
+def unload_model(version=None):
+    """상주 모델 해제 (version=None이면 전체) - 새 모델 배포 후 재로드용"""
+    with _lock:
+        if version is None:
+            _models.clear()
+        else:
+            _models.pop(version, None)
+    _cache.invalidate(version)
+
+def loaded_versions():
+    """현재 메모리에 상주 중인 모델 버전 목록"""
+    return sorted(_models)
+
+def cache_stats():
+    """결과 캐시 적중/미스 카운터"""
+    return _cache.stats()
+
+def _merge_defaults(features):
+    """누락/None 특성을 기본값으로 채운 행"""
+    row = dict(DEFAULT_FEATURES)
+    row.update({k: v for k, v in (features or {}).items() if v is not None})
+    return row
+
+def _predict_matrix(model_data, X):
+    """특성 행렬 → (점수, 위험 등급, 위험 확률) 배열"""
+    prediction = model_data['predictor'].predict(X)
+    return (prediction['consumption_score'], prediction['risk_classification'],
+            prediction['risk_probabilities'])
+
+def _cached_result(cached):
+    return dict(cached, risk_proba=list(cached['risk_proba']))
+
+def _store_result(cache_key, score, risk_class, risk_proba):
+    """예측 결과 dict 생성 후 캐시에 저장"""
+    result = {
+        'score': float(score),
+        'risk_class': int(risk_class),
+        'risk_proba': risk_proba.tolist()
+    }
+    _cache.put(cache_key, dict(result, risk_proba=tuple(result['risk_proba'])))
+    return result
+
+def predict(features, version=DEFAULT_VERSION):
+    """
+    단일 사용자 특성으로 점수/위험도 예측
+
+    Args:
+        features (dict): 기본 특성명 → 값 (None 또는 누락 시 기본값 사용)
+        version (str): priv/models 아래 모델 아티팩트 디렉터리명 또는 pickle 파일명 (확장자 제외)
+
+    Returns:
+        dict: score, risk_class, risk_proba,
+              timings_ms (단계별 소요 시간), cache_hit (결과 캐시 적중 여부) - Elixir Telemetry 보고용
+    """
+    timer = StageTimer('bridge')
+
+    with timer.span('load'):
+        model_data = load_model(version)
+
+    row = _merge_defaults(features)
+
+    with timer.span('cache'):
+        cache_key = _cache.make_key(version, row)
+        cached = _cache.get(cache_key)
+    if cached is not None:
+        return dict(_cached_result(cached), timings_ms=timer.finish().as_ms(), cache_hit=True)
+
+    with timer.span('features'):
+        X = build_feature_matrix(row, model_data['feature_names'])
+
+    with timer.span('model'):
+        scores, risk_classes, risk_probas = _predict_matrix(model_data, X)
+
+    result = _store_result(cache_key, scores[0], risk_classes[0], risk_probas[0])
+    return dict(result, timings_ms=timer.finish().as_ms(), cache_hit=False)
+
+def predict_batch(features_list, version=DEFAULT_VERSION):
+    """
+    여러 사용자 특성을 특성 행렬 1개로 쌓아 한 번에 예측 (Elixir BatchDispatcher용)
+
+    Args:
+        features_list (list): predict()와 같은 형식의 특성 dict 목록
+        version (str): priv/models 아래 모델 아티팩트 디렉터리명 또는 pickle 파일명 (확장자 제외)
+
+    Returns:
+        dict: results (입력 순서대로 score, risk_class, risk_proba, cache_hit),
+              timings_ms (배치 전체 단계별 소요 시간)
+    """
+    timer = StageTimer('bridge_batch')
+
+    with timer.span('load'):
+        model_data = load_model(version)
+
+    rows = [_merge_defaults(features) for features in features_list]
+    results = [None] * len(rows)
+
+    with timer.span('cache'):
+        cache_keys = [_cache.make_key(version, row) for row in rows]
+        for i, cache_key in enumerate(cache_keys):
+            cached = _cache.get(cache_key)
+            if cached is not None:
+                results[i] = dict(_cached_result(cached), cache_hit=True)
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses:
+        with timer.span('features'):
+            X = build_feature_matrix([rows[i] for i in misses], model_data['feature_names'])
+
+        with timer.span('model'):
+            scores, risk_classes, risk_probas = _predict_matrix(model_data, X)
+
+        for j, i in enumerate(misses):
+            result = _store_result(cache_keys[i], scores[j], risk_classes[j], risk_probas[j])
+            results[i] = dict(result, cache_hit=False)
+
+    return {'results': results, 'timings_ms': timer.finish().as_ms()}
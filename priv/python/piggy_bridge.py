@@ -0,0 +1,20 @@
+"""
+Pythonx 브릿지 진입점
+- Elixir 애플리케이션 시작 시 1회 import + warmup (BatchDispatcher)
+- 이후 요청마다 score / score_batch 함수 객체에 dict만 넘겨 호출 (코드 문자열 생성/재컴파일 없음)
+"""
+from typing import Any, Dict, List
+import model_registry
+
+def warmup(version: str = model_registry.DEFAULT_VERSION) -> List[str]:
+    """모델을 미리 로드하여 첫 요청의 로드 지연 제거 (상주 모델 버전 목록 반환)"""
+    model_registry.load_model(version)
+    return model_registry.loaded_versions()
+
+def score(features: Dict[str, Any]) -> Dict[str, Any]:
+    """단일 사용자 예측: score, risk_class, risk_proba, timings_ms, cache_hit"""
+    return model_registry.predict(features)
+
+def score_batch(features_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """여러 사용자 예측: results (입력 순서), timings_ms"""
+    return model_registry.predict_batch(features_list)
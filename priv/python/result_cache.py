@@ -0,0 +1,107 @@
+"""
+모델 예측 결과 캐시 (Flask 앱 / Pythonx 브릿지 공용)
+- 키: (모델 버전, 반올림한 기본 특성 벡터) → 같은 입력 재제출 시 특성 공학/트리 평가 생략
+- 크기 상한 LRU + TTL 만료, 모델 버전 단위 무효화
+- 적중/미스/퇴출/만료 카운터 (Prometheus text format 출력 지원)
+
+환경 변수:
+    PIGGY_CACHE_SIZE      최대 항목 수 (기본 1024, 0이면 캐시 사용 안 함)
+    PIGGY_CACHE_TTL       항목 유효 시간 초 (기본 600, 0이면 만료 없음)
+    PIGGY_CACHE_DECIMALS  키 생성 시 특성값 반올림 자릿수 (기본 6)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    """스레드 안전 LRU/TTL 캐시"""
+
+    def __init__(self, maxsize=1024, ttl=600.0, decimals=6):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self.decimals = int(decimals)
+        self._entries = OrderedDict()  # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(maxsize=int(os.environ.get('PIGGY_CACHE_SIZE', 1024)),
+                   ttl=float(os.environ.get('PIGGY_CACHE_TTL', 600)),
+                   decimals=int(os.environ.get('PIGGY_CACHE_DECIMALS', 6)))
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def make_key(self, version, features):
+        """
+        정규화된 캐시 키 (특성 순서와 무관, 부동소수 노이즈는 반올림으로 흡수)
+
+        Args:
+            version (str): 모델 버전 (무효화 단위)
+            features (dict): 특성명 → 숫자값
+
+        Returns:
+            tuple: (version, ((특성명, 반올림값), ...))
+        """
+        return (version, tuple((name, round(float(features[name]), self.decimals))
+                               for name in sorted(features)))
+
+    def get(self, key):
+        """캐시된 값 반환 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl > 0 and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else float('inf')
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, version=None):
+        """모델 버전의 항목 삭제 (version=None이면 전체) - 모델 재로드/교체 시 호출"""
+        with self._lock:
+            if version is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == version]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'expirations': self.expirations}
+
+    def render_prometheus(self, prefix='piggy_result_cache'):
+        """카운터/크기를 Prometheus text exposition format으로 출력"""
+        stats = self.stats()
+        lines = []
+        for name in ('hits', 'misses', 'evictions', 'expirations'):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {stats[name]}")
+        lines.append(f"# TYPE {prefix}_size gauge")
+        lines.append(f"{prefix}_size {stats['size']}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,117 @@
+"""
+추론 파이프라인 단계별 타이밍 (Flask 앱 / Pythonx 브릿지 공용)
+- StageTimer.span(name): with 블록 소요 시간을 요청 단위로 기록하고 전역 히스토그램에 누적
+- render_prometheus(): 누적 히스토그램을 Prometheus text exposition format으로 출력
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# 히스토그램 버킷 상한 (초) - 단일 행 추론은 대부분 sub-ms 구간
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRIC_NAME = 'piggy_stage_duration_seconds'
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 의미)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+class MetricsRegistry:
+    """(endpoint, stage)별 히스토그램 저장소 (스레드 안전)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, stage, seconds):
+        key = (endpoint, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """(endpoint, stage) → (버킷별 누적 카운트, sum, count)"""
+        with self._lock:
+            return {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self, metric_name=METRIC_NAME):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = [
+            f"# HELP {metric_name} Prediction pipeline stage latency in seconds.",
+            f"# TYPE {metric_name} histogram"
+        ]
+        for (endpoint, stage), (counts, total, count) in sorted(self.snapshot().items()):
+            labels = f'endpoint="{endpoint}",stage="{stage}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric_name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{metric_name}_sum{{{labels}}} {total:.9g}')
+            lines.append(f'{metric_name}_count{{{labels}}} {count}')
+        return "\n".join(lines) + "\n"
+
+# 프로세스 전역 저장소
+REGISTRY = MetricsRegistry()
+
+class StageTimer:
+    """
+    요청 1건의 단계별 소요 시간
+
+    Usage:
+        timer = StageTimer('predict')
+        with timer.span('features'):
+            ...
+        timer.finish()  # 'total' 기록
+    """
+
+    def __init__(self, endpoint, registry=REGISTRY):
+        self.endpoint = endpoint
+        self.registry = registry
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        """단계 소요 시간 기록 (같은 단계가 여러 번이면 합산)"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.registry.observe(self.endpoint, stage, seconds)
+
+    def finish(self):
+        """요청 전체 소요 시간을 'total' 단계로 기록"""
+        self.record('total', time.perf_counter() - self._start)
+        return self
+
+    def as_ms(self):
+        """단계명 → 밀리초 (응답 헤더/브릿지 반환용)"""
+        return {stage: seconds * 1000 for stage, seconds in self.stages.items()}
+
+    def header_value(self):
+        """X-Timing 헤더 값: 'stage=0.123, ...' (밀리초)"""
+        return ", ".join(f"{stage}={ms:.3f}" for stage, ms in self.as_ms().items())
@@ -0,0 +1,501 @@
+"""
+트리 앙상블 평탄화 컴파일러 / 경량 평가기
+- sklearn RandomForest, LightGBM, CalibratedClassifierCV(isotonic)를
+  연속 NumPy 배열(특성 인덱스, 임계값, 자식, 리프값)로 변환
+- 1행/N행 입력 모두 트리 깊이만큼의 벡터 연산으로 평가
+  (sklearn/LightGBM predict의 Python 레벨 검증·디스패치 비용 제거)
+- 대량 배치는 같은 인터페이스의 네이티브 평가기(sklearn tree_.apply, LightGBM Booster)로 평가
+  → BundlePredictor: 배치 크기는 속도만 바꾸고 결과(리프 값 정규화, 보정기 입력 공간)는 같음
+"""
+import numpy as np
+
+# LightGBM missing_type
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+_ZERO_THRESHOLD = 1e-35
+
+# (행 수 × 트리 수)가 이 값을 넘으면 리프 도달 항목을 제외하는 압축 순회 사용
+COMPACT_MIN_PAIRS = 4096
+
+# 대량 배치는 이 행 수 단위로 나눠 평가 (순회 배열 메모리가 행 수 × 트리 수에 비례)
+ROW_BLOCK = 8192
+
+# BundlePredictor: 이 행 수 이하는 평탄화 평가기, 초과하면 네이티브 평가기 (대량 배치에서 더 빠름)
+COMPILED_MAX_ROWS = 128
+
+class FlatForest:
+    """
+    평탄화된 트리 앙상블
+    - 모든 트리의 노드를 하나의 배열에 이어 붙이고 roots로 각 트리 시작 위치 표시
+    - 리프는 자기 자신을 자식으로 가리키므로 max_depth회 반복하면 모든 행이 리프에 도달
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, missing_type, value, roots,
+                 max_depth, aggregate='sum', transform='identity', sigmoid=1.0, float32_input=False):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.missing_type = np.ascontiguousarray(missing_type, dtype=np.int8)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.aggregate = aggregate          # 'sum' (LightGBM) | 'mean' (RandomForest)
+        self.transform = transform          # 'identity' | 'sigmoid' | 'softmax'
+        self.sigmoid = float(sigmoid)
+        self.float32_input = float32_input  # sklearn 트리는 입력을 float32로 변환 후 비교
+        self._zero_nodes = bool((self.missing_type == MISSING_ZERO).any())
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def leaves(self, X):
+        """각 (행, 트리)가 도달한 리프 노드 인덱스 (n, n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.float32_input:
+            X = X.astype(np.float32).astype(np.float64)
+        check_missing = self._zero_nodes or bool(np.isnan(X).any())
+
+        if X.shape[0] * self.n_trees <= COMPACT_MIN_PAIRS:
+            # 소규모 입력: 모든 (행, 트리)를 max_depth회 고정 반복 (연산 횟수 최소)
+            rows = np.arange(X.shape[0])[:, None]
+            nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+            for _ in range(self.max_depth):
+                nodes = self._step(X[rows, self.feature[nodes]], nodes, check_missing)
+            return nodes
+
+        # 대규모 입력: 리프에 도달한 (행, 트리)를 제외하며 반복 (총 연산량 = 경로 길이 합)
+        n_features = X.shape[1]
+        X_flat = X.ravel()
+        nodes = np.tile(self.roots, X.shape[0])
+        offsets = np.repeat(np.arange(X.shape[0]) * n_features, self.n_trees)
+        active = np.arange(nodes.size)
+        current = nodes.copy()
+        while active.size:
+            following = self._step(X_flat[offsets[active] + self.feature[current]], current, check_missing)
+            nodes[active] = following
+            moving = following != current
+            active, current = active[moving], following[moving]
+        return nodes.reshape(X.shape[0], self.n_trees)
+
+    def _step(self, x, nodes, check_missing):
+        """현재 노드에서 입력값 x에 따라 다음 노드로 이동 (리프는 제자리)"""
+        if check_missing:
+            mt = self.missing_type[nodes]
+            is_nan = np.isnan(x)
+            x = np.where(is_nan & (mt != MISSING_NAN), 0.0, x)
+            use_default = (((mt == MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD))
+                           | ((mt == MISSING_NAN) & is_nan))
+            go_left = np.where(use_default, self.default_left[nodes], x <= self.threshold[nodes])
+        else:
+            go_left = x <= self.threshold[nodes]
+        return np.where(go_left, self.left[nodes], self.right[nodes])
+
+    def raw(self, X):
+        """트리 출력 집계값 (n, n_outputs)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 2 and X.shape[0] > ROW_BLOCK:
+            return np.concatenate([self.raw(X[i:i + ROW_BLOCK]) for i in range(0, X.shape[0], ROW_BLOCK)])
+        out = self.value[self.leaves(X)].sum(axis=1)
+        if self.aggregate == 'mean':
+            out /= self.n_trees
+        return out
+
+    def output(self, X):
+        """변환이 적용된 최종 출력 (회귀값 또는 클래스 확률)"""
+        raw = self.raw(X)
+        if self.transform == 'sigmoid':
+            p = 1.0 / (1.0 + np.exp(-self.sigmoid * raw[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        if self.transform == 'softmax':
+            e = np.exp(raw - raw.max(axis=1, keepdims=True))
+            return e / e.sum(axis=1, keepdims=True)
+        return raw
+
+class _ForestBuilder:
+    """트리를 하나씩 받아 평탄화 배열로 누적"""
+
+    def __init__(self, n_outputs):
+        self.n_outputs = n_outputs
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.default_left, self.missing_type, self.value, self.roots = [], [], [], []
+        self.max_depth = 0
+
+    def add_tree(self, feature, threshold, left, right, default_left, missing_type, value, depth):
+        offset = sum(len(f) for f in self.feature)
+        leaf = left < 0
+        own = np.arange(len(feature)) + offset
+        self.feature.append(np.where(leaf, 0, feature))
+        self.threshold.append(np.where(leaf, np.inf, threshold))
+        self.left.append(np.where(leaf, own, left + offset))
+        self.right.append(np.where(leaf, own, right + offset))
+        self.default_left.append(default_left)
+        self.missing_type.append(np.where(leaf, MISSING_NONE, missing_type))
+        self.value.append(value)
+        self.roots.append(offset)
+        self.max_depth = max(self.max_depth, depth)
+
+    def build(self, **kwargs):
+        return FlatForest(
+            np.concatenate(self.feature), np.concatenate(self.threshold),
+            np.concatenate(self.left), np.concatenate(self.right),
+            np.concatenate(self.default_left), np.concatenate(self.missing_type),
+            np.concatenate(self.value).reshape(-1, self.n_outputs), np.array(self.roots),
+            max_depth=self.max_depth, **kwargs
+        )
+
+def compile_sklearn_forest(forest, classifier=False):
+    """sklearn RandomForest(또는 단일 DecisionTree 목록)를 FlatForest로 변환"""
+    estimators = getattr(forest, 'estimators_', [forest])
+    n_outputs = len(forest.classes_) if classifier else 1
+    builder = _ForestBuilder(n_outputs)
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        value = _normalized_leaf_values(tree, classifier)
+        missing_left = getattr(tree, 'missing_go_to_left', None)
+        default_left = (np.zeros(tree.node_count, dtype=bool) if missing_left is None
+                        else np.asarray(missing_left, dtype=bool))
+        missing_type = np.full(tree.node_count, MISSING_NAN if missing_left is not None else MISSING_NONE)
+        builder.add_tree(tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                         default_left, missing_type, value, tree.max_depth)
+
+    return builder.build(aggregate='mean', transform='identity', float32_input=True)
+
+def compile_lightgbm(model):
+    """LightGBM sklearn 래퍼 또는 Booster를 FlatForest로 변환"""
+    booster = getattr(model, 'booster_', model)
+    dump = booster.dump_model()
+    num_class = dump['num_class']
+    objective = dump['objective'].split()
+    if dump.get('average_output'):
+        raise ValueError("average_output(rf 모드) LightGBM 모델은 지원하지 않습니다")
+
+    if objective[0] == 'binary':
+        transform = 'sigmoid'
+        sigmoid = float(objective[1].split(':')[1]) if len(objective) > 1 else 1.0
+    elif objective[0] in ('multiclass', 'softmax'):
+        transform, sigmoid = 'softmax', 1.0
+    else:
+        transform, sigmoid = 'identity', 1.0
+
+    builder = _ForestBuilder(num_class)
+    for i, tree_info in enumerate(dump['tree_info']):
+        nodes = []
+        _flatten_lightgbm_node(tree_info['tree_structure'], nodes, 0)
+        feature, threshold, left, right, default_left, missing_type, leaf_value, depth = zip(*nodes)
+        value = np.zeros((len(nodes), num_class))
+        value[:, i % num_class] = leaf_value
+        builder.add_tree(np.array(feature), np.array(threshold, dtype=np.float64),
+                         np.array(left), np.array(right), np.array(default_left),
+                         np.array(missing_type), value, max(depth))
+
+    return builder.build(aggregate='sum', transform=transform, sigmoid=sigmoid)
+
+def _flatten_lightgbm_node(node, nodes, depth):
+    """dump_model 트리(중첩 dict)를 전위 순회하여 (feature, threshold, left, right, ...) 목록으로 변환"""
+    index = len(nodes)
+    if 'leaf_value' in node:
+        nodes.append((0, 0.0, -1, -1, False, MISSING_NONE, node['leaf_value'], depth))
+        return index
+    if node['decision_type'] != '<=':
+        raise ValueError(f"지원하지 않는 분할 유형: {node['decision_type']}")
+
+    nodes.append(None)
+    left = _flatten_lightgbm_node(node['left_child'], nodes, depth + 1)
+    right = _flatten_lightgbm_node(node['right_child'], nodes, depth + 1)
+    nodes[index] = (node['split_feature'], node['threshold'], left, right, node['default_left'],
+                    _MISSING_TYPES[node['missing_type']], 0.0, depth)
+    return index
+
+def compile_estimator(model, classifier=False):
+    """지원되는 트리 모델을 FlatForest로 변환"""
+    if isinstance(model, ForestRegressor):
+        return model.forest
+    if hasattr(model, 'booster_') or type(model).__name__ == 'Booster':
+        return compile_lightgbm(model)
+    if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+        return compile_sklearn_forest(model, classifier=classifier)
+    raise ValueError(f"지원하지 않는 모델 유형: {type(model).__name__}")
+
+def _normalized_leaf_values(tree, classifier):
+    """트리 노드 값 (n_nodes, n_outputs) - 구버전 분류 트리는 클래스별 가중 카운트, 신버전은 비율 저장 → 항상 비율로 정규화"""
+    value = tree.value[:, 0, :].astype(np.float64)
+    if classifier:
+        total = value.sum(axis=1, keepdims=True)
+        value = np.divide(value, total, out=np.zeros_like(value), where=total > 0)
+    return value
+
+class SklearnForest:
+    """
+    sklearn 트리 앙상블의 네이티브 평가기 (FlatForest와 같은 raw/output)
+    리프 탐색은 트리별 tree_.apply(C 구현), 리프 값은 compile_sklearn_forest와 같이 정규화
+    """
+
+    def __init__(self, forest, classifier=False):
+        self.trees = [estimator.tree_ for estimator in getattr(forest, 'estimators_', [forest])]
+        self.values = [_normalized_leaf_values(tree, classifier) for tree in self.trees]
+        self.transform = 'identity'
+
+    def raw(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        out = np.zeros((X.shape[0], self.values[0].shape[1]))
+        for tree, value in zip(self.trees, self.values):
+            out += value[tree.apply(X)]
+        return out / len(self.trees)
+
+    def output(self, X):
+        return self.raw(X)
+
+class NativeForest:
+    """LightGBM Booster를 FlatForest와 같은 raw/output 인터페이스로 노출 (대량 배치용)"""
+
+    def __init__(self, booster, transform='identity'):
+        self.booster = booster
+        self.transform = transform  # 같은 모델의 FlatForest.transform ('sigmoid'면 이진 분류)
+
+    def raw(self, X):
+        out = self.booster.predict(np.asarray(X, dtype=np.float64), raw_score=True)
+        return out.reshape(len(out), -1)
+
+    def output(self, X):
+        out = self.booster.predict(np.asarray(X, dtype=np.float64))
+        if out.ndim == 2:
+            return out
+        if self.transform == 'sigmoid':
+            return np.column_stack([1.0 - out, out])
+        return out.reshape(-1, 1)
+
+class EstimatorForest:
+    """트리 구조를 읽을 수 없는 추정기의 raw/output (라이브러리 출력 그대로 사용)"""
+
+    def __init__(self, model, classifier=False):
+        self.model = model
+        self.classifier = classifier
+        self.transform = 'identity'
+
+    def raw(self, X):
+        if self.classifier and hasattr(self.model, 'decision_function'):
+            out = self.model.decision_function(X)
+            return out.reshape(len(out), -1)
+        return self.output(X)
+
+    def output(self, X):
+        if self.classifier:
+            return self.model.predict_proba(X)
+        return np.asarray(self.model.predict(X), dtype=np.float64).reshape(-1, 1)
+
+def native_estimator(model, classifier=False):
+    """모델 → 네이티브 평가기 (FlatForest와 같은 raw/output, 변환 없이 바로 생성)"""
+    if isinstance(model, ForestRegressor):
+        return model.forest
+    if hasattr(model, 'booster_') or type(model).__name__ == 'Booster':
+        booster = getattr(model, 'booster_', model)
+        if not classifier:
+            transform = 'identity'
+        else:
+            transform = 'sigmoid' if booster.num_model_per_iteration() == 1 else 'softmax'
+        return NativeForest(booster, transform)
+    if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+        return SklearnForest(model, classifier=classifier)
+    return EstimatorForest(model, classifier=classifier)
+
+class ForestRegressor:
+    """
+    평가기(FlatForest 또는 raw/output을 구현한 객체)를 회귀 추정기 인터페이스로 노출
+    (모델 아티팩트 로드 시 sklearn/LightGBM 회귀 모델 대신 사용)
+    """
+
+    def __init__(self, forest):
+        self.forest = forest
+
+    def predict(self, X):
+        return self.forest.output(X)[:, 0]
+
+class CompiledClassifier:
+    """분류기 평가기 (CalibratedClassifierCV isotonic 보정 포함)"""
+
+    def __init__(self, classes, forests, calibrators=None, responses=None):
+        self.classes = np.asarray(classes)
+        self.forests = forests
+        # calibrators[i]: i번째 fold 모델의 클래스별 (X_thresholds, y_thresholds, X_min, X_max)
+        self.calibrators = calibrators
+        # responses[i]: 보정기 입력이 확률('proba')인지 raw score('raw')인지
+        self.responses = responses or ['proba'] * len(forests)
+
+    def predict_proba(self, X):
+        if self.calibrators is None:
+            return self.forests[0].output(X)
+
+        n_classes = len(self.classes)
+        mean_proba = None
+        for forest, calibrators, response in zip(self.forests, self.calibrators, self.responses):
+            if response == 'raw':
+                predictions = forest.raw(X)
+            else:
+                base = forest.output(X)
+                # 이진 분류는 양성 클래스 확률 하나만 보정
+                predictions = base[:, 1:] if n_classes == 2 else base
+            proba = np.zeros((predictions.shape[0], n_classes))
+            for class_idx, (pred, calibrator) in enumerate(zip(predictions.T, calibrators)):
+                x_thr, y_thr, x_min, x_max = calibrator
+                proba[:, class_idx + 1 if n_classes == 2 else class_idx] = np.interp(
+                    np.clip(pred, x_min, x_max), x_thr, y_thr)
+            if n_classes == 2:
+                proba[:, 0] = 1.0 - proba[:, 1]
+            else:
+                denominator = proba.sum(axis=1, keepdims=True)
+                proba = np.divide(proba, denominator, out=np.full_like(proba, 1 / n_classes),
+                                  where=denominator != 0)
+            proba[(1.0 < proba) & (proba <= 1.0 + 1e-5)] = 1.0
+            mean_proba = proba if mean_proba is None else mean_proba + proba
+        return mean_proba / len(self.forests)
+
+    def predict(self, X, proba=None):
+        if proba is None:
+            proba = self.predict_proba(X)
+        return self.classes[np.argmax(proba, axis=1)]
+
+    @property
+    def classes_(self):
+        """sklearn 분류기와 같은 이름 (모델 아티팩트 로드 시 분류 모델 대신 사용)"""
+        return self.classes
+
+def _calibrated_base(calibrated):
+    """보정 대상 원본 모델 (사전 학습 모델 보정 시 sklearn>=1.6은 FrozenEstimator로 감쌈)"""
+    estimator = calibrated.estimator
+    return estimator.estimator if type(estimator).__name__ == 'FrozenEstimator' else estimator
+
+def _calibration_response(calibrated):
+    """
+    보정기가 학습된 입력 공간 판별
+    - sklearn은 decision_function이 있으면 raw score, 없으면 predict_proba로 보정기를 학습
+    - LightGBM 4.6 미만은 decision_function이 없어 확률로 학습된 pickle이 존재하므로
+      보정 구간이 [0, 1] 안에 있으면 확률 공간으로 간주
+    """
+    if not hasattr(_calibrated_base(calibrated), 'decision_function'):
+        return 'proba'
+    in_unit_range = all(0.0 <= c.X_min_ and c.X_max_ <= 1.0 for c in calibrated.calibrators)
+    return 'proba' if in_unit_range else 'raw'
+
+def compile_classifier(model, native=False):
+    """분류 모델(보정 여부 무관)을 CompiledClassifier로 변환 (native=True면 네이티브 평가기 사용)"""
+    if isinstance(model, CompiledClassifier):
+        return model
+    estimator = native_estimator if native else compile_estimator
+    if hasattr(model, 'calibrated_classifiers_'):
+        if getattr(model, 'method', 'isotonic') != 'isotonic':
+            if native:
+                return CompiledClassifier(model.classes_, [EstimatorForest(model, classifier=True)])
+            raise ValueError(f"지원하지 않는 보정 방식: {model.method}")
+        forests, calibrators, responses = [], [], []
+        for calibrated in model.calibrated_classifiers_:
+            forests.append(estimator(_calibrated_base(calibrated), classifier=True))
+            calibrators.append([
+                (np.asarray(c.X_thresholds_, dtype=np.float64), np.asarray(c.y_thresholds_, dtype=np.float64),
+                 float(c.X_min_), float(c.X_max_))
+                for c in calibrated.calibrators
+            ])
+            responses.append(_calibration_response(calibrated))
+        return CompiledClassifier(model.classes_, forests, calibrators, responses)
+    return CompiledClassifier(model.classes_, [estimator(model, classifier=True)])
+
+class CompiledModel:
+    """모델 번들(scaler + regressor + classifier)의 평탄화 평가기"""
+
+    def __init__(self, regressor, classifier, mean=None, scale=None):
+        self.regressor = regressor
+        self.classifier = classifier
+        self.mean = mean
+        self.scale = scale
+
+    def transform(self, X):
+        """StandardScaler.transform과 동일한 연산 순서"""
+        X = np.array(X, dtype=np.float64)
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        return X
+
+    def predict(self, X):
+        """
+        Args:
+            X (ndarray): 스케일링 전 특성 행렬 (n, n_features)
+
+        Returns:
+            dict: consumption_score, risk_classification, risk_probabilities
+        """
+        X_scaled = self.transform(X)
+        risk_proba = self.classifier.predict_proba(X_scaled)
+        return {
+            'consumption_score': self.regressor.output(X_scaled)[:, 0],
+            'risk_classification': self.classifier.predict(X_scaled, proba=risk_proba),
+            'risk_probabilities': risk_proba
+        }
+
+def compile_model(model_data, native=False):
+    """
+    pickle 모델 번들(dict)을 CompiledModel로 변환
+
+    Args:
+        model_data (dict): regressor, classifier, scaler를 포함한 모델 번들
+        native (bool): 평탄화 배열 대신 네이티브 평가기로 구성 (리프 값 정규화/보정 처리는 동일)
+
+    Returns:
+        CompiledModel: 평탄화 평가기
+    """
+    if not native and isinstance(model_data.get('compiled'), CompiledModel):
+        # 모델 아티팩트는 로드 시 평탄화 배열로 바로 구성됨
+        return model_data['compiled']
+    scaler = model_data.get('scaler')
+    mean = getattr(scaler, 'mean_', None) if scaler is not None and getattr(scaler, 'with_mean', True) else None
+    scale = getattr(scaler, 'scale_', None) if scaler is not None and getattr(scaler, 'with_std', True) else None
+    return CompiledModel(
+        native_estimator(model_data['regressor']) if native else compile_estimator(model_data['regressor']),
+        compile_classifier(model_data['classifier'], native=native),
+        mean=None if mean is None else np.asarray(mean, dtype=np.float64),
+        scale=None if scale is None else np.asarray(scale, dtype=np.float64)
+    )
+
+class BundlePredictor:
+    """
+    모델 번들 예측기 (Flask 앱, 모델 레지스트리, 일괄 예측, 증분 점수 공용)
+    - 소규모 입력은 평탄화 평가기, 대량 배치는 네이티브 평가기
+    - 두 경로 모두 CompiledModel이므로 분류 확률의 리프 값 정규화와 보정기 입력 공간 판별이 같음
+      (sklearn/LightGBM predict_proba는 구버전 pickle에서 확률 합이 1이 아니거나 보정 입력이 달라짐)
+    - 평탄화에 실패한 모델은 네이티브 평가기만 사용 (compile_error에 원인 기록)
+    """
+
+    def __init__(self, model_data, compiled_max_rows=COMPILED_MAX_ROWS):
+        self.native = compile_model(model_data, native=True)
+        self.classes = self.native.classifier.classes
+        self.compiled_max_rows = compiled_max_rows
+        self.compile_error = None
+        try:
+            self.compiled = compile_model(model_data)
+        except Exception as e:
+            self.compiled = None
+            self.compile_error = e
+
+    def predict(self, X):
+        """
+        Args:
+            X (ndarray): 스케일링 전 특성 행렬 (n, n_features)
+
+        Returns:
+            dict: consumption_score, risk_classification, risk_probabilities
+        """
+        if self.compiled is not None and len(X) <= self.compiled_max_rows:
+            return self.compiled.predict(X)
+        return self.native.predict(X)
+
+def bundle_predictor(model_data):
+    """번들의 BundlePredictor (없으면 생성해 model_data['predictor']에 저장 후 재사용)"""
+    if model_data.get('predictor') is None:
+        model_data['predictor'] = BundlePredictor(model_data)
+    return model_data['predictor']